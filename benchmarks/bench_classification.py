@@ -0,0 +1,182 @@
+"""bench_classification.py
+
+Compara la clasificación de miembros basada en tablas de reglas
+(``Classifier``) con la cadena de comparaciones original, sobre clases
+sintéticas con miles de miembros.
+
+Uso:
+    python -m benchmarks.bench_classification [--members 5000 --repeat 5]
+"""
+
+import argparse
+import ast
+import json
+import random
+import time
+
+from hg_odoo_pre_commit_hooks.check_method_order import (
+    CRUD_METHODS,
+    EXPECTED_ORDER,
+    Classifier,
+    get_decorator_name,
+    is_field_assignment,
+    order_violations,
+)
+
+# Nombres de miembros que cubren todas las reglas y el caso por defecto.
+NAME_TEMPLATES = (
+    "_default_{i}",
+    "_domain_{i}",
+    "_selection_{i}",
+    "_compute_{i}",
+    "_inverse_{i}",
+    "_search_{i}",
+    "_onchange_{i}",
+    "action_{i}",
+    "helper_{i}",
+    "_prepare_{i}",
+)
+
+# Tipos de miembro de las clases sintéticas; los métodos con nombre de
+# ``NAME_TEMPLATES`` aparecen el doble que los demás.
+MEMBER_KINDS = ("field", "attribute", "decorated", "crud", "named", "named")
+
+
+def legacy_method_category(node):
+    """Clasificación original de ``get_method_category``, usada como
+    referencia."""
+    name = getattr(node, "name", "")
+    decorators = [get_decorator_name(d) for d in getattr(node, "decorator_list", [])]
+
+    if name == "init":
+        return "init_method"
+    if isinstance(node, ast.Assign):
+        targets = [t.id for t in node.targets if isinstance(t, ast.Name)]
+        if any(t == "_sql_constraints" for t in targets):
+            return "sql_constraints"
+        if any(t.startswith("_") for t in targets):
+            return "private_attributes"
+        if is_field_assignment(node):
+            return "field_declarations"
+        return "other_methods"
+
+    if name in ("default_get", "default") or name.startswith("_default_"):
+        return "default_methods"
+    if name.startswith("_domain_") or name.startswith("_selection_"):
+        return "selection_computed_methods"
+    if (
+        name.startswith("_compute_")
+        or name.startswith("_inverse_")
+        or name.startswith("_search_")
+    ):
+        return "compute_inverse_search"
+    if "constrains" in decorators:
+        return "constrains_methods"
+    if "onchange" in decorators or name.startswith("_onchange_"):
+        return "onchange_methods"
+    if name in CRUD_METHODS:
+        return "crud_methods"
+    if name.startswith("action_"):
+        return "action_methods"
+    return "other_methods"
+
+
+def legacy_order_violations(method_order):
+    """Cálculo original de los errores de orden con ``EXPECTED_ORDER.index``,
+    con los mismos mensajes que imprimía el ``check_order`` original."""
+    violations = []
+    current_max_index = -1
+    for index_method, method_data in enumerate(method_order):
+        cat, lineno, name = method_data
+        try:
+            idx = EXPECTED_ORDER.index(cat)
+        except ValueError:
+            violations.append((lineno, f"Unknown category '{cat}' in '{name}'"))
+            continue
+        if idx < current_max_index:
+            expected_before = EXPECTED_ORDER[current_max_index]
+            prev_method = method_order[index_method - 1]
+            message = (
+                f"'{name}' (category '{cat}') appears out "
+                f"of order. Should be before '{expected_before}' (before "
+                f"'{prev_method[0]}->{prev_method[2]}:{prev_method[1]}')"
+            )
+            violations.append((lineno, message))
+        else:
+            current_max_index = idx
+    return violations
+
+
+def synthetic_class(members, seed=0):
+    """Genera una clase con ``members`` miembros de todas las categorías."""
+    rng = random.Random(seed)
+    lines = ["class Big(models.Model):", '    _name = "big"']
+    for i in range(members):
+        kind = rng.choice(MEMBER_KINDS)
+        if kind == "field":
+            lines.append(f"    field_{i} = fields.Char()")
+        elif kind == "attribute":
+            lines.append(f"    _attr_{i} = {i}")
+        elif kind == "decorated":
+            decorator = rng.choice(("constrains", "onchange", "depends", "model"))
+            lines.append(f'    @api.{decorator}("field_{i}")')
+            lines.append(f"    def _check_{i}(self): pass")
+        elif kind == "crud":
+            lines.append(f"    def {rng.choice(CRUD_METHODS)}(self): pass")
+        else:
+            name = rng.choice(NAME_TEMPLATES).format(i=i)
+            lines.append(f"    def {name}(self): pass")
+    return ast.parse("\n".join(lines) + "\n").body[0]
+
+
+def _best(function, repeat):
+    best = None
+    for _i in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(members=5000, repeat=5, seed=0):
+    """Mide ambas implementaciones y comprueba que dan el mismo resultado."""
+    node = synthetic_class(members, seed)
+    classifier = Classifier()
+
+    def legacy():
+        order = [
+            (legacy_method_category(n), getattr(n, "lineno", 0), "") for n in node.body
+        ]
+        return legacy_order_violations(order)
+
+    def tables():
+        category = classifier.category
+        order = [(category(n), getattr(n, "lineno", 0), "") for n in node.body]
+        return order_violations(order, classifier)
+
+    if legacy() != [tuple(violation) for violation in tables()]:
+        raise RuntimeError("the rule tables disagree with the legacy classification")
+    legacy_seconds = _best(legacy, repeat)
+    table_seconds = _best(tables, repeat)
+    return {
+        "members": len(node.body),
+        "legacy_seconds": round(legacy_seconds, 5),
+        "classifier_seconds": round(table_seconds, 5),
+        "speedup": round(legacy_seconds / table_seconds, 2),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark member classification against the legacy if-chain."
+    )
+    parser.add_argument("--members", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.members, repeat=args.repeat, seed=args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
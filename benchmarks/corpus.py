@@ -0,0 +1,169 @@
+"""corpus.py
+
+Genera módulos Odoo sintéticos para medir el rendimiento del analizador.
+
+Cada módulo tiene su ``__manifest__.py``, un controlador y un archivo por
+modelo con campos, métodos decorados, sobrescrituras CRUD y acciones en el
+orden esperado. Opcionalmente se añaden al final de cada modelo métodos
+``_default_*`` fuera de orden, cada uno de los cuales produce exactamente un
+error.
+"""
+
+import os
+import random
+from dataclasses import asdict, dataclass
+
+from hg_odoo_pre_commit_hooks.check_method_order import CRUD_METHODS
+
+MANIFEST = """{
+    "name": "%(addon)s",
+    "version": "17.0.1.0.0",
+    "depends": ["base"],
+    "license": "LGPL-3",
+}
+"""
+
+CONTROLLER = """from odoo import http
+
+
+class %(cls)sController(http.Controller):
+    @http.route("/%(addon)s/ping", auth="public")
+    def ping(self):
+        return "pong"
+"""
+
+
+@dataclass
+class CorpusSpec:
+    """Parámetros del corpus sintético."""
+
+    addons: int = 10
+    models: int = 10
+    fields: int = 20
+    computed: int = 5
+    onchanges: int = 3
+    constrains: int = 2
+    crud: int = 3
+    actions: int = 3
+    other: int = 5
+    out_of_order: int = 0
+    seed: int = 0
+
+    def as_dict(self):
+        return asdict(self)
+
+
+@dataclass
+class CorpusInfo:
+    """Resumen del corpus generado."""
+
+    files: int = 0
+    model_files: int = 0
+    members: int = 0
+    violations: int = 0
+    size: int = 0
+
+
+def _model_source(addon, index, spec, rng):
+    lines = [
+        "from odoo import api, fields, models",
+        "",
+        "",
+        f"class {addon.title().replace('_', '')}Model{index}(models.Model):",
+        f'    _name = "{addon}.model{index}"',
+        f'    _description = "Model {index}"',
+        '    _order = "name"',
+        "",
+    ]
+    members = 3
+    field_types = ["Char", "Integer", "Float", "Boolean", "Text", "Date"]
+    for i in range(spec.fields):
+        ftype = rng.choice(field_types)
+        lines.append(f'    field_{i} = fields.{ftype}(string="Field {i}")')
+        members += 1
+    for i in range(spec.computed):
+        lines.append(f'    computed_{i} = fields.Char(compute="_compute_{i}")')
+        members += 1
+    lines.append("")
+
+    def method(decorator, name, body="return True"):
+        nonlocal members
+        members += 1
+        if decorator:
+            lines.append(f"    {decorator}")
+        lines.extend([f"    def {name}(self):", f"        {body}", ""])
+
+    method("@api.model", "_default_name", 'return "name"')
+    for i in range(spec.computed):
+        method(
+            f'@api.depends("field_{i % max(spec.fields, 1)}")',
+            f"_compute_{i}",
+            f"self.computed_{i} = False",
+        )
+    for i in range(spec.constrains):
+        method(f'@api.constrains("field_{i}")', f"_check_field_{i}")
+    for i in range(spec.onchanges):
+        method(f'@api.onchange("field_{i}")', f"_onchange_field_{i}")
+    for name in rng.sample(CRUD_METHODS, min(spec.crud, len(CRUD_METHODS))):
+        method(None, name, f"return super().{name}()")
+    for i in range(spec.actions):
+        method(None, f"action_{i}")
+    for i in range(spec.other):
+        method(None, f"helper_{i}")
+    for i in range(spec.out_of_order):
+        method("@api.model", f"_default_misplaced_{i}")
+    return "\n".join(lines).rstrip() + "\n", members
+
+
+def _write(path, content, info):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+    info.files += 1
+    info.size += len(content.encode())
+
+
+def generate_corpus(directory, spec=None):
+    """Escribe el corpus sintético en ``directory``.
+
+    Args:
+        directory (str): Directorio de addons en el que crear los módulos.
+        spec (CorpusSpec): Parámetros del corpus.
+
+    Returns:
+        CorpusInfo: Número de archivos, miembros y errores esperados.
+    """
+
+    spec = spec or CorpusSpec()
+    rng = random.Random(spec.seed)
+    info = CorpusInfo()
+    for a in range(spec.addons):
+        addon = f"bench_addon_{a}"
+        root = os.path.join(directory, addon)
+        os.makedirs(os.path.join(root, "models"), exist_ok=True)
+        os.makedirs(os.path.join(root, "controllers"), exist_ok=True)
+        _write(os.path.join(root, "__manifest__.py"), MANIFEST % {"addon": addon}, info)
+        _write(
+            os.path.join(root, "__init__.py"),
+            "from . import controllers, models\n",
+            info,
+        )
+        _write(
+            os.path.join(root, "controllers", "__init__.py"),
+            "from . import main\n",
+            info,
+        )
+        _write(
+            os.path.join(root, "controllers", "main.py"),
+            CONTROLLER % {"addon": addon, "cls": addon.title().replace("_", "")},
+            info,
+        )
+        imports = []
+        for m in range(spec.models):
+            source, members = _model_source(addon, m, spec, rng)
+            _write(os.path.join(root, "models", f"model_{m}.py"), source, info)
+            imports.append(f"from . import model_{m}\n")
+            info.model_files += 1
+            info.members += members
+            info.violations += spec.out_of_order
+        _write(os.path.join(root, "models", "__init__.py"), "".join(imports), info)
+    return info
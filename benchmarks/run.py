@@ -0,0 +1,156 @@
+"""run.py
+
+Mide el rendimiento de ``odoo-method-order`` sobre un corpus sintético y
+guarda los resultados en JSON para comparar versiones.
+
+Se miden archivos por segundo, métodos por segundo y memoria máxima (RSS)
+para ``file_violations`` en el propio proceso y para la línea de comandos
+completa en un subproceso.
+
+Uso:
+    python -m benchmarks.run --output bench.json [--addons 50 --models 20 ...]
+"""
+
+import argparse
+import dataclasses
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from importlib.metadata import version
+
+from hg_odoo_pre_commit_hooks.check_method_order import file_violations
+from hg_odoo_pre_commit_hooks.discovery import iter_addon_files
+
+from benchmarks.corpus import CorpusSpec, generate_corpus
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+CLI_MODES = {
+    "cli_serial": ["--no-cache"],
+    "cli_jobs_auto": ["--no-cache", "--jobs", "auto"],
+    "cli_cache_warm": [],
+}
+
+
+def _kib(usage):
+    # macOS devuelve bytes y Linux KiB.
+    return usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+
+
+def peak_rss_kib():
+    """Devuelve la memoria máxima (RSS) de este proceso en KiB, o None si no
+    se puede medir."""
+    if resource is None:
+        return None
+    return _kib(resource.getrusage(resource.RUSAGE_SELF))
+
+
+def _rates(seconds, info):
+    return {
+        "seconds": round(seconds, 4),
+        "files_per_sec": round(info.files / seconds, 1),
+        "methods_per_sec": round(info.members / seconds, 1),
+    }
+
+
+def bench_in_process(directory, info, repeat):
+    """Mide ``file_violations`` sobre todos los archivos del corpus."""
+    files = list(iter_addon_files([directory]))
+    best = None
+    for _i in range(repeat):
+        start = time.perf_counter()
+        violations = sum(len(file_violations(f)) for f in files)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    if violations != info.violations:
+        raise RuntimeError(f"expected {info.violations} violations, found {violations}")
+    return {**_rates(best, info), "peak_rss_kib": peak_rss_kib()}
+
+
+def bench_cli(directory, info, options, cache_dir):
+    """Mide la línea de comandos completa en un subproceso."""
+    command = [
+        sys.executable,
+        "-m",
+        "hg_odoo_pre_commit_hooks.check_method_order",
+        "--exit-zero",
+        "--cache-dir",
+        cache_dir,
+        *options,
+        "--addons-path",
+        directory,
+    ]
+    start = time.perf_counter()
+    with subprocess.Popen(command, stdout=subprocess.DEVNULL) as process:
+        rss = None
+        if hasattr(os, "wait4"):
+            # wait4 devuelve el uso de recursos de este subproceso (y de los
+            # procesos que haya lanzado), no el acumulado de todos.
+            _pid, status, usage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+            rss = _kib(usage)
+        else:
+            process.wait()
+    elapsed = time.perf_counter() - start
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, command)
+    return {**_rates(elapsed, info), "peak_rss_kib": rss}
+
+
+def run(spec, repeat=3):
+    """Genera el corpus, ejecuta las mediciones y devuelve los resultados."""
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = os.path.join(tmp, "addons")
+        info = generate_corpus(directory, spec)
+        cache_dir = os.path.join(tmp, "cache")
+        results = {"in_process": bench_in_process(directory, info, repeat)}
+        # Llena la caché para la medición con la caché caliente.
+        bench_cli(directory, info, [], cache_dir)
+        for name, options in CLI_MODES.items():
+            results[name] = bench_cli(directory, info, options, cache_dir)
+    return {
+        "version": version("hg-odoo-pre-commit-hooks"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "spec": spec.as_dict(),
+        "corpus": dataclasses.asdict(info),
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark odoo-method-order.")
+    for field in dataclasses.fields(CorpusSpec):
+        parser.add_argument(
+            f"--{field.name.replace('_', '-')}", type=int, default=field.default
+        )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="JSON file to write (default: stdout).")
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("argument --repeat: must be at least 1")
+
+    spec = CorpusSpec(
+        **{
+            field.name: getattr(args, field.name)
+            for field in dataclasses.fields(CorpusSpec)
+        }
+    )
+    report = json.dumps(run(spec, repeat=args.repeat), indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""api.py
+
+Interfaz para usar el analizador desde otros programas de Python.
+
+Las funciones devuelven los errores como registros ``Violation`` inmutables
+(``line``, ``message`` y ``rule``) y no tienen efectos secundarios: no
+imprimen nada, no llaman a ``sys.exit`` y no usan la caché de resultados, así
+que se pueden analizar miles de fragmentos de código en un mismo proceso.
+
+Para analizar grandes cantidades de archivos, ``analyze_paths`` es un
+generador que devuelve el resultado de cada archivo en cuanto está listo y no
+guarda nada entre un archivo y el siguiente: el árbol ``ast`` de cada archivo
+se libera al clasificar sus miembros, de modo que la memoria no crece con el
+número de archivos.
+
+Ejemplo::
+
+    from hg_odoo_pre_commit_hooks.api import analyze_path, analyze_source
+
+    for violation in analyze_source(code, "models/partner.py"):
+        print(violation.line, violation.rule, violation.message)
+"""
+
+import os
+from collections import namedtuple
+
+from hg_odoo_pre_commit_hooks.check_method_order import (
+    Classifier,
+    Violation,
+    file_violations,
+    source_violations,
+)
+
+__all__ = [
+    "Classifier",
+    "PathResult",
+    "Violation",
+    "analyze_path",
+    "analyze_paths",
+    "analyze_source",
+]
+
+
+class PathResult(namedtuple("PathResult", ("path", "violations", "error"))):
+    """Resultado de un archivo de ``analyze_paths``: ``path`` (str),
+    ``violations`` (lista de ``Violation``) y ``error`` (la excepción si no
+    se pudo analizar el archivo, o None)."""
+
+    __slots__ = ()
+
+
+def analyze_source(source, filename="<unknown>", classifier=None):
+    """Analiza el código de un archivo Python.
+
+    Args:
+        source (str | bytes): Código a analizar; si es ``bytes`` debe estar
+            en UTF-8.
+        filename (str): Nombre del archivo, usado en los errores de sintaxis.
+        classifier (Classifier): Reglas de clasificación y orden esperado;
+            por defecto las de ``check_method_order``.
+
+    Returns:
+        list: Lista de ``Violation`` en el orden en que se reportan.
+
+    Raises:
+        SyntaxError: Si el código no es Python válido.
+    """
+
+    if isinstance(source, str):
+        source = source.encode("utf-8")
+    return source_violations(source, filename, classifier=classifier)
+
+
+def analyze_path(path, classifier=None, resolver=None):
+    """Analiza un archivo Python.
+
+    Args:
+        path (str | os.PathLike): Ruta del archivo.
+        classifier (Classifier): Reglas de clasificación y orden esperado.
+        resolver (config.ConfigResolver): Si se indica (y no ``classifier``),
+            usa la configuración de los ``pyproject.toml`` del directorio del
+            archivo. Por defecto se usan las reglas de ``check_method_order``.
+
+    Returns:
+        list: Lista de ``Violation`` en el orden en que se reportan.
+
+    Raises:
+        OSError: Si no se puede leer el archivo.
+        SyntaxError: Si el archivo no es Python válido.
+        config.ConfigError: Si la configuración del directorio no es válida.
+    """
+
+    if classifier is None and resolver is not None:
+        classifier = resolver.for_file(path).classifier
+    return file_violations(os.fspath(path), classifier=classifier)
+
+
+def analyze_paths(paths, classifier=None, resolver=None):
+    """Analiza archivos Python uno a uno, a medida que se piden.
+
+    ``paths`` se consume de uno en uno, así que puede ser un generador de
+    millones de rutas; los errores de un archivo (de lectura, de sintaxis o
+    de configuración) no interrumpen el análisis de los siguientes.
+
+    Args:
+        paths (iterable): Rutas (``str`` u ``os.PathLike``) de los archivos.
+        classifier (Classifier): Como en ``analyze_path``.
+        resolver (config.ConfigResolver): Como en ``analyze_path``.
+
+    Yields:
+        PathResult: Resultado de cada archivo, en el orden de ``paths``.
+    """
+
+    from hg_odoo_pre_commit_hooks.config import ConfigError
+
+    for path in paths:
+        path = os.fspath(path)
+        try:
+            violations = analyze_path(path, classifier, resolver)
+        except (OSError, SyntaxError, ValueError, ConfigError) as e:
+            yield PathResult(path, [], e)
+        else:
+            yield PathResult(path, violations, None)
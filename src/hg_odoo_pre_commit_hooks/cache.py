@@ -0,0 +1,243 @@
+"""cache.py
+
+Caché persistente (SQLite) de los resultados del análisis.
+
+Los resultados se indexan por el hash del contenido del archivo y por la clave
+de análisis (versión de la herramienta y configuración efectiva de
+``EXPECTED_ORDER``, ``CRUD_METHODS``, ``MODELS_BASES`` y las reglas de
+clasificación), combinada con el hash de la configuración de su directorio
+(ver ``config``). Antes de leer el archivo se compara su huella de ``stat``
+(mtime, tamaño e inodo) con la guardada, de modo que los archivos sin cambios
+no se leen ni se analizan.
+
+El número de resultados guardados está limitado; al cerrar la caché se
+eliminan los menos usados recientemente.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+from hg_odoo_pre_commit_hooks import check_method_order
+
+SCHEMA_VERSION = 1
+DEFAULT_MAX_ENTRIES = 100_000
+# Un archivo modificado hace menos de este tiempo puede volver a modificarse
+# sin que cambie su mtime (sistemas de archivos con poca resolución), así que
+# su huella de stat no se guarda.
+RACY_STAT_NS = 2_000_000_000
+# Evita escribir en la base de datos en cada acierto de la caché.
+TOUCH_INTERVAL = 3600
+
+
+def default_cache_dir():
+    """Devuelve el directorio de caché por defecto."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "hg-odoo-pre-commit-hooks")
+
+
+def tool_version():
+    """Devuelve una versión de la herramienta que cambia con el código: el
+    hash de todos los módulos del paquete (no solo del analizador, ya que
+    ``config``, ``checks`` o ``index`` también influyen en los resultados), de
+    modo que una instalación editable no reutilice resultados de otro código.
+
+    No usa la versión del paquete: ``importlib.metadata`` tarda más en
+    importarse que analizar unos pocos archivos.
+    """
+
+    package = os.path.dirname(os.path.abspath(check_method_order.__file__))
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(package)):
+        if name.endswith(".py"):
+            with open(os.path.join(package, name), "rb") as f:
+                digest.update(f"{name}\0".encode() + f.read() + b"\0")
+    return digest.hexdigest()[:16]
+
+
+def analysis_key():
+    """Clave que identifica la versión y la configuración del análisis."""
+    payload = json.dumps(
+        [
+            SCHEMA_VERSION,
+            tool_version(),
+            check_method_order.EXPECTED_ORDER,
+            check_method_order.CRUD_METHODS,
+            check_method_order.MODELS_BASES,
+            check_method_order.METHOD_RULES,
+            check_method_order.ASSIGNMENT_RULES,
+        ]
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    """Caché de resultados del análisis guardada en SQLite.
+
+    Usar ``ResultCache.open`` para obtener una instancia; devuelve ``None`` si
+    la caché no se puede abrir, en cuyo caso se analiza sin caché. Si se
+    indica ``resolver`` (``config.ConfigResolver``), cada archivo se analiza
+    con la configuración de su directorio.
+    """
+
+    def __init__(self, connection, key, max_entries=DEFAULT_MAX_ENTRIES, resolver=None):
+        self.connection = connection
+        self.key = key
+        self.max_entries = max_entries
+        self.resolver = resolver
+        self.hits = 0
+        self.misses = 0
+        self._config_keys = {}
+
+    @classmethod
+    def open(cls, directory=None, max_entries=DEFAULT_MAX_ENTRIES, resolver=None):
+        directory = directory or default_cache_dir()
+        try:
+            os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(
+                os.path.join(directory, "results.sqlite3"),
+                timeout=5,
+                isolation_level=None,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                "path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, "
+                "inode INTEGER, digest TEXT)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "digest TEXT, analysis TEXT, violations TEXT, last_used INTEGER, "
+                "PRIMARY KEY (digest, analysis))"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)"
+            )
+        except (OSError, sqlite3.Error):
+            return None
+        return cls(
+            connection, analysis_key(), max_entries=max_entries, resolver=resolver
+        )
+
+    def violations(self, filepath, stats=None, timer=None, source=None):
+        """Devuelve los errores de un archivo, usando la caché si es posible.
+
+        Args:
+            filepath (str): Ruta al archivo Python que se va a analizar.
+            stats (collections.Counter): Como en ``file_violations``; además
+                cuenta los resultados obtenidos de la caché (``cached``).
+            timer (profiling.PhaseTimer): Como en ``file_violations``; además
+                mide las consultas a la caché (``cache``).
+            source (bytes): Como en ``file_violations``.
+
+        Returns:
+            list: Lista de ``Violation``, igual que ``file_violations``.
+        """
+
+        timer = timer or check_method_order.NO_TIMER
+        path = os.path.abspath(filepath)
+        classifier, key = None, self.key
+        with timer("cache"):
+            if self.resolver is not None:
+                config = self.resolver.for_file(path)
+                classifier, key = config.classifier, self._config_key(config.digest)
+            st = os.stat(filepath)
+            digest = self._stat_digest(path, st)
+        if digest is None:
+            if source is None:
+                with timer("read"), open(filepath, "rb") as f:
+                    source = f.read()
+            with timer("cache"):
+                digest = hashlib.sha256(source).hexdigest()
+                if time.time_ns() - st.st_mtime_ns > RACY_STAT_NS:
+                    self._execute(
+                        "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+                        (path, st.st_mtime_ns, st.st_size, st.st_ino, digest),
+                    )
+
+        with timer("cache"):
+            cached = self._lookup(digest, key)
+        if cached is not None:
+            self.hits += 1
+            if stats is not None:
+                stats["cached"] += 1
+            return cached
+
+        self.misses += 1
+        if source is None:
+            with timer("read"), open(filepath, "rb") as f:
+                source = f.read()
+            digest = hashlib.sha256(source).hexdigest()
+        violations = check_method_order.source_violations(
+            source, filepath, stats=stats, timer=timer, classifier=classifier
+        )
+        with timer("cache"):
+            self._execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                (digest, key, json.dumps(violations), int(time.time())),
+            )
+        return violations
+
+    def close(self):
+        """Elimina las entradas menos usadas por encima del límite y cierra."""
+        try:
+            (count,) = self.connection.execute(
+                "SELECT COUNT(*) FROM results"
+            ).fetchone()
+            if count > self.max_entries:
+                self.connection.execute(
+                    "DELETE FROM results WHERE rowid IN (SELECT rowid FROM "
+                    "results ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+                self.connection.execute(
+                    "DELETE FROM files WHERE digest NOT IN (SELECT digest FROM results)"
+                )
+        except sqlite3.Error:
+            pass
+        self.connection.close()
+
+    def _config_key(self, config_digest):
+        """Clave de análisis para los archivos con una configuración."""
+        key = self._config_keys.get(config_digest)
+        if key is None:
+            key = hashlib.sha256(f"{self.key}:{config_digest}".encode()).hexdigest()
+            self._config_keys[config_digest] = key
+        return key
+
+    def _stat_digest(self, path, st):
+        row = self._execute(
+            "SELECT mtime_ns, size, inode, digest FROM files WHERE path = ?",
+            (path,),
+        )
+        if row and tuple(row[:3]) == (st.st_mtime_ns, st.st_size, st.st_ino):
+            return row[3]
+        return None
+
+    def _lookup(self, digest, key):
+        row = self._execute(
+            "SELECT violations, last_used FROM results "
+            "WHERE digest = ? AND analysis = ?",
+            (digest, key),
+        )
+        if row is None:
+            return None
+        now = int(time.time())
+        if now - row[1] > TOUCH_INTERVAL:
+            self._execute(
+                "UPDATE results SET last_used = ? WHERE digest = ? AND analysis = ?",
+                (now, digest, key),
+            )
+        return [check_method_order.Violation(*item) for item in json.loads(row[0])]
+
+    def _execute(self, sql, parameters):
+        """Ejecuta una sentencia; la caché nunca debe hacer fallar el análisis."""
+        try:
+            return self.connection.execute(sql, parameters).fetchone()
+        except sqlite3.Error:
+            return None
@@ -12,7 +12,12 @@ Funciones principales:
 categorías desconocidas.
 
 Uso:
-    python check_method_order.py archivo1.py archivo2.py ...
+    odoo-method-order archivo1.py archivo2.py ...
+
+    El módulo importa el resto del paquete ``hg_odoo_pre_commit_hooks``, así
+    que no se puede ejecutar como un script suelto; sin instalar el paquete,
+    usar ``python -m hg_odoo_pre_commit_hooks.check_method_order`` desde
+    ``src/``.
 
 Categorías esperadas:
     - private_attributes
@@ -34,10 +39,12 @@ Salida:
     Devuelve un código de salida 1 si hay errores, 0 si todo está correcto.
 """
 
-import argparse
 import ast
-import re
+import itertools
+import os
 import sys
+import time
+from collections import Counter, namedtuple
 
 EXPECTED_ORDER = [
     "private_attributes",
@@ -74,6 +81,236 @@ CRUD_METHODS = [
 
 MODELS_BASES = ("Model", "AbstractModel", "TransientModel")
 
+FIELD_MODULE_PATTERN = r"^(fields|[a-zA-Z_][a-zA-Z0-9_]*_fields)$"
+
+# Expresiones regulares ya compiladas por ``_regex``: se compilan la primera
+# vez que se usan para que importar el módulo no importe ``re``.
+_REGEXES = {}
+
+
+def _regex(pattern):
+    """Devuelve la expresión regular ``pattern`` compilada."""
+    regex = _REGEXES.get(pattern)
+    if regex is None:
+        import re
+
+        regex = _REGEXES[pattern] = re.compile(pattern)
+    return regex
+
+
+class Rule(namedtuple("Rule", ("category", "kind", "values"))):
+    """Regla de clasificación de los miembros de una clase.
+
+    ``kind`` indica a qué se aplican los valores:
+
+    - Métodos: ``name`` (nombre exacto), ``prefix`` (prefijo del nombre) y
+      ``decorator`` (nombre de un decorador, p. ej. ``constrains``).
+    - Asignaciones: ``target`` (nombre exacto de la variable),
+      ``target_prefix`` (prefijo de la variable), ``value_module`` y
+      ``value_module_suffix`` (nombre, o sufijo del nombre, del objeto cuyo
+      atributo se llama, p. ej. ``fields`` en ``fields.Char()``).
+
+    Se define con ``collections.namedtuple`` y no con ``typing.NamedTuple``
+    porque ``typing`` (que importa ``re``) retrasa el arranque.
+    """
+
+    __slots__ = ()
+
+
+# Reglas por orden de prioridad: si varias reglas coinciden con un miembro,
+# se usa la primera de la lista.
+METHOD_RULES = (
+    Rule("init_method", "name", ("init",)),
+    Rule("default_methods", "name", ("default_get", "default")),
+    Rule("default_methods", "prefix", ("_default_",)),
+    Rule("selection_computed_methods", "prefix", ("_domain_", "_selection_")),
+    Rule("compute_inverse_search", "prefix", ("_compute_", "_inverse_", "_search_")),
+    Rule("constrains_methods", "decorator", ("constrains",)),
+    Rule("onchange_methods", "decorator", ("onchange",)),
+    Rule("onchange_methods", "prefix", ("_onchange_",)),
+    Rule("crud_methods", "name", tuple(CRUD_METHODS)),
+    Rule("action_methods", "prefix", ("action_",)),
+)
+
+ASSIGNMENT_RULES = (
+    Rule("sql_constraints", "target", ("_sql_constraints",)),
+    Rule("private_attributes", "target_prefix", ("_",)),
+    Rule("field_declarations", "value_module", ("fields",)),
+    Rule("field_declarations", "value_module_suffix", ("_fields",)),
+)
+
+DEFAULT_CATEGORY = "other_methods"
+
+
+# Prioridad mayor que la de cualquier regla.
+_NO_MATCH = (float("inf"), None)
+
+# Número máximo de nombres cuya clasificación recuerda cada ``_NameMatcher``.
+MAX_CACHED_NAMES = 50_000
+
+
+class _NameMatcher:
+    """Nombres exactos y prefijos indexados en diccionarios.
+
+    Los prefijos se agrupan por longitud, así que buscar los que coinciden
+    con un nombre es una consulta por cada longitud distinta (``name[:n]``)
+    en lugar de una comparación por regla. Además se recuerda el resultado de
+    cada nombre: los mismos nombres (``create``, ``_compute_display_name``,
+    ``_name``...) se repiten en casi todos los modelos.
+    """
+
+    __slots__ = ("_cache", "_names", "_prefixes")
+
+    def __init__(self, names, prefixes):
+        self._names = dict(names)
+        by_length = {}
+        for prefix, match in prefixes.items():
+            by_length.setdefault(len(prefix), {})[prefix] = match
+        # (longitud, prefijo -> coincidencia), de la más larga a la más corta.
+        self._prefixes = sorted(by_length.items(), reverse=True)
+        self._cache = {}
+
+    def _lookup(self, name):
+        best = self._names.get(name, _NO_MATCH)
+        for length, table in self._prefixes:
+            match = table.get(name[:length])
+            if match is not None and match < best:
+                best = match
+        return best
+
+    def best(self, name, best=None):
+        """Devuelve la coincidencia más prioritaria entre ``best`` y las
+        reglas que coinciden con ``name``."""
+        found = self._cache.get(name)
+        if found is None:
+            if len(self._cache) >= MAX_CACHED_NAMES:
+                self._cache.clear()
+            found = self._cache[name] = self._lookup(name)
+        if best is None or found < best:
+            return found
+        return best
+
+
+def _index(rules, kinds):
+    """Agrupa los valores de las reglas de cada tipo en diccionarios
+    valor -> (prioridad, categoría), conservando la regla más prioritaria."""
+    indexes = {kind: {} for kind in kinds}
+    for priority, rule in enumerate(rules):
+        if rule.kind not in indexes:
+            raise ValueError(
+                f"Unknown rule kind '{rule.kind}' for category '{rule.category}'"
+            )
+        index = indexes[rule.kind]
+        category = sys.intern(rule.category)
+        for value in rule.values:
+            index.setdefault(value, (priority, category))
+    return indexes
+
+
+class Classifier:
+    """Clasificador de clases y miembros compilado a partir de tablas de reglas.
+
+    Las reglas se compilan una sola vez en diccionarios, así que clasificar
+    un miembro son unas pocas consultas en vez de recorrer una cadena de
+    comparaciones. También precalcula la posición de cada categoría en el
+    orden esperado (por defecto ``EXPECTED_ORDER``). ``models_bases`` indica
+    qué clases son modelos Odoo y ``minimal`` si se reporta solo el mínimo de
+    miembros que hay que mover (ver ``minimal_order_violations``).
+
+    Para añadir reglas, crear un clasificador con tablas ampliadas::
+
+        Classifier(METHOD_RULES + (Rule("action_methods", "prefix", ("button_",)),))
+    """
+
+    __slots__ = (
+        "_decorators",
+        "_module_suffixes",
+        "_modules",
+        "_names",
+        "_targets",
+        "default",
+        "expected_order",
+        "minimal",
+        "models_bases",
+        "ranks",
+    )
+
+    def __init__(
+        self,
+        method_rules=METHOD_RULES,
+        assignment_rules=ASSIGNMENT_RULES,
+        expected_order=None,
+        default=DEFAULT_CATEGORY,
+        models_bases=MODELS_BASES,
+        minimal=False,
+    ):
+        # Las categorías se internan para que todos los ``Member`` compartan
+        # una sola copia de cada una, aunque vengan de la configuración.
+        if expected_order is None:
+            expected_order = EXPECTED_ORDER
+        self.expected_order = tuple(map(sys.intern, expected_order))
+        self.models_bases = tuple(models_bases)
+        self.minimal = minimal
+        self.ranks = {
+            cat: idx for idx, cat in reversed(list(enumerate(self.expected_order)))
+        }
+        self.default = sys.intern(default)
+        methods = _index(method_rules, ("name", "prefix", "decorator"))
+        self._names = _NameMatcher(methods["name"], methods["prefix"])
+        self._decorators = methods["decorator"]
+        assignments = _index(
+            assignment_rules,
+            ("target", "target_prefix", "value_module", "value_module_suffix"),
+        )
+        self._targets = _NameMatcher(
+            assignments["target"], assignments["target_prefix"]
+        )
+        self._modules = assignments["value_module"]
+        self._module_suffixes = tuple(assignments["value_module_suffix"].items())
+
+    def category(self, node):
+        """Devuelve la categoría de un miembro de una clase (ver
+        ``get_method_category``)."""
+        if isinstance(node, ast.Assign):
+            return self._assignment_category(node)
+        best = self._names.best(getattr(node, "name", ""))
+        decorators = getattr(node, "decorator_list", None)
+        if decorators and self._decorators:
+            for decorator in decorators:
+                match = self._decorators.get(get_decorator_name(decorator))
+                if match is not None and match < best:
+                    best = match
+        return best[1] if best is not _NO_MATCH else self.default
+
+    def _assignment_category(self, node):
+        best = _NO_MATCH
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                best = self._targets.best(target.id, best)
+        module = _call_module(node.value)
+        if module:
+            match = self._modules.get(module, _NO_MATCH)
+            for suffix, suffix_match in self._module_suffixes:
+                if (
+                    suffix_match < match
+                    and module.endswith(suffix)
+                    and len(module) > len(suffix)
+                    and module.isascii()
+                ):
+                    match = suffix_match
+            best = min(best, match)
+        return best[1] if best is not _NO_MATCH else self.default
+
+
+def _call_module(value):
+    """Devuelve ``x`` si ``value`` es una llamada ``x.attr(...)``."""
+    if isinstance(value, ast.Call) and isinstance(value.func, ast.Attribute):
+        return getattr(value.func.value, "id", "")
+    return ""
+
+
+DEFAULT_CLASSIFIER = Classifier()
+
 
 def is_field_assignment(node):
     """Determina si un nodo AST representa una asignación a un campo.
@@ -86,14 +323,7 @@ def is_field_assignment(node):
 
     if not isinstance(node, ast.Assign):
         return False
-    value = node.value
-    if isinstance(value, ast.Call):
-        if isinstance(value.func, ast.Attribute):
-            func_name = getattr(value.func.value, "id", "")
-            return bool(
-                re.match(r"^(fields|[a-zA-Z_][a-zA-Z0-9_]*_fields)$", func_name)
-            )
-    return False
+    return bool(_regex(FIELD_MODULE_PATTERN).match(_call_module(node.value)))
 
 
 def get_decorator_name(d):
@@ -111,171 +341,1152 @@ def get_decorator_name(d):
     return getattr(d, "attr", "")
 
 
-def get_method_category(node):
+def get_method_category(node, classifier=None):
     """Clasifica un nodo AST que representa un método o asignación en una
     categoría específica.
 
     Args:
         node (ast.AST): Nodo del árbol de sintaxis abstracta (AST) que representa
         un método o una asignación en una clase.
+        classifier (Classifier): Reglas a aplicar; por defecto las de
+            ``METHOD_RULES`` y ``ASSIGNMENT_RULES``.
 
     Returns:
         str: Categoría del método o asignación. Puede ser uno de los siguientes
         valores: EXPECTED_ORDER
     """
 
-    name = getattr(node, "name", "")
-    decorators = [get_decorator_name(d) for d in getattr(node, "decorator_list", [])]
-
-    if name == "init":
-        return "init_method"
-    if isinstance(node, ast.Assign):
-        targets = [t.id for t in node.targets if isinstance(t, ast.Name)]
-        if any(t == "_sql_constraints" for t in targets):
-            return "sql_constraints"
-        if any(t.startswith("_") for t in targets):
-            return "private_attributes"
-        if is_field_assignment(node):
-            return "field_declarations"
-        return "other_methods"
-
-    if name in ("default_get", "default") or name.startswith("_default_"):
-        return "default_methods"
-    if name.startswith("_domain_") or name.startswith("_selection_"):
-        return "selection_computed_methods"
-    if (
-        name.startswith("_compute_")
-        or name.startswith("_inverse_")
-        or name.startswith("_search_")
-    ):
-        return "compute_inverse_search"
-    if "constrains" in decorators:
-        return "constrains_methods"
-    if "onchange" in decorators or name.startswith("_onchange_"):
-        return "onchange_methods"
-    if name in CRUD_METHODS:
-        return "crud_methods"
-    if name.startswith("action_"):
-        return "action_methods"
-    return "other_methods"
-
-
-def check_order(method_order, filepath):
-    """Verifica que el orden de los métodos en una lista siga el orden esperado de
-    categorías.
+    return (classifier or DEFAULT_CLASSIFIER).category(node)
+
+
+class Violation(namedtuple("Violation", ("line", "message"))):
+    """Registro compacto de un error detectado en un archivo: ``line`` (int,
+    o None si el error es del archivo) y ``message`` (str).
+
+    No incluye la ruta del archivo para que pueda transmitirse entre procesos
+    (o reutilizarse) sin depender de dónde se encuentre el archivo. Es
+    inmutable y no tiene ``__dict__`` (``__slots__ = ()``).
+    """
+
+    __slots__ = ()
+
+    @property
+    def rule(self):
+        """Identificador de la regla incumplida: ``method-order``,
+        ``unknown-category`` o ``multiple-models``."""
+        if self.line is None:
+            return "multiple-models"
+        if self.message.startswith("Unknown category"):
+            return "unknown-category"
+        return "method-order"
+
+    def format(self, filepath):
+        """Devuelve el mensaje tal y como se imprime por consola."""
+        if self.line is None:
+            return f"{filepath}: {self.message}"
+        return f"{filepath}:{self.line}: {self.message}"
+
+
+class Member(namedtuple("Member", ("category", "line", "name"))):
+    """Miembro clasificado de una clase: ``category`` (str), ``line`` (int) y
+    ``name`` (str).
+
+    Se desempaqueta y se compara como la tupla (categoría, número de línea,
+    nombre) que se usaba antes. No tiene ``__dict__`` y sus cadenas son las
+    del clasificador y las del árbol ``ast`` (internadas), así que no guarda
+    ninguna referencia al árbol.
+    """
+
+    __slots__ = ()
+
+
+def format_violations(violations, filepath):
+    """Devuelve el texto que se imprime por consola para unos errores, con
+    una línea por error, para escribirlo de una sola vez."""
+    return "".join(f"{violation.format(filepath)}\n" for violation in violations)
+
+
+def order_violations(method_order, classifier=None):
+    """Calcula los errores de orden de una lista de métodos.
 
     Args:
         method_order (list): Lista de tuplas que representan los métodos, donde
             cada tupla contiene
             (categoría, número de línea, nombre del método).
-        filepath (str): Ruta al archivo que contiene los métodos.
+        classifier (Classifier): Clasificador con el orden esperado de las
+            categorías; por defecto ``EXPECTED_ORDER``.
     Returns:
-        bool: True si el orden de los métodos es correcto según las categorías
-              esperadas, False en caso contrario.
-
-    Imprime mensajes de advertencia si encuentra una categoría desconocida o si
-    un método está fuera de orden.
+        list: Lista de ``Violation`` con los métodos fuera de orden o con
+            categorías desconocidas.
     """
 
+    classifier = classifier or DEFAULT_CLASSIFIER
+    if classifier.minimal:
+        return minimal_order_violations(method_order, classifier)
+    ranks = classifier.ranks
+    violations = []
     current_max_index = -1
-    errors_found = False
     for index_method, method_data in enumerate(method_order):
         cat, lineno, name = method_data
-        try:
-            idx = EXPECTED_ORDER.index(cat)
-        except ValueError:
-            print(f"{filepath}:{lineno}: Unknown category '{cat}' in '{name}'")
-            errors_found = True
+        idx = ranks.get(cat)
+        if idx is None:
+            violations.append(
+                Violation(lineno, f"Unknown category '{cat}' in '{name}'")
+            )
             continue
         if idx < current_max_index:
-            expected_before = EXPECTED_ORDER[current_max_index]
+            expected_before = classifier.expected_order[current_max_index]
             prev_method = method_order[index_method - 1]
-            print(
-                f"{filepath}:{lineno}: '{name}' (category '{cat}') appears out "
-                f"of order. Should be before '{expected_before}' (before "
-                f"'{prev_method[0]}->{prev_method[2]}:{prev_method[1]}')"
+            violations.append(
+                Violation(
+                    lineno,
+                    f"'{name}' (category '{cat}') appears out "
+                    f"of order. Should be before '{expected_before}' (before "
+                    f"'{prev_method[0]}->{prev_method[2]}:{prev_method[1]}')",
+                )
             )
-            errors_found = True
         else:
             current_max_index = idx
-    return not errors_found
+    return violations
 
 
-def analyze_file(filepath):
-    """Analiza un archivo Python para determinar el orden de los métodos dentro
-    de las clases.
+def minimal_order_violations(method_order, classifier=None):
+    """Calcula el mínimo de miembros que hay que mover para ordenar una clase.
 
-    Si hay más de un modelo Odoo en el archivo, reporta un error y verifica el
-    orden de métodos por clase, no globalmente.
+    ``order_violations`` compara cada miembro con la categoría más alta vista
+    hasta entonces, así que un solo miembro adelantado hace que se reporten
+    todos los que le siguen. Aquí se calcula en O(n log n) la subsecuencia
+    más larga de miembros cuyas categorías ya están en orden (no
+    decreciente) y solo se reportan los demás, indicando antes o después de
+    qué miembro de esa subsecuencia hay que moverlos.
 
     Args:
-        filepath (str): Ruta al archivo Python que se va a analizar.
+        method_order (list): Ver ``order_violations``.
+        classifier (Classifier): Ver ``order_violations``.
 
     Returns:
-        bool: True si el orden es correcto y no hay múltiples modelos, False
-            en caso contrario.
+        list: Lista de ``Violation`` en el orden de los miembros.
+    """
+
+    from bisect import bisect_right
+
+    ranks = (classifier or DEFAULT_CLASSIFIER).ranks
+    known = [
+        (ranks[member[0]], member) for member in method_order if member[0] in ranks
+    ]
+    # tails[k]: índice en ``known`` del último miembro de la subsecuencia de
+    # longitud k + 1 con la categoría final más baja; parents enlaza cada
+    # miembro con el anterior de su subsecuencia (-1 si es el primero).
+    tails, tail_ranks, parents = [], [], []
+    for index, (rank, _member) in enumerate(known):
+        length = bisect_right(tail_ranks, rank)
+        parents.append(tails[length - 1] if length else -1)
+        if length == len(tails):
+            tails.append(index)
+            tail_ranks.append(rank)
+        else:
+            tails[length] = index
+            tail_ranks[length] = rank
+    kept = set()
+    index = tails[-1] if tails else -1
+    while index >= 0:
+        kept.add(index)
+        index = parents[index]
+    anchors = [known[index] for index in sorted(kept)]
+    anchor_ranks = [rank for rank, _member in anchors]
+
+    violations = []
+    position = 0
+    for cat, lineno, name in method_order:
+        if cat not in ranks:
+            violations.append(
+                Violation(lineno, f"Unknown category '{cat}' in '{name}'")
+            )
+            continue
+        rank, _member = known[position]
+        position += 1
+        if position - 1 in kept:
+            continue
+        target = bisect_right(anchor_ranks, rank)
+        if target < len(anchors):
+            where, anchor = "before", anchors[target][1]
+        else:
+            where, anchor = "after", anchors[-1][1]
+        violations.append(
+            Violation(
+                lineno,
+                f"'{name}' (category '{cat}') appears out of order. Move it "
+                f"{where} '{anchor[0]}->{anchor[2]}:{anchor[1]}'",
+            )
+        )
+    return violations
+
+
+def check_order(method_order, filepath, classifier=None):
+    """Verifica que el orden de los métodos en una lista siga el orden esperado de
+    categorías.
+
+    Args:
+        method_order (list): Lista de tuplas que representan los métodos, donde
+            cada tupla contiene
+            (categoría, número de línea, nombre del método).
+        filepath (str): Ruta al archivo que contiene los métodos.
+        classifier (Classifier): Ver ``order_violations``.
+    Returns:
+        bool: True si el orden de los métodos es correcto según las categorías
+              esperadas, False en caso contrario.
+
+    Imprime mensajes de advertencia si encuentra una categoría desconocida o si
+    un método está fuera de orden.
     """
 
-    with open(filepath, encoding="utf-8") as f:
-        tree = ast.parse(f.read(), filename=filepath)
+    violations = order_violations(method_order, classifier)
+    sys.stdout.write(format_violations(violations, filepath))
+    return not violations
+
 
+def find_model_classes(tree, models_bases=MODELS_BASES):
+    """Devuelve las clases de primer nivel que heredan de un modelo Odoo
+    (una de las clases de ``models_bases``)."""
     model_classes = []
     for node in tree.body:
         if isinstance(node, ast.ClassDef) and any(
             (
                 (
                     isinstance(base, ast.Attribute)
-                    and base.attr in MODELS_BASES
+                    and base.attr in models_bases
                     and getattr(base.value, "id", "") == "models"
                 )
-                or (isinstance(base, ast.Name) and base.id in MODELS_BASES)
+                or (isinstance(base, ast.Name) and base.id in models_bases)
             )
             for base in node.bases
         ):
             model_classes.append(node)
+    return model_classes
 
-    errors_found = False
-    if len(model_classes) > 1:
-        print(
-            f"{filepath}: ERROR: Multiple Odoo models found in the same file "
-            f"({len(model_classes)} classes)."
-        )
-        errors_found = True
 
-    for node in model_classes:
-        method_order = []
-        for subnode in node.body:
-            # Ignora docstrings o expresiones solitarias
-            if isinstance(subnode, ast.Expr) and isinstance(
+def class_members(node):
+    """Devuelve los miembros del cuerpo de una clase que se clasifican."""
+    return [
+        subnode
+        for subnode in node.body
+        # Ignora docstrings o expresiones solitarias
+        if not (
+            isinstance(subnode, ast.Expr)
+            and isinstance(
                 subnode.value,
                 ast.Str | ast.Constant,
-            ):
-                continue
-            cat = get_method_category(subnode)
-            name = getattr(subnode, "name", None)
-            if not name and isinstance(subnode, ast.Assign):
-                name = subnode.targets[0].id
-            method_order.append((cat, subnode.lineno, name or "<unnamed>"))
-        if not check_order(method_order, filepath):
-            errors_found = True
+            )
+        )
+    ]
+
+
+def class_method_order(node, classifier=None):
+    """Clasifica los miembros del cuerpo de una clase.
+
+    Args:
+        node (ast.ClassDef): Clase a analizar.
+        classifier (Classifier): Reglas de clasificación; por defecto
+            ``DEFAULT_CLASSIFIER``.
+
+    Returns:
+        list: Registros ``Member`` (categoría, número de línea, nombre del
+            método) en el orden en que aparecen en la clase.
+    """
+
+    category = (classifier or DEFAULT_CLASSIFIER).category
+    method_order = []
+    for subnode in class_members(node):
+        cat = category(subnode)
+        name = getattr(subnode, "name", None)
+        if not name and isinstance(subnode, ast.Assign):
+            name = subnode.targets[0].id
+        method_order.append(Member(cat, subnode.lineno, name or "<unnamed>"))
+    return method_order
+
+
+def may_contain_models(source, models_bases=MODELS_BASES):
+    """Indica si el contenido de un archivo puede definir un modelo Odoo.
+
+    Es un filtro conservador sobre los bytes sin decodificar: una clase modelo
+    necesita la palabra ``class`` y el nombre de una de las bases de
+    ``MODELS_BASES`` (tanto en la forma ``models.Model`` como ``Model``), así
+    que si falta alguno de ellos no hace falta analizar el archivo.
+
+    Args:
+        source (bytes): Contenido del archivo.
+        models_bases (tuple): Nombres de las clases base de los modelos.
+
+    Returns:
+        bool: False si el archivo no puede contener modelos Odoo.
+    """
+
+    if b"class" not in source:
+        return False
+    return any(base.encode() in source for base in models_bases)
+
+
+# Elementos léxicos necesarios para encontrar las sentencias de primer nivel
+# sin tokenizar todo el archivo: cadenas (que pueden contener cualquier cosa),
+# comentarios, paréntesis (dentro de ellos no empiezan sentencias) y saltos de
+# línea seguidos de código en la columna 0 (ver ``_COLUMN_ZERO_PATTERN`` para
+# los saltos de página).
+_TOP_LEVEL_TOKENS_PATTERN = r"""(?xs)
+    (?P<top>(?:\A|\n)(?=(?:[ \t\f]*\f)?[^\s#)\]}]))
+    | (?P<string>
+        '''[^'\\]*(?:(?:\\.|'(?!''))[^'\\]*)*'''
+        | \"\"\"[^"\\]*(?:(?:\\.|"(?!""))[^"\\]*)*\"\"\"
+        | '[^'\\\n]*(?:\\.[^'\\\n]*)*'
+        | "[^"\\\n]*(?:\\.[^"\\\n]*)*"
+    )
+    | \#[^\n]*
+    | (?P<open>[(\[{])
+    | (?P<close>[)\]}])
+"""
+
+# Por debajo de este tamaño analizar el archivo completo es más rápido que
+# buscar antes los bloques de las clases.
+PARTIAL_PARSE_MIN_BYTES = 32 * 1024
+
+# Si las clases que pueden ser modelos ocupan más de esta fracción del
+# archivo, buscar sus bloques cuesta más de lo que se ahorra y se analiza el
+# archivo completo.
+PARTIAL_PARSE_MAX_FRACTION = 0.5
+
+# Líneas que empiezan en la columna 0 con algo que no es un comentario ni el
+# cierre de un paréntesis: casi siempre el inicio de una sentencia. Un salto
+# de página (``\f``) devuelve la sangría a la columna 0, así que puede haber
+# espacios y saltos de página delante si terminan en un salto de página.
+_COLUMN_ZERO_PATTERN = r"(?m)^(?:[ \t\f]*\f)?[^\s#)\]}]"
+
+
+def estimated_model_fraction(text, models_bases=MODELS_BASES):
+    """Estima qué fracción de ``text`` ocupan las clases de primer nivel que
+    pueden ser modelos Odoo, sin tokenizar el archivo.
+
+    A diferencia de ``top_level_statements`` no reconoce cadenas ni
+    paréntesis: cada línea que empieza en la columna 0 cuenta como el inicio
+    de una sentencia. Es una estimación para decidir si conviene
+    ``parse_model_blocks``, no para buscar los bloques.
+
+    Returns:
+        float: Fracción entre 0 y 1.
+    """
+
+    if not text:
+        return 0.0
+    starts = [match.end() - 1 for match in _regex(_COLUMN_ZERO_PATTERN).finditer(text)]
+    starts.append(len(text))
+    covered = 0
+    for i, start in enumerate(starts[:-1]):
+        end = starts[i + 1]
+        if text.startswith("class", start) and any(
+            base in text[start:end] for base in models_bases
+        ):
+            covered += end - start
+    return covered / len(text)
+
+
+def top_level_statements(text):
+    """Busca el inicio de las sentencias de primer nivel de un archivo.
+
+    Es un tokenizador mínimo basado en una expresión regular: solo reconoce
+    cadenas, comentarios y paréntesis, lo necesario para saber qué líneas que
+    empiezan en la columna 0 son realmente el inicio de una sentencia.
+
+    Args:
+        text (str): Código del archivo, con saltos de línea ``\\n``.
+
+    Returns:
+        list: Tuplas (posición en ``text``, número de línea) de cada
+            sentencia.
+    """
+
+    statements = []
+    depth = 0
+    lineno = 1
+    last = 0
+    for match in _regex(_TOP_LEVEL_TOKENS_PATTERN).finditer(text):
+        kind = match.lastgroup
+        if kind == "open":
+            depth += 1
+        elif kind == "close":
+            depth = max(depth - 1, 0)
+        elif kind == "top" and not depth:
+            start = match.end()
+            lineno += text.count("\n", last, start)
+            last = start
+            statements.append((start, lineno))
+    return statements
+
+
+def _skip_form_feeds(text, start):
+    """Salta los espacios y saltos de página de delante de una sentencia de
+    primer nivel (ver ``_COLUMN_ZERO_PATTERN``)."""
+    while text[start] in " \t\f":
+        start += 1
+    return start
+
+
+def model_blocks(text, models_bases=MODELS_BASES):
+    """Busca los bloques de las clases de primer nivel que pueden ser modelos
+    Odoo (las que mencionan alguna de las clases de ``models_bases``).
+
+    Args:
+        text (str): Código del archivo, con saltos de línea ``\\n``.
+        models_bases (tuple): Nombres de las clases base de los modelos.
+
+    Yields:
+        tuple: (número de línea, texto del bloque) de cada clase con sus
+            decoradores, hasta la siguiente sentencia de primer nivel.
+    """
+
+    statements = top_level_statements(text)
+    for i, (start, _lineno) in enumerate(statements):
+        if not text.startswith(("class ", "class\t"), _skip_form_feeds(text, start)):
+            continue
+        first = i
+        while first and text.startswith(
+            "@", _skip_form_feeds(text, statements[first - 1][0])
+        ):
+            first -= 1
+        block_start, block_lineno = statements[first]
+        end = statements[i + 1][0] if i + 1 < len(statements) else len(text)
+        block = text[block_start:end]
+        if any(base in block for base in models_bases):
+            yield block_lineno, block
+
+
+def parse_model_blocks(text, filepath, models_bases=MODELS_BASES):
+    """Analiza solo los bloques de las clases de primer nivel que pueden ser
+    modelos Odoo.
+
+    Cada bloque (la clase con sus decoradores) se analiza por separado
+    precedido de tantas líneas en blanco como líneas tiene el archivo antes
+    del bloque, de modo que los números de línea son los del archivo. El
+    código de fuera de las clases (tablas de datos, funciones auxiliares) no
+    se analiza, así que sus errores de sintaxis no se detectan.
+
+    Args:
+        text (str): Código del archivo.
+        filepath (str): Ruta del archivo, usada en los errores de sintaxis.
+        models_bases (tuple): Nombres de las clases base de los modelos.
+
+    Returns:
+        ast.Module: Módulo con las clases encontradas, o None si algún bloque
+            no se puede analizar (el llamador debe analizar el archivo
+            completo).
+    """
+
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    body = []
+    for lineno, block in model_blocks(text, models_bases):
+        try:
+            tree = ast.parse("\n" * (lineno - 1) + block, filename=filepath)
+        except SyntaxError:
+            return None
+        body.extend(tree.body)
+    return ast.Module(body=body, type_ignores=[])
+
+
+def class_span(node):
+    """Devuelve las líneas (inicio, fin) de una clase, incluidos sus decoradores."""
+    start = min([node.lineno] + [d.lineno for d in node.decorator_list])
+    return start, node.end_lineno
+
+
+class _NoTimer:
+    """Temporizador que no mide nada; ver ``profiling.PhaseTimer``."""
+
+    __slots__ = ()
+
+    def __call__(self, phase):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NO_TIMER = _NoTimer()
+
+
+def file_violations(
+    filepath, stats=None, changed=None, timer=None, classifier=None, source=None
+):
+    """Analiza un archivo Python y devuelve los errores encontrados sin
+    imprimirlos.
+
+    Si hay más de un modelo Odoo en el archivo, reporta un error y verifica el
+    orden de métodos por clase, no globalmente.
+
+    Args:
+        filepath (str): Ruta al archivo Python que se va a analizar.
+        stats (collections.Counter): Si se indica, cuenta los archivos
+            analizados (``parsed``) y descartados por el prefiltro
+            (``prefiltered``).
+        changed (diff.LineIndex): Si se indica, solo se analizan los modelos
+            cuyas líneas contienen algún cambio.
+        timer (profiling.PhaseTimer): Si se indica, mide el tiempo de cada
+            fase del análisis.
+        classifier (Classifier): Reglas de clasificación y orden esperado;
+            por defecto ``DEFAULT_CLASSIFIER``.
+        source (bytes): Contenido del archivo si ya se leyó (p. ej. con
+            ``readahead.ReadAhead``); si no, se lee de ``filepath``.
+
+    Returns:
+        list: Lista de ``Violation`` en el orden en que se deben reportar.
+    """
+
+    timer = timer or NO_TIMER
+    if source is None:
+        with timer("read"), open(filepath, "rb") as f:
+            source = f.read()
+    return source_violations(
+        source,
+        filepath,
+        stats=stats,
+        changed=changed,
+        timer=timer,
+        classifier=classifier,
+    )
+
+
+def source_violations(
+    source, filepath, stats=None, changed=None, timer=None, classifier=None
+):
+    """Igual que ``file_violations`` pero a partir del contenido ya leído.
+
+    Args:
+        source (bytes): Contenido del archivo.
+        filepath (str): Ruta del archivo, usada en los errores de sintaxis.
+        stats (collections.Counter): Ver ``file_violations``.
+        changed (diff.LineIndex): Ver ``file_violations``.
+        timer (profiling.PhaseTimer): Ver ``file_violations``.
+        classifier (Classifier): Ver ``file_violations``.
+
+    Returns:
+        list: Lista de ``Violation`` en el orden en que se deben reportar.
+    """
+
+    timer = timer or NO_TIMER
+    classifier = classifier or DEFAULT_CLASSIFIER
+    with timer("prefilter"):
+        candidate = may_contain_models(source, classifier.models_bases)
+    if not candidate:
+        if stats is not None:
+            stats["prefiltered"] += 1
+        return []
+    if stats is not None:
+        stats["parsed"] += 1
+
+    with timer("decode"):
+        text = source.decode("utf-8")
+    with timer("parse"):
+        tree = None
+        if (
+            len(source) >= PARTIAL_PARSE_MIN_BYTES
+            and estimated_model_fraction(text, classifier.models_bases)
+            <= PARTIAL_PARSE_MAX_FRACTION
+        ):
+            tree = parse_model_blocks(text, filepath, classifier.models_bases)
+        if tree is None:
+            tree = ast.parse(text, filename=filepath)
+
+    with timer("models"):
+        model_classes = find_model_classes(tree, classifier.models_bases)
+        if changed is not None:
+            changed_classes = [
+                node for node in model_classes if changed.intersects(*class_span(node))
+            ]
+        else:
+            changed_classes = model_classes
+    if not changed_classes:
+        return []
+    count = len(model_classes)
+    with timer("classification"):
+        method_orders = [
+            class_method_order(node, classifier) for node in changed_classes
+        ]
+    # El árbol ya no hace falta: se libera antes de comprobar el orden.
+    del text, tree, model_classes, changed_classes
+    return member_violations(count, method_orders, timer, classifier)
+
+
+def multiple_models_violation(count):
+    """Devuelve el error de un archivo con ``count`` modelos."""
+    return Violation(
+        None,
+        f"ERROR: Multiple Odoo models found in the same file ({count} classes).",
+    )
+
+
+def model_violations(model_classes, checked=None, timer=None, classifier=None):
+    """Calcula los errores de los modelos de un archivo ya analizado.
+
+    Args:
+        model_classes (list): Clases de ``find_model_classes``.
+        checked (list): Clases cuyo orden se comprueba; por defecto todas.
+        timer (profiling.PhaseTimer): Ver ``file_violations``.
+        classifier (Classifier): Ver ``file_violations``.
+
+    Returns:
+        list: Lista de ``Violation`` en el orden en que se deben reportar.
+    """
+
+    timer = timer or NO_TIMER
+    with timer("classification"):
+        method_orders = [
+            class_method_order(node, classifier)
+            for node in (model_classes if checked is None else checked)
+        ]
+    return member_violations(len(model_classes), method_orders, timer, classifier)
+
+
+def member_violations(count, method_orders, timer=None, classifier=None):
+    """Calcula los errores de un archivo a partir de los miembros ya
+    clasificados de sus modelos, sin necesitar el árbol ``ast``.
+
+    Args:
+        count (int): Número de modelos del archivo.
+        method_orders (list): Listas de ``Member`` de las clases que se
+            comprueban (ver ``class_method_order``).
+        timer (profiling.PhaseTimer): Ver ``file_violations``.
+        classifier (Classifier): Ver ``file_violations``.
+
+    Returns:
+        list: Lista de ``Violation`` en el orden en que se deben reportar.
+    """
+
+    timer = timer or NO_TIMER
+    classifier = classifier or DEFAULT_CLASSIFIER
+    violations = []
+    if count > 1:
+        violations.append(multiple_models_violation(count))
+    with timer("ordering"):
+        for method_order in method_orders:
+            violations.extend(order_violations(method_order, classifier))
+    return violations
+
+
+def analyze_file(filepath):
+    """Analiza un archivo Python para determinar el orden de los métodos dentro
+    de las clases.
+
+    Si hay más de un modelo Odoo en el archivo, reporta un error y verifica el
+    orden de métodos por clase, no globalmente.
+
+    Args:
+        filepath (str): Ruta al archivo Python que se va a analizar.
+
+    Returns:
+        bool: True si el orden es correcto y no hay múltiples modelos, False
+            en caso contrario.
+    """
 
-    return not errors_found
+    violations = file_violations(filepath)
+    sys.stdout.write(format_violations(violations, filepath))
+    return not violations
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Check Odoo method order.")
+def _help_formatter(prog):
+    """Como ``argparse.HelpFormatter``, pero calcula el ancho del terminal sin
+    importar ``shutil`` (que importa ``bz2`` y ``lzma``), ya que ``argparse``
+    crea un formateador al definir cada opción."""
+    import argparse
+
+    try:
+        width = int(os.environ["COLUMNS"])
+    except (KeyError, ValueError):
+        try:
+            width = os.get_terminal_size(sys.__stdout__.fileno()).columns
+        except (AttributeError, ValueError, OSError):
+            width = 80
+    return argparse.HelpFormatter(prog, width=width - 2)
+
+
+def build_parser():
+    """Construye el analizador de argumentos de la línea de comandos."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Check Odoo method order.",
+        epilog="Use 'odoo-method-order merge REPORT...' to combine the JSON "
+        "reports of several --shard runs.",
+        fromfile_prefix_chars="@",
+        formatter_class=_help_formatter,
+    )
     parser.add_argument(
         "--exit-zero",
         action="store_true",
         help="Always return exit code 0 (even if errors are found).",
     )
-    parser.add_argument("files", nargs="+", help="Python files to check.")
-    args = parser.parse_args()
+    parser.add_argument(
+        "--format",
+        choices=("text", "json", "sarif"),
+        default="text",
+        help="Output format (default: text).",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        default="1",
+        help="Number of worker processes, or 'auto' to use one per CPU "
+        "(default: 1, no worker processes).",
+    )
+    parser.add_argument(
+        "--read-ahead",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Without --jobs, read the next N files in background threads "
+        "while the current one is checked, for slow or network file systems "
+        "(default: 0, no read-ahead; ignored with --fix). Cached files are "
+        "read too.",
+    )
+    parser.add_argument(
+        "--read-ahead-memory",
+        type=int,
+        default=64,
+        metavar="MB",
+        help="Maximum memory, in MiB, of the file contents read ahead (default: 64).",
+    )
+    parser.add_argument(
+        "--fix",
+        action="store_true",
+        help="Reorder the members of the models with ordering errors in place "
+        "and report the errors that remain (implies --no-cache).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the persistent result cache.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory of the persistent result cache "
+        "(default: $XDG_CACHE_HOME/hg-odoo-pre-commit-hooks).",
+    )
+    parser.add_argument(
+        "--no-config",
+        action="store_true",
+        help="Ignore the [tool.hg-odoo-pre-commit-hooks] sections of the "
+        "pyproject.toml files and use the built-in settings.",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print how many files were parsed, skipped by the prefilter or "
+        "read from the cache to stderr.",
+    )
+    parser.add_argument(
+        "--addons-path",
+        action="append",
+        default=[],
+        metavar="DIR[,DIR...]",
+        help="Check every Python file of the Odoo addons (directories with a "
+        "__manifest__.py) found under these directories.",
+    )
+    parser.add_argument(
+        "--files-from",
+        metavar="FILE",
+        help="Also check the files listed in FILE ('-' for stdin), one per "
+        "line; the list is read while the files are checked.",
+    )
+    parser.add_argument(
+        "--null",
+        action="store_true",
+        help="The --files-from list is NUL-separated (e.g. git ls-files -z).",
+    )
+    parser.add_argument(
+        "--shard",
+        metavar="INDEX/COUNT",
+        help="Only check the INDEX-th of COUNT groups of the input files "
+        "(e.g. 2/4). Every run with the same files computes the same groups, "
+        "balanced by file size.",
+    )
+    diff_group = parser.add_mutually_exclusive_group()
+    diff_group.add_argument(
+        "--diff-from",
+        metavar="REF",
+        help="Only check the models changed since the git reference REF "
+        "(implies --no-cache).",
+    )
+    diff_group.add_argument(
+        "--diff-staged",
+        action="store_true",
+        help="Only check the models with staged changes (implies --no-cache).",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print the time spent in each phase of the analysis and the "
+        "slowest files to stderr.",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=10,
+        metavar="N",
+        help="Number of slowest files listed by --profile (default: 10).",
+    )
+    parser.add_argument(
+        "--cprofile",
+        metavar="FILE",
+        help="Run under cProfile, save the statistics to FILE and print the "
+        "functions with the most cumulative time to stderr (only the main "
+        "process is profiled when using --jobs).",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run a server that keeps results in memory and answers the "
+        "requests of odoo-method-order-client.",
+    )
+    parser.add_argument(
+        "--socket",
+        help="Unix socket of --daemon (default: "
+        "$XDG_RUNTIME_DIR/hg-odoo-pre-commit-hooks.sock).",
+    )
+    parser.add_argument(
+        "--watch",
+        action="append",
+        default=[],
+        metavar="PATH",
+        help="Check the Python files under PATH, then re-check the files that "
+        "change and print the errors that appear (+) or disappear (-) until "
+        "interrupted.",
+    )
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="With --watch, detect changes by polling instead of inotify "
+        "(e.g. on network file systems).",
+    )
+    parser.add_argument(
+        "files",
+        nargs="*",
+        help="Python files to check. Use @FILE to read more arguments from "
+        "FILE, one per line.",
+    )
+    return parser
 
-    success = True
+
+def _files_from(parser, args):
+    """Abre la lista de archivos de ``--files-from``.
+
+    Returns:
+        Gestor de contexto que devuelve el flujo binario de la lista (o None
+        sin ``--files-from``) y, si es un archivo, lo cierra al salir.
+    """
+
+    from contextlib import nullcontext
+
+    if not args.files_from:
+        return nullcontext()
+    if args.files_from == "-":
+        return nullcontext(sys.stdin.buffer)
+    try:
+        return open(args.files_from, "rb")
+    except OSError as e:
+        parser.error(f"argument --files-from: {e}")
+
+
+def _input_files(parser, args, stream):
+    """Devuelve un iterable con los archivos a analizar.
+
+    ``stream`` es el flujo de ``--files-from`` (ver ``_files_from``).
+    """
+    files = args.files
+    if args.null and not args.files_from:
+        parser.error("--null requires --files-from")
+    if args.files_from:
+        from hg_odoo_pre_commit_hooks import discovery
+
+        separator = b"\0" if args.null else b"\n"
+        files = itertools.chain(files, discovery.iter_file_list(stream, separator))
+    if args.addons_path:
+        from hg_odoo_pre_commit_hooks import discovery
+
+        addons_paths = discovery.split_addons_paths(args.addons_path)
+        for path in addons_paths:
+            if not os.path.isdir(path):
+                parser.error(f"argument --addons-path: {path!r} is not a directory")
+        files = itertools.chain(files, discovery.iter_addon_files(addons_paths))
+    elif not files and not args.files_from:
+        parser.error("no files to check: pass files, --files-from or --addons-path")
+    if args.shard:
+        from hg_odoo_pre_commit_hooks import shard
+
+        try:
+            index, count = shard.parse_shard(args.shard)
+        except ValueError as e:
+            parser.error(f"argument --shard: {e}")
+        files = shard.shard_files(files, index, count)
+    return files
+
+
+def _special_check(parser, args, files, resolver):
+    """Prepara el análisis de ``--diff-from``/``--diff-staged`` o ``--fix``,
+    que no usan la caché.
+
+    Returns:
+        tuple: (archivos a analizar, función de análisis o None).
+    """
+
+    check = None
+    if args.diff_from or args.diff_staged:
+        from hg_odoo_pre_commit_hooks import diff
+
+        try:
+            changes = diff.changed_lines(args.diff_from, staged=args.diff_staged)
+        except diff.GitError as e:
+            parser.error(f"cannot read the git diff: {e}")
+        diff_filter = diff.DiffFilter(changes, resolver)
+        files = filter(diff_filter.has_changes, files)
+        check = diff_filter.violations
+        args.no_cache = True
+    if args.fix:
+        if check is not None:
+            parser.error("--fix cannot be combined with --diff-from or --diff-staged")
+        from hg_odoo_pre_commit_hooks.fixer import Fixer
+
+        check = Fixer(resolver).violations
+        args.no_cache = True
+    return files, check
+
+
+# Con unos pocos archivos pequeños, analizarlos es más rápido que abrir la
+# caché de resultados (importar ``sqlite3`` y consultar la base de datos), así
+# que no se usa salvo que se indique ``--cache-dir``.
+SMALL_RUN_FILES = 3
+SMALL_RUN_BYTES = 16 * 1024
+
+
+def _small_run(args):
+    """Indica si solo se analizan unos pocos archivos pequeños indicados en
+    la línea de órdenes (ver ``SMALL_RUN_FILES``)."""
+    if args.files_from or args.addons_path or len(args.files) > SMALL_RUN_FILES:
+        return False
+    size = 0
     for filepath in args.files:
-        if not analyze_file(filepath):
-            success = False
+        try:
+            size += os.stat(filepath).st_size
+        except OSError:
+            pass
+    return size <= SMALL_RUN_BYTES
+
+
+def _iter_results(parser, args, files):
+    """Analiza los archivos con las opciones indicadas.
+
+    Yields:
+        tuple: (ruta, lista de ``Violation``, ``collections.Counter`` con las
+            estadísticas del archivo) en el orden de ``files``.
+    """
+
+    resolver = None
+    if not args.no_config:
+        from hg_odoo_pre_commit_hooks.config import ConfigResolver
+
+        resolver = ConfigResolver()
+    files, check = _special_check(parser, args, files, resolver)
+
+    jobs = 1
+    if args.jobs != "1":
+        from hg_odoo_pre_commit_hooks import parallel
+
+        try:
+            jobs = parallel.resolve_jobs(args.jobs)
+        except ValueError as e:
+            parser.error(str(e))
+
+    cache = cache_dir = None
+    if not args.no_cache and (args.cache_dir or not _small_run(args)):
+        from hg_odoo_pre_commit_hooks.cache import ResultCache, default_cache_dir
+
+        cache_dir = args.cache_dir or default_cache_dir()
+        cache = ResultCache.open(cache_dir, resolver=resolver)
+        if not cache:
+            cache_dir = None
+
+    try:
+        if jobs > 1:
+            yield from parallel.iter_results(
+                files,
+                jobs,
+                check=check,
+                cache_dir=cache_dir,
+                profile=args.profile,
+                resolver=resolver,
+            )
+        else:
+            if check is None:
+                check = file_violations
+                if cache:
+                    check = cache.violations
+                elif resolver:
+                    check = resolver.violations
+            yield from _serial_results(args, files, check)
+    finally:
+        if cache:
+            cache.close()
+
+
+def _serial_results(args, files, check):
+    """Analiza los archivos en este proceso, leyendo por adelantado los
+    siguientes si se pide ``--read-ahead``.
+
+    Yields:
+        tuple: Como ``_iter_results``.
+    """
+
+    make_timer = None
+    if args.profile:
+        from hg_odoo_pre_commit_hooks.profiling import PhaseTimer
+
+        make_timer = PhaseTimer
+    if not args.read_ahead or args.fix:
+        for filepath in files:
+            stats = Counter()
+            timer = make_timer and make_timer(stats)
+            yield filepath, check(filepath, stats, timer=timer), stats
+        return
+
+    from hg_odoo_pre_commit_hooks.readahead import ReadAhead
+
+    max_bytes = args.read_ahead_memory * 1024 * 1024
+    with ReadAhead(files, args.read_ahead, max_bytes) as sources:
+        while True:
+            stats = Counter()
+            timer = make_timer and make_timer(stats)
+            # Lo que se mide como lectura es la espera al hilo lector.
+            with (timer or NO_TIMER)("read"):
+                item = next(sources, None)
+            if item is None:
+                return
+            filepath, source = item
+            violations = check(filepath, stats, timer=timer, source=source)
+            yield filepath, violations, stats
+
+
+def _run(parser, args):
+    """Analiza los archivos e imprime los errores.
+
+    Returns:
+        bool: True si no se encontró ningún error.
+    """
+
+    # ``--files-from`` se lee a medida que se analizan los archivos, así que
+    # se cierra al terminar el análisis.
+    with _files_from(parser, args) as stream:
+        return _check_files(parser, args, _input_files(parser, args, stream))
+
+
+def _check_files(parser, args, files):
+    """Analiza ``files`` e imprime los errores (ver ``_run``)."""
+    if args.read_ahead < 0:
+        parser.error("argument --read-ahead: must not be negative")
+    if args.read_ahead_memory < 1:
+        parser.error("argument --read-ahead-memory: must be positive")
+    profile = None
+    if args.profile:
+        from hg_odoo_pre_commit_hooks.profiling import PhaseTimer, Profile
+
+        profile = Profile(top=args.profile_top)
+        start = time.perf_counter()
+
+    from hg_odoo_pre_commit_hooks.config import ConfigError
+    from hg_odoo_pre_commit_hooks.reporters import REPORTERS
+
+    reporter = REPORTERS[args.format](sys.stdout)
+    totals = Counter()
+    success = True
+    try:
+        for filepath, violations, stats in _iter_results(parser, args, files):
+            with PhaseTimer(stats)("output") if profile else NO_TIMER:
+                reporter.add(filepath, violations)
+            if stats["fixed"]:
+                print(f"Fixed {filepath}", file=sys.stderr)
+            if violations:
+                success = False
+            totals.update(stats)
+            if profile:
+                profile.add(filepath, stats)
+    except ConfigError as e:
+        parser.error(f"invalid configuration: {e}")
+    reporter.finish()
+
+    if args.stats:
+        counted = totals["parsed"] + totals["prefiltered"] + totals["cached"]
+        print(
+            f"{counted} files: {totals['parsed']} parsed, "
+            f"{totals['prefiltered']} skipped by the prefilter, "
+            f"{totals['cached']} from the cache.",
+            file=sys.stderr,
+        )
+    if profile:
+        sys.stdout.flush()
+        sys.stderr.write(profile.report(time.perf_counter() - start))
+    return success
+
+
+def _watch(parser, args):
+    """Ejecuta ``--watch``."""
+    if args.fix or args.diff_from or args.diff_staged or args.format != "text":
+        parser.error(
+            "--watch cannot be combined with --fix, --diff-from, --diff-staged "
+            "or --format"
+        )
+    from hg_odoo_pre_commit_hooks import watch
+    from hg_odoo_pre_commit_hooks.config import ConfigResolver
+
+    watcher = watch.make_watcher(args.watch, args.poll)
+    if args.no_config:
+        watch.watch(args.watch, file_violations, watcher=watcher)
+        return
+    # La configuración se vuelve a leer cuando cambia algún pyproject.toml.
+    resolver = ConfigResolver()
+    watch.watch(args.watch, resolver.violations, watcher=watcher, reset=resolver.clear)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["merge"]:
+        from hg_odoo_pre_commit_hooks import shard
+
+        shard.merge_main(argv[1:])
+        return
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.daemon:
+        from hg_odoo_pre_commit_hooks import client, daemon
+
+        try:
+            daemon.serve(args.socket or client.default_socket_path())
+        except RuntimeError as e:
+            parser.error(str(e))
+        return
+
+    if args.watch:
+        _watch(parser, args)
+        return
+
+    if args.cprofile:
+        import cProfile
+
+        from hg_odoo_pre_commit_hooks.profiling import cprofile_report
+
+        profiler = cProfile.Profile()
+        success = profiler.runcall(_run, parser, args)
+        sys.stdout.flush()
+        sys.stderr.write(cprofile_report(profiler, args.cprofile))
+    else:
+        success = _run(parser, args)
     if not success and not args.exit_zero:
         sys.exit(1)
 
@@ -0,0 +1,262 @@
+"""checks.py
+
+Registro de comprobaciones que comparten un único análisis de cada archivo.
+
+Cada archivo se lee, se decodifica y se analiza con ``ast`` una sola vez; el
+resultado, junto con las anotaciones que necesitan varias comprobaciones
+(modelos Odoo, alias de los imports y nombres de los decoradores), se guarda
+en un ``FileContext`` que reciben todas las comprobaciones registradas. Las
+anotaciones se calculan la primera vez que se piden.
+
+Una comprobación es una función que recibe el ``FileContext`` y devuelve una
+lista de ``Violation``::
+
+    from hg_odoo_pre_commit_hooks.checks import register
+
+    @register("my-check", prefilter=lambda source, classifier: b"_name" in source)
+    def my_check(context):
+        return [...]
+
+El ``prefilter`` opcional recibe el contenido del archivo (``bytes``) y
+permite descartarlo sin analizarlo; si todas las comprobaciones lo descartan,
+el archivo no se analiza.
+
+Uso:
+    hg-odoo-check [--select CHECK[,CHECK...]] [--list-checks] archivo1.py ...
+"""
+
+import argparse
+import ast
+import sys
+from collections import namedtuple
+from functools import cached_property
+
+from hg_odoo_pre_commit_hooks.check_method_order import (
+    DEFAULT_CLASSIFIER,
+    find_model_classes,
+    get_decorator_name,
+    may_contain_models,
+    model_violations,
+)
+
+
+class Check(namedtuple("Check", ("name", "function", "prefilter"))):
+    """Comprobación registrada: ``name`` (str), ``function`` (la función de la
+    comprobación) y ``prefilter`` (función de descarte previo, o None).
+    """
+
+    __slots__ = ()
+
+
+# Nombre -> ``Check``, en el orden en que se ejecutan y se reportan.
+CHECKS = {}
+
+
+def register(name, prefilter=None):
+    """Decorador que registra una comprobación con el nombre indicado.
+
+    Args:
+        name (str): Nombre de la comprobación (``--select``).
+        prefilter (callable): Función ``(source, classifier) -> bool`` que
+            devuelve False si el archivo no puede tener errores.
+
+    Raises:
+        ValueError: Si ya hay una comprobación con ese nombre.
+    """
+
+    def decorator(function):
+        if name in CHECKS:
+            raise ValueError(f"Check '{name}' is already registered")
+        CHECKS[name] = Check(name, function, prefilter)
+        return function
+
+    return decorator
+
+
+class FileContext:
+    """Contenido de un archivo, analizado una sola vez, y sus anotaciones."""
+
+    def __init__(self, filepath, source, classifier=None):
+        self.filepath = filepath
+        self.source = source
+        self.classifier = classifier or DEFAULT_CLASSIFIER
+
+    @cached_property
+    def text(self):
+        """Contenido del archivo decodificado."""
+        return self.source.decode("utf-8")
+
+    @cached_property
+    def tree(self):
+        """Árbol ``ast`` del archivo completo."""
+        return ast.parse(self.text, filename=self.filepath)
+
+    @cached_property
+    def model_classes(self):
+        """Clases de primer nivel que son modelos Odoo."""
+        return find_model_classes(self.tree, self.classifier.models_bases)
+
+    @cached_property
+    def import_aliases(self):
+        """Diccionario nombre local -> nombre importado de los imports de
+        primer nivel (``from odoo import models as m`` da ``{"m":
+        "odoo.models"}``)."""
+        aliases = {}
+        for node in self.tree.body:
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    if alias.asname:
+                        aliases[alias.asname] = alias.name
+                    else:
+                        name = alias.name.partition(".")[0]
+                        aliases[name] = name
+            elif isinstance(node, ast.ImportFrom):
+                module = "." * node.level + (node.module or "")
+                separator = "" if module.endswith(".") else "."
+                for alias in node.names:
+                    imported = f"{module}{separator}{alias.name}"
+                    aliases[alias.asname or alias.name] = imported
+        return aliases
+
+    @cached_property
+    def decorators(self):
+        """Diccionario método -> tupla con los nombres de sus decoradores,
+        para los métodos de los modelos."""
+        return {
+            member: tuple(get_decorator_name(d) for d in member.decorator_list)
+            for node in self.model_classes
+            for member in node.body
+            if isinstance(member, ast.FunctionDef | ast.AsyncFunctionDef)
+        }
+
+
+def _method_order_prefilter(source, classifier):
+    return may_contain_models(source, classifier.models_bases)
+
+
+@register("method-order", prefilter=_method_order_prefilter)
+def method_order(context):
+    """Orden de los miembros de los modelos y un solo modelo por archivo."""
+    return model_violations(context.model_classes, classifier=context.classifier)
+
+
+def run_checks(filepath, source, classifier=None, checks=None):
+    """Ejecuta las comprobaciones sobre un archivo con un único análisis.
+
+    Args:
+        filepath (str): Ruta del archivo.
+        source (bytes): Contenido del archivo.
+        classifier (Classifier): Reglas de clasificación y orden esperado.
+        checks (list): Comprobaciones (``Check``) a ejecutar; por defecto
+            todas las registradas.
+
+    Returns:
+        list: Lista de ``Violation`` de todas las comprobaciones, en el orden
+            en que se registraron.
+
+    Raises:
+        SyntaxError: Si el archivo no es Python válido.
+    """
+
+    context = FileContext(filepath, source, classifier)
+    violations = []
+    for check in CHECKS.values() if checks is None else checks:
+        if check.prefilter and not check.prefilter(source, context.classifier):
+            continue
+        violations.extend(check.function(context))
+    return violations
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description="Run every registered Odoo check, parsing each file once."
+    )
+    parser.add_argument(
+        "--exit-zero",
+        action="store_true",
+        help="Always return exit code 0 (even if errors are found).",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("text", "json", "sarif"),
+        default="text",
+        help="Output format (default: text).",
+    )
+    parser.add_argument(
+        "--select",
+        action="append",
+        default=[],
+        metavar="CHECK[,CHECK...]",
+        help="Only run these checks (default: all; see --list-checks).",
+    )
+    parser.add_argument(
+        "--list-checks",
+        action="store_true",
+        help="List the registered checks and exit.",
+    )
+    parser.add_argument(
+        "--no-config",
+        action="store_true",
+        help="Ignore the [tool.hg-odoo-pre-commit-hooks] sections of the "
+        "pyproject.toml files and use the built-in settings.",
+    )
+    parser.add_argument(
+        "--addons-path",
+        action="append",
+        default=[],
+        metavar="DIR[,DIR...]",
+        help="Check every Python file of the Odoo addons found under these "
+        "directories.",
+    )
+    parser.add_argument("files", nargs="*", help="Python files to check.")
+    return parser, parser.parse_args(argv)
+
+
+def _selected_checks(parser, values):
+    names = [name for value in values for name in value.split(",") if name]
+    unknown = [name for name in names if name not in CHECKS]
+    if unknown:
+        parser.error(f"unknown check: {', '.join(unknown)}")
+    return [CHECKS[name] for name in dict.fromkeys(names)] or None
+
+
+def main(argv=None):
+    parser, args = _parse_args(argv)
+    if args.list_checks:
+        for check in CHECKS.values():
+            print(check.name)
+        return
+    checks = _selected_checks(parser, args.select)
+
+    files = args.files
+    if args.addons_path:
+        from hg_odoo_pre_commit_hooks import discovery
+
+        roots = discovery.split_addons_paths(args.addons_path)
+        files = [*files, *discovery.iter_addon_files(roots)]
+    elif not files:
+        parser.error("no files to check: pass files or --addons-path")
+
+    from hg_odoo_pre_commit_hooks.config import ConfigError, ConfigResolver
+    from hg_odoo_pre_commit_hooks.reporters import REPORTERS
+
+    resolver = None if args.no_config else ConfigResolver()
+    reporter = REPORTERS[args.format](sys.stdout)
+    success = True
+    try:
+        for filepath in files:
+            classifier = resolver and resolver.for_file(filepath).classifier
+            with open(filepath, "rb") as f:
+                source = f.read()
+            violations = run_checks(filepath, source, classifier, checks)
+            reporter.add(filepath, violations)
+            success = success and not violations
+    except ConfigError as e:
+        parser.error(f"invalid configuration: {e}")
+    reporter.finish()
+    if not success and not args.exit_zero:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""client.py
+
+Cliente ligero de ``odoo-method-order --daemon``.
+
+Solo importa unos pocos módulos de la biblioteca estándar (no el analizador),
+calcula el hash de cada archivo y pide el resultado al servidor a través de su
+socket Unix. Si no hay ningún servidor escuchando, o se usan opciones que el
+cliente no conoce, ejecuta el análisis en el propio proceso con
+``check_method_order.main``.
+
+Uso:
+    odoo-method-order-client [--exit-zero] [--socket PATH] archivo1.py ...
+    odoo-method-order-client @lista.txt
+"""
+
+import hashlib
+import json
+import os
+import socket
+import sys
+
+PROTOCOL_VERSION = 1
+SOCKET_ENV = "HG_ODOO_PRE_COMMIT_HOOKS_SOCKET"
+
+
+def default_socket_path():
+    """Devuelve la ruta del socket del servidor por defecto."""
+    if os.environ.get(SOCKET_ENV):
+        return os.environ[SOCKET_ENV]
+    if os.environ.get("XDG_RUNTIME_DIR"):
+        return os.path.join(
+            os.environ["XDG_RUNTIME_DIR"], "hg-odoo-pre-commit-hooks.sock"
+        )
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "hg-odoo-pre-commit-hooks", "daemon.sock")
+
+
+def request(socket_path, payload):
+    """Envía una petición al servidor y devuelve su respuesta.
+
+    Returns:
+        dict: Respuesta del servidor, o None si no hay servidor disponible.
+    """
+
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
+            sock.sendall(json.dumps(payload).encode() + b"\n")
+            with sock.makefile("rb") as f:
+                line = f.readline()
+    except OSError:
+        return None
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+
+def _file_digest(filepath):
+    with open(filepath, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _expand_argfiles(argv):
+    """Sustituye los argumentos ``@archivo`` por las líneas del archivo, como
+    ``argparse`` con ``fromfile_prefix_chars="@"``.
+
+    Returns:
+        list: Argumentos, o None si no se puede leer algún archivo.
+    """
+
+    args = []
+    for arg in argv:
+        if not arg.startswith("@"):
+            args.append(arg)
+            continue
+        try:
+            with open(arg[1:], encoding="utf-8") as f:
+                expanded = _expand_argfiles(f.read().splitlines())
+        except (OSError, UnicodeDecodeError):
+            return None
+        if expanded is None:
+            return None
+        args.extend(expanded)
+    return args
+
+
+def _parse_args(argv):
+    """Interpreta las opciones que entiende el cliente.
+
+    Returns:
+        tuple: (archivos, exit_zero, socket), o None si hay otras opciones.
+    """
+
+    argv = _expand_argfiles(argv)
+    if argv is None:
+        return None
+    files = []
+    exit_zero = False
+    socket_path = default_socket_path()
+    args = iter(argv)
+    for arg in args:
+        if arg == "--":
+            files.extend(args)
+        elif arg == "--exit-zero":
+            exit_zero = True
+        elif arg == "--socket":
+            socket_path = next(args, None)
+            if socket_path is None:
+                return None
+        elif arg.startswith("--socket="):
+            socket_path = arg.split("=", 1)[1]
+        elif arg.startswith("-"):
+            return None
+        else:
+            files.append(arg)
+    if not files:
+        return None
+    return files, exit_zero, socket_path
+
+
+def _query(files, socket_path):
+    """Pide al servidor los errores de cada archivo.
+
+    Returns:
+        list: Listas de errores (línea, mensaje) por archivo, o None si el
+            servidor no está disponible o no pudo analizar algún archivo.
+    """
+
+    try:
+        payload = [[os.path.abspath(f), _file_digest(f)] for f in files]
+    except OSError:
+        return None
+    response = request(socket_path, {"version": PROTOCOL_VERSION, "files": payload})
+    if not response or "results" not in response:
+        return None
+    results = response["results"]
+    if len(results) != len(files) or any(isinstance(r, dict) for r in results):
+        return None
+    return results
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    parsed = _parse_args(argv)
+    results = parsed and _query(parsed[0], parsed[2])
+    if results is None:
+        from hg_odoo_pre_commit_hooks.check_method_order import main as local_main
+
+        return local_main(argv)
+
+    files, exit_zero, _socket_path = parsed
+    output = []
+    for filepath, violations in zip(files, results, strict=True):
+        for line, message in violations:
+            if line is None:
+                output.append(f"{filepath}: {message}\n")
+            else:
+                output.append(f"{filepath}:{line}: {message}\n")
+    sys.stdout.write("".join(output))
+    if output and not exit_zero:
+        sys.exit(1)
+    return None
+
+
+if __name__ == "__main__":
+    main()
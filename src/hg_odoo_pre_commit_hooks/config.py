@@ -0,0 +1,281 @@
+"""config.py
+
+Configuración jerárquica por directorio.
+
+La configuración se lee de la sección ``[tool.hg-odoo-pre-commit-hooks]`` de
+los ``pyproject.toml`` que se encuentran subiendo desde el directorio de cada
+archivo. Las claves de un directorio más cercano sustituyen a las de sus
+directorios padre, de modo que un addon puede tener su propio
+``pyproject.toml`` con otros valores que los del repositorio. Un directorio
+con ``root = true`` no hereda la configuración de sus padres.
+
+Ejemplo::
+
+    [tool.hg-odoo-pre-commit-hooks]
+    crud-methods = ["create", "write", "unlink", "copy"]
+    models-bases = ["Model", "AbstractModel", "TransientModel", "CustomModel"]
+    report = "minimal"
+
+``ConfigResolver`` memoriza la configuración de cada directorio, así que cada
+``pyproject.toml`` se lee una sola vez por ejecución (y por proceso con
+``--jobs``), no una vez por archivo analizado.
+"""
+
+import os
+
+from hg_odoo_pre_commit_hooks.check_method_order import (
+    CRUD_METHODS,
+    EXPECTED_ORDER,
+    METHOD_RULES,
+    MODELS_BASES,
+    Classifier,
+    file_violations,
+)
+
+CONFIG_FILE = "pyproject.toml"
+SECTION = "hg-odoo-pre-commit-hooks"
+# Directorios cuya configuración se memoriza como máximo; al superarlo se
+# vacía la memoria, para que analizar millones de archivos no la haga crecer
+# sin límite.
+MAX_CACHED_DIRECTORIES = 10_000
+
+DEFAULT_SETTINGS = {
+    "expected-order": tuple(EXPECTED_ORDER),
+    "crud-methods": tuple(CRUD_METHODS),
+    "models-bases": MODELS_BASES,
+    "report": "all",
+}
+# Valores de ``report``: todos los miembros fuera de orden o solo el mínimo
+# que hay que mover.
+REPORT_MODES = ("all", "minimal")
+
+
+class ConfigError(Exception):
+    """Error en un archivo de configuración."""
+
+
+class Config:
+    """Configuración efectiva de un directorio: ``classifier``
+    (``Classifier``), ``digest`` (str) y ``settings`` (dict).
+
+    ``digest`` es un hash de los valores efectivos (``settings``); las cachés
+    de resultados lo incluyen en su clave para no reutilizar resultados de
+    otra configuración. Se calcula la primera vez que se usa: sin caché no
+    hace falta, y ``hashlib`` y ``json`` retrasan el arranque.
+    """
+
+    __slots__ = ("_digest", "classifier", "settings")
+
+    def __init__(self, classifier, settings):
+        self.classifier = classifier
+        self.settings = settings
+        self._digest = None
+
+    @property
+    def digest(self):
+        if self._digest is None:
+            self._digest = settings_digest(self.settings)
+        return self._digest
+
+
+def _load_toml(data, path):
+    try:
+        import tomllib
+    except ImportError:  # Python < 3.11
+        try:
+            import tomli as tomllib
+        except ImportError as e:
+            raise ConfigError(f"{path}: reading it needs tomli on Python < 3.11") from e
+    try:
+        return tomllib.loads(data.decode("utf-8"))
+    except (UnicodeDecodeError, tomllib.TOMLDecodeError) as e:
+        raise ConfigError(f"{path}: {e}") from e
+
+
+def _string_list(path, key, value, allowed=None):
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise ConfigError(f"{path}: '{key}' must be a list of strings")
+    unknown = [v for v in value if allowed is not None and v not in allowed]
+    if unknown:
+        raise ConfigError(
+            f"{path}: unknown categories in '{key}': {', '.join(unknown)}"
+        )
+    return tuple(value)
+
+
+def _mentions_section(data):
+    """Indica si ``data`` puede contener la sección ``tool.<SECTION>``: el
+    nombre precedido de ``tool.`` (con espacios o comillas opcionales), y no
+    solo como nombre del proyecto."""
+    name = SECTION.encode()
+    start = data.find(name)
+    while start >= 0:
+        before = data[max(start - 32, 0) : start].rstrip(b" \t\"'")
+        if before.endswith(b".") and before[:-1].rstrip(b" \t").endswith(b"tool"):
+            return True
+        start = data.find(name, start + 1)
+    return False
+
+
+def read_settings(path):
+    """Lee la sección de configuración de un ``pyproject.toml``.
+
+    Args:
+        path (str): Ruta del archivo.
+
+    Returns:
+        dict: Claves definidas en la sección (incluida ``root``), o None si
+            el archivo no existe o no tiene la sección.
+
+    Raises:
+        ConfigError: Si el archivo no es válido.
+    """
+
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    # La mayoría de pyproject.toml no tienen la sección: evita interpretarlos
+    # (e importar ``tomllib``).
+    if not _mentions_section(data):
+        return None
+    section = _load_toml(data, path).get("tool", {}).get(SECTION)
+    if section is None:
+        return None
+    if not isinstance(section, dict):
+        raise ConfigError(f"{path}: [tool.{SECTION}] must be a table")
+
+    settings = {}
+    for key, value in section.items():
+        if key == "root":
+            if not isinstance(value, bool):
+                raise ConfigError(f"{path}: 'root' must be true or false")
+            settings[key] = value
+        elif key == "report":
+            if value not in REPORT_MODES:
+                raise ConfigError(
+                    f"{path}: 'report' must be one of: {', '.join(REPORT_MODES)}"
+                )
+            settings[key] = value
+        elif key == "expected-order":
+            settings[key] = _string_list(path, key, value, set(EXPECTED_ORDER))
+        elif key in DEFAULT_SETTINGS:
+            settings[key] = _string_list(path, key, value)
+        else:
+            raise ConfigError(f"{path}: unknown option '{key}'")
+    return settings
+
+
+def settings_digest(settings):
+    """Devuelve el hash de unos valores de configuración."""
+    import hashlib
+    import json
+
+    payload = json.dumps(sorted(settings.items()))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def build_classifier(settings):
+    """Crea el ``Classifier`` de unos valores de configuración."""
+    crud_methods = tuple(settings["crud-methods"])
+    method_rules = tuple(
+        rule._replace(values=crud_methods)
+        if rule.category == "crud_methods" and rule.kind == "name"
+        else rule
+        for rule in METHOD_RULES
+    )
+    return Classifier(
+        method_rules,
+        expected_order=settings["expected-order"],
+        models_bases=settings["models-bases"],
+        minimal=settings["report"] == "minimal",
+    )
+
+
+class ConfigResolver:
+    """Resuelve y memoriza la configuración de cada directorio.
+
+    Las instancias se pueden enviar a los procesos de ``parallel``; cada
+    proceso construye su propia memoria.
+    """
+
+    def __init__(self):
+        self._directories = {}
+        self._configs = {}
+
+    def __getstate__(self):
+        return {}
+
+    def __setstate__(self, state):
+        self.__init__()
+
+    def clear(self):
+        """Olvida la configuración memorizada, p. ej. tras editar algún
+        ``pyproject.toml``."""
+        self._directories.clear()
+        self._configs.clear()
+
+    def for_file(self, filepath):
+        """Devuelve la ``Config`` que se aplica a un archivo."""
+        return self.for_directory(os.path.dirname(os.path.abspath(filepath)))
+
+    def for_directory(self, directory):
+        """Devuelve la ``Config`` de un directorio (ruta absoluta)."""
+        config = self._directories.get(directory)
+        if config is not None:
+            return config
+        if len(self._directories) >= MAX_CACHED_DIRECTORIES:
+            self._directories.clear()
+
+        # Sube hasta un directorio ya resuelto, la raíz del sistema de
+        # archivos o un directorio con ``root = true``.
+        chain = []
+        inherited = None
+        current = directory
+        while True:
+            settings = read_settings(os.path.join(current, CONFIG_FILE))
+            chain.append((current, settings))
+            if settings and settings.get("root"):
+                break
+            parent = os.path.dirname(current)
+            if parent == current:
+                break
+            inherited = self._directories.get(parent)
+            if inherited is not None:
+                break
+            current = parent
+
+        effective = dict(inherited.settings if inherited else DEFAULT_SETTINGS)
+        config = inherited
+        for path, settings in reversed(chain):
+            if settings:
+                if settings.get("root"):
+                    effective = dict(DEFAULT_SETTINGS)
+                effective.update(
+                    (key, value) for key, value in settings.items() if key != "root"
+                )
+                config = None
+            if config is None:
+                config = self._config(effective)
+            self._directories[path] = config
+        return config
+
+    def _config(self, settings):
+        key = tuple(sorted(settings.items()))
+        config = self._configs.get(key)
+        if config is None:
+            config = self._configs[key] = Config(
+                build_classifier(settings), dict(settings)
+            )
+        return config
+
+    def violations(self, filepath, stats=None, timer=None, source=None):
+        """Como ``file_violations``, con la configuración del archivo."""
+        return file_violations(
+            filepath,
+            stats=stats,
+            timer=timer,
+            classifier=self.for_file(filepath).classifier,
+            source=source,
+        )
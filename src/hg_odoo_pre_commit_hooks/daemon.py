@@ -0,0 +1,157 @@
+"""daemon.py
+
+Servidor de larga duración para ``odoo-method-order --daemon``.
+
+Mantiene un intérprete con los módulos ya importados y una caché en memoria
+de resultados indexada por el hash del contenido de cada archivo y el de la
+configuración de su directorio (que se vuelve a resolver en cada petición). Escucha en
+un socket Unix las peticiones de ``client.py``: una línea JSON con las rutas y
+los hashes de los archivos, a la que responde con una línea JSON con los
+errores de cada archivo en el mismo orden.
+"""
+
+import hashlib
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+from collections import OrderedDict
+
+from hg_odoo_pre_commit_hooks.check_method_order import source_violations
+from hg_odoo_pre_commit_hooks.client import PROTOCOL_VERSION, request
+from hg_odoo_pre_commit_hooks.config import ConfigResolver
+
+DEFAULT_MAX_ENTRIES = 50_000
+
+
+def _request_error(payload):
+    """Comprueba una petición del cliente.
+
+    Returns:
+        str: Motivo por el que la petición no es válida, o None si lo es.
+    """
+
+    if not isinstance(payload, dict):
+        return "the request must be a JSON object"
+    if payload.get("version") != PROTOCOL_VERSION:
+        return f"unsupported protocol version (expected {PROTOCOL_VERSION})"
+    files = payload.get("files", [])
+    if not isinstance(files, list) or not all(
+        isinstance(item, list)
+        and len(item) == 2
+        and all(isinstance(value, str) for value in item)
+        for item in files
+    ):
+        return "files must be a list of [path, digest] pairs"
+    return None
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            payload = json.loads(self.rfile.readline())
+        except ValueError:
+            error = "invalid JSON request"
+        else:
+            error = _request_error(payload)
+        if error:
+            response = {"error": error}
+        else:
+            resolver = ConfigResolver()
+            response = {
+                "results": [
+                    self.server.violations(filepath, digest, resolver)
+                    for filepath, digest in payload.get("files", [])
+                ]
+            }
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+if hasattr(socketserver, "UnixStreamServer"):
+
+    class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        """Servidor con una caché en memoria limitada a ``max_entries``
+        resultados, de los que se eliminan los menos usados recientemente."""
+
+        daemon_threads = True
+
+        def __init__(self, socket_path, max_entries=DEFAULT_MAX_ENTRIES):
+            super().__init__(socket_path, _Handler)
+            self.max_entries = max_entries
+            self.results = OrderedDict()
+            self.lock = threading.Lock()
+
+        def violations(self, filepath, digest, resolver):
+            """Devuelve los errores de un archivo como una lista JSON.
+
+            Si el archivo no se puede analizar devuelve ``{"error": ...}`` y
+            el cliente repite el análisis en su propio proceso.
+            """
+
+            try:
+                config = resolver.for_file(filepath)
+                with self.lock:
+                    if (digest, config.digest) in self.results:
+                        self.results.move_to_end((digest, config.digest))
+                        return self.results[digest, config.digest]
+                with open(filepath, "rb") as f:
+                    source = f.read()
+                violations = [
+                    list(violation)
+                    for violation in source_violations(
+                        source, filepath, classifier=config.classifier
+                    )
+                ]
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                return {"error": f"{type(e).__name__}: {e}"}
+            key = (hashlib.sha256(source).hexdigest(), config.digest)
+            with self.lock:
+                self.results[key] = violations
+                while len(self.results) > self.max_entries:
+                    self.results.popitem(last=False)
+            return violations
+
+
+def _remove_stale_socket(socket_path):
+    """Elimina el socket de un servidor que ya no está en ejecución.
+
+    Raises:
+        RuntimeError: Si ya hay un servidor escuchando en ``socket_path``.
+    """
+
+    if not os.path.exists(socket_path):
+        return
+    if request(socket_path, {"version": PROTOCOL_VERSION, "files": []}) is not None:
+        raise RuntimeError(f"a daemon is already listening on {socket_path}")
+    os.unlink(socket_path)
+
+
+def serve(socket_path):
+    """Ejecuta el servidor hasta recibir SIGINT o SIGTERM.
+
+    Args:
+        socket_path (str): Ruta del socket Unix en el que escuchar.
+    """
+
+    if not hasattr(socket, "AF_UNIX"):
+        raise RuntimeError("--daemon needs Unix domain sockets")
+    os.makedirs(os.path.dirname(os.path.abspath(socket_path)), exist_ok=True)
+    _remove_stale_socket(socket_path)
+    old_umask = os.umask(0o077)
+    try:
+        server = DaemonServer(socket_path)
+    finally:
+        os.umask(old_umask)
+    signal.signal(signal.SIGTERM, lambda *args: sys.exit(0))
+    print(f"odoo-method-order daemon listening on {socket_path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
@@ -0,0 +1,184 @@
+"""diff.py
+
+Limita el análisis a las clases modificadas según ``git diff``.
+
+Se obtienen los rangos de líneas cambiados de cada archivo (``git diff
+--unified=0``) y se guardan en un ``LineIndex``, que permite saber en tiempo
+logarítmico si el rango de líneas de una clase (``lineno``/``end_lineno``)
+contiene algún cambio. Solo se analizan y reportan los modelos que lo
+contienen, de modo que los errores antiguos de un módulo no se vuelven a
+reportar al modificar una sola línea.
+"""
+
+import os
+import re
+import subprocess
+from bisect import bisect_right
+
+from hg_odoo_pre_commit_hooks.check_method_order import file_violations
+
+HUNK_RE = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+
+class GitError(Exception):
+    """Error al ejecutar git."""
+
+
+class LineIndex:
+    """Conjunto de rangos de líneas cambiadas de un archivo.
+
+    Los rangos se fusionan y ordenan al crear el índice, de modo que cada
+    consulta es una búsqueda binaria.
+    """
+
+    __slots__ = ("ends", "starts")
+
+    def __init__(self, ranges):
+        self.starts = []
+        self.ends = []
+        for start, end in sorted(ranges):
+            if self.ends and start <= self.ends[-1] + 1:
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    def __bool__(self):
+        return bool(self.starts)
+
+    def intersects(self, start, end):
+        """Indica si alguna línea entre ``start`` y ``end`` (incluidas) cambió."""
+        i = bisect_right(self.starts, end) - 1
+        return i >= 0 and self.ends[i] >= start
+
+
+def _unquote(path):
+    """Decodifica una ruta entrecomillada por git (``core.quotePath``)."""
+    if not path.startswith('"'):
+        return path
+    raw = path[1:-1].encode("latin-1").decode("unicode_escape")
+    return raw.encode("latin-1").decode("utf-8")
+
+
+def parse_diff(output, root):
+    """Obtiene los rangos de líneas añadidas o modificadas de un diff.
+
+    Args:
+        output (str): Salida de ``git diff --unified=0`` con el prefijo
+            ``b/`` en las rutas nuevas.
+        root (str): Directorio raíz del repositorio.
+
+    Returns:
+        dict: Ruta absoluta normalizada de cada archivo -> ``LineIndex``.
+    """
+
+    ranges = {}
+    current = None
+    for line in output.splitlines():
+        if line.startswith("+++ "):
+            name = line[4:].rstrip("\t")
+            if name == "/dev/null":
+                current = None
+                continue
+            name = _unquote(name)
+            name = name.removeprefix("b/")
+            current = ranges.setdefault(path_key(os.path.join(root, name)), [])
+            continue
+        match = HUNK_RE.match(line)
+        if match and current is not None:
+            start = int(match.group(1))
+            count = 1 if match.group(2) is None else int(match.group(2))
+            if count:
+                current.append((start, start + count - 1))
+            else:
+                # Solo se borraron líneas: marca las líneas que las rodean.
+                current.append((max(start, 1), start + 1))
+    return {path: LineIndex(file_ranges) for path, file_ranges in ranges.items()}
+
+
+def path_key(filepath):
+    """Normaliza una ruta para compararla con las rutas del diff."""
+    return os.path.normcase(os.path.realpath(filepath))
+
+
+def _git(*args):
+    try:
+        result = subprocess.run(
+            ["git", *args],
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            check=False,
+        )
+    except OSError as e:
+        raise GitError(str(e)) from e
+    if result.returncode:
+        raise GitError(result.stderr.strip() or f"git {args[0]} failed")
+    return result.stdout
+
+
+def changed_lines(ref=None, staged=False):
+    """Obtiene las líneas cambiadas del repositorio git actual.
+
+    Args:
+        ref (str): Referencia con la que comparar el árbol de trabajo.
+        staged (bool): Si es True, compara el índice con ``HEAD`` (cambios
+            preparados para el commit).
+
+    Returns:
+        dict: Ruta absoluta normalizada de cada archivo -> ``LineIndex``.
+
+    Raises:
+        GitError: Si git no está disponible o el comando falla.
+    """
+
+    root = _git("rev-parse", "--show-toplevel").strip()
+    # Prefijos explícitos y rutas desde la raíz: ``diff.noprefix``,
+    # ``diff.mnemonicPrefix`` o ``diff.relative`` en la configuración del
+    # usuario cambiarían las rutas que lee ``parse_diff``.
+    args = [
+        "diff",
+        "--no-color",
+        "--no-ext-diff",
+        "--no-relative",
+        "--unified=0",
+        "--src-prefix=a/",
+        "--dst-prefix=b/",
+    ]
+    if staged:
+        args.append("--cached")
+    if ref:
+        args.append(ref)
+    return parse_diff(_git(*args, "--"), root)
+
+
+class DiffFilter:
+    """Analiza solo los modelos que contienen cambios.
+
+    Las instancias se pueden enviar a los procesos de ``parallel``. Si se
+    indica ``resolver`` (``config.ConfigResolver``), cada archivo se analiza
+    con la configuración de su directorio.
+    """
+
+    def __init__(self, changes, resolver=None):
+        self.changes = changes
+        self.resolver = resolver
+
+    def has_changes(self, filepath):
+        return bool(self.changes.get(path_key(filepath)))
+
+    def violations(self, filepath, stats=None, timer=None, source=None):
+        """Como ``file_violations``, limitado a las clases modificadas."""
+        changed = self.changes.get(path_key(filepath))
+        if not changed:
+            return []
+        classifier = self.resolver and self.resolver.for_file(filepath).classifier
+        return file_violations(
+            filepath,
+            stats=stats,
+            changed=changed,
+            timer=timer,
+            classifier=classifier,
+            source=source,
+        )
@@ -0,0 +1,140 @@
+"""discovery.py
+
+Busca los archivos Python de los módulos Odoo dentro de uno o varios
+directorios de addons, y lee listas de archivos (``--files-from``).
+
+Un módulo es cualquier directorio que contenga un ``__manifest__.py``. Los
+archivos se generan a medida que se recorre el árbol, de modo que el análisis
+puede empezar antes de terminar de recorrerlo. No se entra en repositorios
+``.git``, entornos virtuales ni ``node_modules``, y los archivos o directorios
+alcanzados dos veces (enlaces simbólicos, rutas de addons repetidas) solo se
+generan una vez.
+"""
+
+import os
+
+MANIFEST = "__manifest__.py"
+SKIP_DIRS = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        ".tox",
+        ".nox",
+        ".venv",
+        "venv",
+        "node_modules",
+        "__pycache__",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".ruff_cache",
+    }
+)
+
+
+def split_addons_paths(values):
+    """Convierte los valores de ``--addons-path`` en una lista de directorios.
+
+    Args:
+        values (list): Valores de la opción, cada uno con uno o varios
+            directorios separados por comas.
+
+    Returns:
+        list: Directorios en el orden indicado.
+    """
+
+    return [path for value in values for path in value.split(",") if path]
+
+
+def _skip_dir(entry):
+    return entry.name in SKIP_DIRS or os.path.exists(
+        os.path.join(entry.path, "pyvenv.cfg")
+    )
+
+
+def _scan(directory, in_addon, seen):
+    try:
+        with os.scandir(directory) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+    except OSError:
+        return
+    if not in_addon:
+        in_addon = any(entry.name == MANIFEST for entry in entries)
+    for entry in entries:
+        try:
+            if entry.is_dir():
+                if _skip_dir(entry):
+                    continue
+                key = _key(entry)
+                if key in seen:
+                    continue
+                seen.add(key)
+                yield from _scan(entry.path, in_addon, seen)
+            elif in_addon and entry.name.endswith(".py") and entry.is_file():
+                key = _key(entry)
+                if key in seen:
+                    continue
+                seen.add(key)
+                yield entry.path
+        except OSError:
+            continue
+
+
+def _key(entry):
+    st = entry.stat()
+    return st.st_dev, st.st_ino
+
+
+def iter_addon_files(addons_paths):
+    """Genera los archivos Python de los módulos Odoo encontrados.
+
+    Args:
+        addons_paths (list): Directorios en los que buscar módulos. Pueden ser
+            directorios de addons, módulos o cualquier directorio que los
+            contenga a cualquier profundidad.
+
+    Yields:
+        str: Ruta de cada archivo Python, una sola vez por archivo.
+    """
+
+    seen = set()
+    for path in addons_paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        if (st.st_dev, st.st_ino) in seen:
+            continue
+        seen.add((st.st_dev, st.st_ino))
+        yield from _scan(path, False, seen)
+
+
+def iter_file_list(stream, separator=b"\n", chunk_size=64 * 1024):
+    """Genera las rutas de una lista de archivos a medida que se lee.
+
+    Args:
+        stream: Archivo binario con las rutas (p. ej. ``sys.stdin.buffer``).
+        separator (bytes): Separador de las rutas: ``b"\\n"`` (también se
+            admiten finales ``\\r\\n``) o ``b"\\0"`` (``git ls-files -z``).
+        chunk_size (int): Bytes que se leen cada vez.
+
+    Yields:
+        str: Cada ruta no vacía, sin el separador.
+    """
+
+    pending = b""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        items = (pending + chunk).split(separator)
+        pending = items.pop()
+        for item in items:
+            if separator == b"\n":
+                item = item.removesuffix(b"\r")
+            if item:
+                yield os.fsdecode(item)
+    if separator == b"\n":
+        pending = pending.removesuffix(b"\r")
+    if pending:
+        yield os.fsdecode(pending)
@@ -0,0 +1,253 @@
+"""fixer.py
+
+Corrección automática del orden de los miembros de los modelos (``--fix``).
+
+Cada miembro de la clase ocupa las líneas de sus decoradores, su definición
+(``lineno``/``end_lineno``), los comentarios con su misma sangría situados
+justo encima y los comentarios con más sangría que lo siguen. Los miembros
+se reordenan con una ordenación estable según la posición de su categoría en
+el orden esperado, de modo que los miembros de una misma categoría mantienen
+su orden relativo. Las líneas entre miembros (líneas en blanco, docstrings
+sueltos) se quedan en su sitio.
+
+Solo se reescribe el cuerpo de las clases con errores de orden; el resto del
+archivo no cambia y los archivos sin errores no se escriben. El resultado no
+tiene errores de orden, así que basta con una pasada.
+
+No se modifican las clases con miembros de categoría desconocida ni las que
+tienen varios miembros en la misma línea.
+"""
+
+import ast
+import io
+import os
+from collections import namedtuple
+
+from hg_odoo_pre_commit_hooks.check_method_order import (
+    DEFAULT_CLASSIFIER,
+    NO_TIMER,
+    class_members,
+    class_method_order,
+    find_model_classes,
+    order_violations,
+    source_violations,
+)
+
+
+def _comment_indent(line):
+    """Devuelve la sangría de una línea de comentario, o None si la línea no
+    es un comentario."""
+    stripped = line.lstrip()
+    if not stripped.startswith("#"):
+        return None
+    return len(line) - len(stripped)
+
+
+def member_spans(node, lines):
+    """Calcula las líneas (inicio, fin) de cada miembro de una clase.
+
+    El inicio incluye los decoradores y las líneas de comentario que hay
+    justo encima del miembro con su misma sangría. El fin incluye los
+    comentarios con más sangría que siguen al miembro, que forman parte de
+    su cuerpo.
+
+    Args:
+        node (ast.ClassDef): Clase.
+        lines (list): Líneas del archivo.
+
+    Returns:
+        list: Tuplas (inicio, fin) con números de línea desde 1, o None si
+            dos miembros comparten alguna línea.
+    """
+
+    spans = []
+    previous_end = node.lineno
+    for member in class_members(node):
+        decorators = getattr(member, "decorator_list", ())
+        start = min([member.lineno] + [d.lineno for d in decorators])
+        if start <= previous_end:
+            return None
+        while (
+            start - 1 > previous_end
+            and _comment_indent(lines[start - 2]) == member.col_offset
+        ):
+            start -= 1
+        end = line = member.end_lineno
+        while line < len(lines) and (
+            not lines[line].strip()
+            or (_comment_indent(lines[line]) or 0) > member.col_offset
+        ):
+            line += 1
+            if lines[line - 1].strip():
+                end = line
+        spans.append((start, end))
+        previous_end = end
+    return spans
+
+
+class Move(namedtuple("Move", ("target", "line", "first", "start", "end"))):
+    """Movimiento de un miembro fuera de orden (números de línea desde 1):
+
+    - ``target``: posición en ``class_members`` del miembro delante del que
+      se mueve.
+    - ``line``: primera línea de ese miembro (incluidos decoradores y
+      comentarios).
+    - ``first``: primera línea tras el miembro anterior al que se mueve.
+    - ``start`` y ``end``: líneas del miembro que se mueve.
+    """
+
+    __slots__ = ()
+
+
+def member_move(node, lines, index, classifier=None):
+    """Calcula cómo mover un miembro fuera de orden a su sitio: delante del
+    primer miembro anterior de una categoría que va después de la suya.
+
+    Args:
+        node (ast.ClassDef): Clase.
+        lines (list): Líneas del archivo.
+        index (int): Posición del miembro en ``class_members(node)``.
+        classifier (Classifier): Reglas de clasificación y orden esperado.
+
+    Returns:
+        Move: Movimiento, o None si el miembro no se puede mover.
+    """
+
+    classifier = classifier or DEFAULT_CLASSIFIER
+    ranks = classifier.ranks
+    method_order = class_method_order(node, classifier)
+    rank = ranks.get(method_order[index][0])
+    if rank is None:
+        return None
+    target = next(
+        (j for j in range(index) if ranks.get(method_order[j][0], -1) > rank), None
+    )
+    spans = target is not None and member_spans(node, lines)
+    if not spans:
+        return None
+    start, end = spans[index]
+    return Move(target, spans[target][0], spans[index - 1][1] + 1, start, end)
+
+
+def fix_class(node, lines, classifier=None):
+    """Reordena en ``lines`` los miembros de una clase con errores de orden.
+
+    Args:
+        node (ast.ClassDef): Clase.
+        lines (list): Líneas del archivo, con sus saltos de línea; se
+            modifican en el sitio.
+        classifier (Classifier): Reglas de clasificación y orden esperado.
+
+    Returns:
+        bool: True si se ha modificado alguna línea.
+    """
+
+    classifier = classifier or DEFAULT_CLASSIFIER
+    method_order = class_method_order(node, classifier)
+    if not order_violations(method_order, classifier):
+        return False
+    ranks = classifier.ranks
+    if any(cat not in ranks for cat, _lineno, _name in method_order):
+        return False
+    spans = member_spans(node, lines)
+    if not spans:
+        return False
+
+    first, last = spans[0][0], spans[-1][1]
+    newline = "\r\n" if lines[first - 1].endswith("\r\n") else "\n"
+    missing_newline = not lines[last - 1].endswith(("\n", "\r"))
+    if missing_newline:
+        lines[last - 1] += newline
+
+    chunks = [lines[start - 1 : end] for start, end in spans]
+    gaps = [lines[spans[i][1] : spans[i + 1][0] - 1] for i in range(len(spans) - 1)]
+    order = sorted(range(len(chunks)), key=lambda i: ranks[method_order[i][0]])
+    body = []
+    for position, index in enumerate(order):
+        body.extend(chunks[index])
+        if position < len(gaps):
+            body.extend(gaps[position])
+    if missing_newline:
+        body[-1] = body[-1].removesuffix(newline)
+    lines[first - 1 : last] = body
+    return True
+
+
+def fix_source(source, classifier=None):
+    """Reordena los miembros de los modelos con errores de orden.
+
+    Args:
+        source (bytes): Contenido del archivo.
+        classifier (Classifier): Reglas de clasificación y orden esperado.
+
+    Returns:
+        bytes: Contenido corregido; el mismo objeto ``source`` si no hay
+            nada que corregir.
+    """
+
+    classifier = classifier or DEFAULT_CLASSIFIER
+    text = source.decode("utf-8")
+    tree = ast.parse(text)
+    # Mismos saltos de línea que cuenta ``ast`` (no ``str.splitlines``).
+    lines = io.StringIO(text, newline="").readlines()
+    changed = False
+    for node in find_model_classes(tree, classifier.models_bases):
+        changed = fix_class(node, lines, classifier) or changed
+    if not changed:
+        return source
+    return "".join(lines).encode("utf-8")
+
+
+def write_atomic(filepath, data):
+    """Escribe ``data`` en ``filepath`` sin dejar nunca el archivo a medias.
+
+    El contenido se escribe en un archivo temporal del mismo directorio, con
+    los permisos del original, que después lo sustituye con ``os.replace``.
+    Si ``filepath`` es un enlace simbólico se sustituye el archivo enlazado.
+    """
+
+    import tempfile
+
+    filepath = os.path.realpath(filepath)
+    directory, name = os.path.split(filepath)
+    fd, temp_path = tempfile.mkstemp(prefix=f".{name}.", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(temp_path, os.stat(filepath).st_mode & 0o7777)
+        os.replace(temp_path, filepath)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+class Fixer:
+    """Analiza los archivos y corrige los que tienen errores de orden.
+
+    Devuelve los errores que quedan después de corregir el archivo. Las
+    instancias se pueden enviar a los procesos de ``parallel``.
+    """
+
+    def __init__(self, resolver=None):
+        self.resolver = resolver
+
+    def violations(self, filepath, stats=None, timer=None):
+        """Como ``file_violations``; además corrige el archivo y cuenta los
+        archivos corregidos (``fixed``)."""
+        timer = timer or NO_TIMER
+        classifier = self.resolver and self.resolver.for_file(filepath).classifier
+        with timer("read"), open(filepath, "rb") as f:
+            source = f.read()
+        violations = source_violations(
+            source, filepath, stats=stats, timer=timer, classifier=classifier
+        )
+        if not violations:
+            return violations
+        with timer("fix"):
+            fixed = fix_source(source, classifier)
+            if fixed is source:
+                return violations
+            write_atomic(filepath, fixed)
+        if stats is not None:
+            stats["fixed"] += 1
+        return source_violations(fixed, filepath, classifier=classifier)
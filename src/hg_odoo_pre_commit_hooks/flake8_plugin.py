@@ -0,0 +1,76 @@
+"""flake8_plugin.py
+
+Extensión de flake8 que comprueba el orden de los miembros de los modelos
+Odoo con el árbol ``ast`` que flake8 ya ha construido, sin volver a leer ni a
+analizar el archivo.
+
+Se registra con el punto de entrada ``flake8.extension`` del paquete, así que
+basta con instalar el paquete en el mismo entorno que flake8 y seleccionar
+los códigos ``OMO``::
+
+    flake8 --extend-select OMO addons/
+
+Códigos:
+
+- ``OMO001``: miembro fuera de orden (``method-order``).
+- ``OMO002``: categoría desconocida (``unknown-category``).
+- ``OMO003``: varios modelos en el mismo archivo (``multiple-models``); se
+  reporta en la línea 1.
+
+La configuración de los ``pyproject.toml`` se aplica igual que en
+``odoo-method-order``.
+"""
+
+from hg_odoo_pre_commit_hooks.check_method_order import (
+    find_model_classes,
+    model_violations,
+)
+
+# Identificador de regla (``Violation.rule``) -> código de flake8.
+CODES = {
+    "method-order": "OMO001",
+    "unknown-category": "OMO002",
+    "multiple-models": "OMO003",
+}
+
+
+class MethodOrderChecker:
+    """Comprobación de flake8 (``tree``) del orden de los miembros.
+
+    Args:
+        tree (ast.Module): Árbol del archivo construido por flake8.
+        filename (str): Ruta del archivo, usada para buscar su
+            configuración.
+    """
+
+    name = "hg-odoo-method-order"
+
+    # Compartido por todos los archivos del proceso: cada pyproject.toml se
+    # lee una sola vez.
+    _resolver = None
+
+    def __init__(self, tree, filename="stdin"):
+        self.tree = tree
+        self.filename = filename
+
+    @classmethod
+    def resolver(cls):
+        if cls._resolver is None:
+            from hg_odoo_pre_commit_hooks.config import ConfigResolver
+
+            cls._resolver = ConfigResolver()
+        return cls._resolver
+
+    def run(self):
+        """Genera ``(línea, columna, mensaje, tipo)`` para cada error."""
+        classifier = self.resolver().for_file(self.filename).classifier
+        model_classes = find_model_classes(self.tree, classifier.models_bases)
+        if not model_classes:
+            return
+        for violation in model_violations(model_classes, classifier=classifier):
+            yield (
+                violation.line or 1,
+                0,
+                f"{CODES[violation.rule]} {violation.message}",
+                type(self),
+            )
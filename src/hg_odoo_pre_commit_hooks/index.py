@@ -0,0 +1,423 @@
+"""index.py
+
+Índice persistente (SQLite) de los modelos Odoo de todos los addons.
+
+Guarda, para cada clase modelo, su ``_name``, sus ``_inherit``, el archivo y
+las líneas que ocupa, y el nombre, la línea y la categoría de cada miembro.
+Al actualizarlo solo se vuelven a analizar los archivos cuya huella de
+``stat`` y contenido cambiaron (o cuya configuración cambió), y se eliminan
+los archivos que ya no existen. Las consultas, como "todas las
+sobrescrituras de ``sale.order.create``", se responden desde el índice sin
+volver a analizar el repositorio.
+
+Uso:
+    odoo-model-index update --addons-path DIR[,DIR...] [archivos...]
+    odoo-model-index overrides sale.order.create
+    odoo-model-index models sale.order
+"""
+
+import argparse
+import ast
+import hashlib
+import os
+import sqlite3
+import sys
+from collections import namedtuple
+
+from hg_odoo_pre_commit_hooks.check_method_order import (
+    DEFAULT_CLASSIFIER,
+    class_members,
+    class_span,
+    find_model_classes,
+    may_contain_models,
+)
+
+SCHEMA_VERSION = 1
+INDEX_FILE = "models.sqlite3"
+
+SCHEMA = (
+    (
+        "CREATE TABLE IF NOT EXISTS files ("
+        "path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, inode INTEGER, "
+        "digest TEXT, config TEXT)"
+    ),
+    (
+        "CREATE TABLE IF NOT EXISTS models ("
+        "id INTEGER PRIMARY KEY, path TEXT, class_name TEXT, name TEXT, "
+        "start_line INTEGER, end_line INTEGER)"
+    ),
+    "CREATE TABLE IF NOT EXISTS inherits (model_id INTEGER, name TEXT)",
+    (
+        "CREATE TABLE IF NOT EXISTS members ("
+        "model_id INTEGER, name TEXT, category TEXT, line INTEGER)"
+    ),
+    "CREATE INDEX IF NOT EXISTS models_path ON models (path)",
+    "CREATE INDEX IF NOT EXISTS models_name ON models (name)",
+    "CREATE INDEX IF NOT EXISTS inherits_name ON inherits (name)",
+    "CREATE INDEX IF NOT EXISTS inherits_model ON inherits (model_id)",
+    "CREATE INDEX IF NOT EXISTS members_model ON members (model_id)",
+    "CREATE INDEX IF NOT EXISTS members_name ON members (name)",
+)
+
+
+class ModelRecord(
+    namedtuple(
+        "ModelRecord",
+        ("path", "class_name", "name", "inherit", "start_line", "end_line"),
+    )
+):
+    """Clase modelo guardada en el índice: ``path`` y ``class_name`` (str),
+    ``name`` (str, o None si no se conoce), ``inherit`` (tupla de str) y
+    ``start_line`` y ``end_line`` (int)."""
+
+    __slots__ = ()
+
+
+class MemberRecord(
+    namedtuple(
+        "MemberRecord", ("path", "line", "class_name", "model", "name", "category")
+    )
+):
+    """Miembro de una clase modelo guardado en el índice: ``path`` (str),
+    ``line`` (int), ``class_name`` (str), ``model`` (str, o None si no se
+    conoce), ``name`` y ``category`` (str)."""
+
+    __slots__ = ()
+
+
+class UpdateStats(
+    namedtuple("UpdateStats", ("indexed", "unchanged", "removed", "errors"))
+):
+    """Resultado de ``ModelIndex.update``: número de archivos analizados, sin
+    cambios, eliminados y con errores."""
+
+    __slots__ = ()
+
+
+def _strings(node):
+    """Devuelve las cadenas de un literal ``"x"`` o ``["x", "y"]``."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return (node.value,)
+    if isinstance(node, ast.List | ast.Tuple):
+        return tuple(
+            elt.value
+            for elt in node.elts
+            if isinstance(elt, ast.Constant) and isinstance(elt.value, str)
+        )
+    return ()
+
+
+def model_attributes(node):
+    """Devuelve ``_name`` y ``_inherit`` de una clase modelo.
+
+    Si la clase no tiene ``_name`` y hereda de un único modelo, su nombre es
+    el del modelo heredado (extensión clásica de Odoo).
+
+    Returns:
+        tuple: (nombre o None, tupla de modelos heredados).
+    """
+
+    name = None
+    inherit = ()
+    for subnode in node.body:
+        if not isinstance(subnode, ast.Assign):
+            continue
+        for target in subnode.targets:
+            if isinstance(target, ast.Name) and target.id == "_name":
+                values = _strings(subnode.value)
+                name = values[0] if values else None
+            elif isinstance(target, ast.Name) and target.id == "_inherit":
+                inherit = _strings(subnode.value)
+    if name is None and len(inherit) == 1:
+        name = inherit[0]
+    return name, inherit
+
+
+def _member_name(member):
+    name = getattr(member, "name", None)
+    if name:
+        return name
+    for target in getattr(member, "targets", ()):
+        if isinstance(target, ast.Name):
+            return target.id
+    return "<unnamed>"
+
+
+def extract_models(source, filepath, classifier=None):
+    """Extrae los modelos de un archivo.
+
+    Returns:
+        list: Tuplas (nombre de la clase, ``_name``, ``_inherit``, inicio,
+            fin, lista de (nombre, categoría, línea) de cada miembro).
+    """
+
+    classifier = classifier or DEFAULT_CLASSIFIER
+    if not may_contain_models(source, classifier.models_bases):
+        return []
+    tree = ast.parse(source.decode("utf-8"), filename=filepath)
+    models = []
+    for node in find_model_classes(tree, classifier.models_bases):
+        name, inherit = model_attributes(node)
+        members = [
+            (_member_name(member), classifier.category(member), member.lineno)
+            for member in class_members(node)
+        ]
+        models.append((node.name, name, inherit, *class_span(node), members))
+    return models
+
+
+class ModelIndex:
+    """Índice de modelos guardado en SQLite.
+
+    Usar ``ModelIndex.open`` para obtener una instancia.
+    """
+
+    def __init__(self, connection, resolver=None):
+        self.connection = connection
+        self.resolver = resolver
+
+    @classmethod
+    def open(cls, directory=None, resolver=None):
+        """Abre (o crea) el índice de ``directory``.
+
+        Raises:
+            sqlite3.Error, OSError: Si no se puede abrir el índice.
+        """
+
+        if directory is None:
+            from hg_odoo_pre_commit_hooks.cache import default_cache_dir
+
+            directory = default_cache_dir()
+        os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(os.path.join(directory, INDEX_FILE), timeout=5)
+        (version,) = connection.execute("PRAGMA user_version").fetchone()
+        if version != SCHEMA_VERSION:
+            for table in ("files", "models", "inherits", "members"):
+                connection.execute(f"DROP TABLE IF EXISTS {table}")
+            connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        for statement in SCHEMA:
+            connection.execute(statement)
+        connection.commit()
+        return cls(connection, resolver)
+
+    def close(self):
+        self.connection.close()
+
+    def update(self, files, roots=()):
+        """Actualiza el índice con los archivos indicados.
+
+        Args:
+            files (iterable): Rutas de los archivos a indexar.
+            roots (iterable): Directorios recorridos para obtener ``files``;
+                los archivos indexados dentro de ellos que no estén en
+                ``files`` se eliminan del índice.
+
+        Returns:
+            UpdateStats: Número de archivos analizados, sin cambios,
+                eliminados y con errores.
+        """
+
+        indexed = unchanged = errors = 0
+        seen = set()
+        with self.connection:
+            for filepath in files:
+                path = os.path.abspath(filepath)
+                seen.add(path)
+                try:
+                    changed = self._update_file(path)
+                except (OSError, SyntaxError, UnicodeDecodeError, ValueError):
+                    self._remove(path)
+                    errors += 1
+                    continue
+                if changed:
+                    indexed += 1
+                else:
+                    unchanged += 1
+            removed = self._prune(seen, roots)
+        return UpdateStats(indexed, unchanged, removed, errors)
+
+    def _update_file(self, path):
+        st = os.stat(path)
+        config = ""
+        classifier = None
+        if self.resolver is not None:
+            resolved = self.resolver.for_file(path)
+            config, classifier = resolved.digest, resolved.classifier
+        row = self.connection.execute(
+            "SELECT mtime_ns, size, inode, digest, config FROM files WHERE path = ?",
+            (path,),
+        ).fetchone()
+        fingerprint = (st.st_mtime_ns, st.st_size, st.st_ino)
+        if row and tuple(row[:3]) == fingerprint and row[4] == config:
+            return False
+        with open(path, "rb") as f:
+            source = f.read()
+        digest = hashlib.sha256(source).hexdigest()
+        if not (row and row[3] == digest and row[4] == config):
+            models = extract_models(source, path, classifier)
+            self._remove(path)
+            for class_name, name, inherit, start, end, members in models:
+                model_id = self.connection.execute(
+                    "INSERT INTO models (path, class_name, name, start_line, "
+                    "end_line) VALUES (?, ?, ?, ?, ?)",
+                    (path, class_name, name, start, end),
+                ).lastrowid
+                self.connection.executemany(
+                    "INSERT INTO inherits VALUES (?, ?)",
+                    [(model_id, parent) for parent in inherit],
+                )
+                self.connection.executemany(
+                    "INSERT INTO members VALUES (?, ?, ?, ?)",
+                    [(model_id, *member) for member in members],
+                )
+        self.connection.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)",
+            (path, *fingerprint, digest, config),
+        )
+        return True
+
+    def _remove(self, path):
+        self.connection.execute(
+            "DELETE FROM members WHERE model_id IN "
+            "(SELECT id FROM models WHERE path = ?)",
+            (path,),
+        )
+        self.connection.execute(
+            "DELETE FROM inherits WHERE model_id IN "
+            "(SELECT id FROM models WHERE path = ?)",
+            (path,),
+        )
+        self.connection.execute("DELETE FROM models WHERE path = ?", (path,))
+        self.connection.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    def _prune(self, seen, roots):
+        removed = 0
+        for root in roots:
+            prefix = os.path.join(os.path.abspath(root), "")
+            rows = self.connection.execute(
+                "SELECT path FROM files WHERE substr(path, 1, ?) = ?",
+                (len(prefix), prefix),
+            ).fetchall()
+            for (path,) in rows:
+                if path not in seen:
+                    self._remove(path)
+                    removed += 1
+        return removed
+
+    def models(self, name):
+        """Devuelve las clases que definen o heredan el modelo ``name``."""
+        rows = self.connection.execute(
+            "SELECT id, path, class_name, name, start_line, end_line FROM models "
+            "WHERE name = ? OR id IN (SELECT model_id FROM inherits WHERE name = ?) "
+            "ORDER BY path, start_line",
+            (name, name),
+        ).fetchall()
+        return [
+            ModelRecord(path, class_name, model, self._inherit(model_id), start, end)
+            for model_id, path, class_name, model, start, end in rows
+        ]
+
+    def overrides(self, model, method):
+        """Devuelve todas las definiciones de ``method`` en las clases que
+        definen o heredan el modelo ``model``."""
+        rows = self.connection.execute(
+            "SELECT m.path, mb.line, m.class_name, m.name, mb.name, mb.category "
+            "FROM members mb JOIN models m ON m.id = mb.model_id "
+            "WHERE mb.name = ? AND (m.name = ? OR m.id IN "
+            "(SELECT model_id FROM inherits WHERE name = ?)) "
+            "ORDER BY m.path, mb.line",
+            (method, model, model),
+        ).fetchall()
+        return [MemberRecord(*row) for row in rows]
+
+    def _inherit(self, model_id):
+        return tuple(
+            name
+            for (name,) in self.connection.execute(
+                "SELECT name FROM inherits WHERE model_id = ? ORDER BY rowid",
+                (model_id,),
+            )
+        )
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="odoo-model-index", description="Index of the Odoo models of addons."
+    )
+    parser.add_argument(
+        "--index-dir",
+        help="Directory of the index "
+        "(default: $XDG_CACHE_HOME/hg-odoo-pre-commit-hooks).",
+    )
+    parser.add_argument(
+        "--no-config",
+        action="store_true",
+        help="Ignore the [tool.hg-odoo-pre-commit-hooks] sections of pyproject.toml.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    update = commands.add_parser("update", help="Index new and changed files.")
+    update.add_argument(
+        "--addons-path",
+        action="append",
+        default=[],
+        metavar="DIR[,DIR...]",
+        help="Index every Python file of the Odoo addons under these directories "
+        "and forget the files that no longer exist there.",
+    )
+    update.add_argument("files", nargs="*", help="Python files to index.")
+    overrides = commands.add_parser(
+        "overrides", help="List the definitions of MODEL.METHOD."
+    )
+    overrides.add_argument("target", metavar="MODEL.METHOD")
+    models = commands.add_parser(
+        "models", help="List the classes that define or inherit MODEL."
+    )
+    models.add_argument("model", metavar="MODEL")
+    return parser, parser.parse_args(argv)
+
+
+def main(argv=None):
+    from hg_odoo_pre_commit_hooks.config import ConfigError, ConfigResolver
+
+    parser, args = _parse_args(argv)
+    resolver = None if args.no_config else ConfigResolver()
+    try:
+        index = ModelIndex.open(args.index_dir, resolver)
+    except (OSError, sqlite3.Error) as e:
+        parser.error(f"cannot open the index: {e}")
+
+    try:
+        if args.command == "update":
+            from hg_odoo_pre_commit_hooks import discovery
+
+            roots = discovery.split_addons_paths(args.addons_path)
+            files = [*args.files, *discovery.iter_addon_files(roots)]
+            stats = index.update(files, roots)
+            print(
+                f"{stats.indexed} files indexed, {stats.unchanged} unchanged, "
+                f"{stats.removed} removed, {stats.errors} with errors."
+            )
+        elif args.command == "overrides":
+            model, _, method = args.target.rpartition(".")
+            if not model:
+                parser.error("expected MODEL.METHOD, e.g. sale.order.create")
+            for record in index.overrides(model, method):
+                sys.stdout.write(
+                    f"{record.path}:{record.line}: {record.class_name} "
+                    f"({record.model}) {record.name} [{record.category}]\n"
+                )
+        else:
+            for record in index.models(args.model):
+                inherit = ", ".join(record.inherit)
+                sys.stdout.write(
+                    f"{record.path}:{record.start_line}: {record.class_name} "
+                    f"_name={record.name} _inherit=[{inherit}]\n"
+                )
+    except ConfigError as e:
+        parser.error(f"invalid configuration: {e}")
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,529 @@
+"""lsp.py
+
+Servidor LSP (Language Server Protocol) para ver los errores de orden en el
+editor mientras se escribe.
+
+Solo usa la biblioteca estándar: habla JSON-RPC por stdin/stdout y analiza
+el contenido de los buffers del editor, no los archivos del disco. Los
+cambios se reciben de forma incremental y el análisis se repite cuando pasa
+``DEBOUNCE_SECONDS`` sin cambios nuevos.
+
+Cada documento guarda el análisis de cada bloque de clase (la clase con sus
+decoradores, ver ``model_blocks``) indexado por su texto y con números de
+línea relativos al bloque. Al repetir el análisis solo se vuelven a analizar
+con ``ast`` los bloques cuyo texto cambió (normalmente solo la clase que se
+está editando); los demás se reutilizan aunque se hayan desplazado.
+
+Para cada método fuera de orden se ofrece una acción de código (quick fix)
+que lo mueve delante del primer miembro de una categoría posterior.
+
+Uso:
+    odoo-method-order-lsp [--no-config]
+"""
+
+import argparse
+import ast
+import collections
+import io
+import json
+import os
+import select
+import sys
+import time
+from urllib.parse import unquote, urlparse
+
+from hg_odoo_pre_commit_hooks.check_method_order import (
+    DEFAULT_CLASSIFIER,
+    class_members,
+    class_method_order,
+    find_model_classes,
+    model_blocks,
+    multiple_models_violation,
+    order_violations,
+)
+from hg_odoo_pre_commit_hooks.fixer import member_move
+
+SERVER_NAME = "odoo-method-order"
+DEBOUNCE_SECONDS = 0.15
+
+# Constantes del protocolo.
+SEVERITY_ERROR = 1
+SYNC_INCREMENTAL = 2
+MESSAGE_WARNING = 2
+PARSE_ERROR = -32700
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+
+class MessageReader:
+    """Lee mensajes JSON-RPC (cabeceras y cuerpo) de un descriptor de
+    archivo, esperando como mucho el tiempo indicado.
+
+    Un mensaje mal formado (cabeceras o cuerpo que no se pueden interpretar)
+    se descarta y ``read`` lanza ``ValueError``; la lectura puede continuar
+    con el siguiente mensaje.
+    """
+
+    def __init__(self, fd):
+        self.fd = fd
+        self.buffer = bytearray()
+        self.eof = False
+
+    def _message(self):
+        end = self.buffer.find(b"\r\n\r\n")
+        if end < 0:
+            return None
+        length = 0
+        try:
+            for header in bytes(self.buffer[:end]).decode("ascii").split("\r\n"):
+                name, _, value = header.partition(":")
+                if name.strip().lower() == "content-length":
+                    length = int(value)
+            if length < 0:
+                raise ValueError(f"invalid Content-Length: {length}")
+        except ValueError:
+            # Sin una longitud válida no se sabe dónde acaba el cuerpo: solo
+            # se descartan las cabeceras.
+            del self.buffer[: end + 4]
+            raise
+        total = end + 4 + length
+        if len(self.buffer) < total:
+            return None
+        body = bytes(self.buffer[end + 4 : total])
+        del self.buffer[:total]
+        return json.loads(body)
+
+    def read(self, timeout=None):
+        """Lee el siguiente mensaje.
+
+        Args:
+            timeout (float): Segundos de espera como máximo; None para
+                esperar sin límite.
+
+        Returns:
+            dict: Mensaje; vacío si se agotó el tiempo de espera, o None al
+                llegar al final de la entrada.
+
+        Raises:
+            ValueError: El mensaje está mal formado (ya se ha descartado).
+        """
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            message = self._message()
+            if message is not None:
+                return message
+            if self.eof:
+                return None
+            remaining = None
+            if deadline is not None:
+                remaining = max(deadline - time.monotonic(), 0)
+            ready, _, _ = select.select([self.fd], [], [], remaining)
+            if not ready:
+                return {}
+            data = os.read(self.fd, 64 * 1024)
+            if data:
+                self.buffer += data
+            else:
+                self.eof = True
+
+
+def write_message(stream, message):
+    """Escribe un mensaje JSON-RPC con sus cabeceras."""
+    body = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    stream.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+    stream.flush()
+
+
+def _split_lines(text):
+    # Los mismos saltos de línea que el protocolo: \n, \r\n y \r.
+    return io.StringIO(text, newline="").readlines()
+
+
+def _index(line, character):
+    """Convierte una columna en unidades UTF-16 (las del protocolo) en un
+    índice de ``line``."""
+    if line.isascii():
+        return character
+    units = 0
+    for index, char in enumerate(line):
+        if units >= character:
+            return index
+        units += 2 if ord(char) > 0xFFFF else 1
+    return len(line)
+
+
+def _length(line):
+    """Longitud de ``line`` en unidades UTF-16."""
+    if line.isascii():
+        return len(line)
+    return len(line) + sum(1 for char in line if ord(char) > 0xFFFF)
+
+
+class ClassInfo(collections.namedtuple("ClassInfo", ("node", "method_order"))):
+    """Análisis de un bloque de clase, con líneas relativas al bloque:
+    ``node`` (``ast.ClassDef``) y ``method_order`` (lista)."""
+
+    __slots__ = ()
+
+
+class Document:
+    """Contenido de un buffer del editor y el análisis de sus clases."""
+
+    def __init__(self, uri, text, classifier=None):
+        self.uri = uri
+        self.lines = _split_lines(text)
+        self.classifier = classifier or DEFAULT_CLASSIFIER
+        # Texto del bloque -> ``ClassInfo`` (None si no es un modelo).
+        self.blocks = {}
+        # (número de línea del bloque, ``ClassInfo``) de los modelos.
+        self.classes = []
+        self.dirty = True
+
+    @property
+    def text(self):
+        return "".join(self.lines)
+
+    def line(self, index):
+        return self.lines[index] if index < len(self.lines) else ""
+
+    def apply_change(self, change):
+        """Aplica un ``TextDocumentContentChangeEvent``."""
+        self.dirty = True
+        if "range" not in change:
+            self.lines = _split_lines(change["text"])
+            return
+        start, end = change["range"]["start"], change["range"]["end"]
+        first, last = self.line(start["line"]), self.line(end["line"])
+        text = (
+            first[: _index(first, start["character"])]
+            + change["text"]
+            + last[_index(last, end["character"]) :]
+        )
+        self.lines[start["line"] : end["line"] + 1] = _split_lines(text)
+
+    def analyze(self):
+        """Analiza las clases que cambiaron desde el último análisis.
+
+        Returns:
+            list: Lista de ``Violation``, o None si alguna clase no se puede
+                analizar (p. ej. mientras se escribe).
+        """
+
+        text = self.text
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        models_bases = self.classifier.models_bases
+        blocks = {}
+        classes = []
+        for lineno, block in model_blocks(text, models_bases):
+            if block in self.blocks:
+                info = self.blocks[block]
+            else:
+                try:
+                    tree = ast.parse(block)
+                except SyntaxError:
+                    return None
+                nodes = find_model_classes(tree, models_bases)
+                info = None
+                if nodes:
+                    method_order = class_method_order(nodes[0], self.classifier)
+                    info = ClassInfo(nodes[0], method_order)
+            blocks[block] = info
+            if info:
+                classes.append((lineno, info))
+        self.blocks = blocks
+        self.classes = classes
+        self.dirty = False
+
+        violations = []
+        if len(classes) > 1:
+            violations.append(multiple_models_violation(len(classes)))
+        for lineno, info in classes:
+            offset = lineno - 1
+            method_order = [
+                (category, line + offset, name)
+                for category, line, name in info.method_order
+            ]
+            violations.extend(order_violations(method_order, self.classifier))
+        return violations
+
+    def diagnostics(self, violations):
+        """Convierte los errores en ``Diagnostic`` del protocolo."""
+        result = []
+        for violation in violations:
+            line = (violation.line or 1) - 1
+            end = _length(self.line(line).rstrip("\r\n"))
+            result.append(
+                {
+                    "range": {
+                        "start": {"line": line, "character": 0},
+                        "end": {"line": line, "character": end},
+                    },
+                    "severity": SEVERITY_ERROR,
+                    "source": SERVER_NAME,
+                    "code": violation.rule,
+                    "message": violation.message,
+                }
+            )
+        return result
+
+    def code_actions(self, line):
+        """Devuelve las acciones de código para la línea ``line`` (desde 0):
+        mover el miembro fuera de orden que la contiene a su sitio."""
+        line += 1
+        for lineno, info in self.classes:
+            offset = lineno - 1
+            node = info.node
+            if not node.lineno + offset <= line <= node.end_lineno + offset:
+                continue
+            lines = self.lines[offset:]
+            members = class_members(node)
+            for index, member in enumerate(members):
+                if member.lineno + offset <= line <= member.end_lineno + offset:
+                    move = member_move(node, lines, index, self.classifier)
+                    if move:
+                        return [self._move_action(info, offset, index, move)]
+            return []
+        return []
+
+    def _move_action(self, info, offset, index, move):
+        first, start, end = (line + offset for line in move[2:])
+        moved = "".join(self.lines[start - 1 : end])
+        if moved.endswith(("\n", "\r")):
+            delete_start = {"line": first - 1, "character": 0}
+            delete_end = {"line": end, "character": 0}
+        else:
+            # El miembro es el final del archivo y no termina en salto de
+            # línea: se borra desde el final del miembro anterior.
+            moved += "\n"
+            previous = self.lines[first - 2].rstrip("\r\n")
+            delete_start = {"line": first - 2, "character": _length(previous)}
+            delete_end = {"line": end - 1, "character": _length(self.lines[end - 1])}
+        moved += "".join(self.lines[first - 1 : start - 1])
+        position = {"line": move.line + offset - 1, "character": 0}
+        name = info.method_order[index][2]
+        target = info.method_order[move.target][2]
+        edits = [
+            {"range": {"start": position, "end": position}, "newText": moved},
+            {"range": {"start": delete_start, "end": delete_end}, "newText": ""},
+        ]
+        return {
+            "title": f"Move '{name}' before '{target}'",
+            "kind": "quickfix",
+            "edit": {"changes": {self.uri: edits}},
+        }
+
+
+def uri_to_path(uri):
+    """Devuelve la ruta local de una URI ``file://``, o None."""
+    parsed = urlparse(uri)
+    if parsed.scheme != "file":
+        return None
+    return unquote(parsed.path)
+
+
+class Server:
+    """Servidor LSP que lee mensajes del descriptor ``fd`` y escribe en
+    ``writer``.
+
+    Mientras espera mensajes, analiza los documentos modificados cuando vence
+    su plazo de espera.
+    """
+
+    def __init__(self, fd, writer, resolver=None, debounce=DEBOUNCE_SECONDS):
+        self.reader = MessageReader(fd)
+        self.writer = writer
+        self.resolver = resolver
+        self.debounce = debounce
+        self.documents = {}
+        # URI -> momento en que se debe analizar el documento.
+        self.pending = {}
+        self.running = True
+
+    def serve(self):
+        """Atiende mensajes hasta recibir ``exit`` o el final de la entrada."""
+        while self.running:
+            timeout = None
+            if self.pending:
+                timeout = max(min(self.pending.values()) - time.monotonic(), 0)
+            try:
+                message = self.reader.read(timeout)
+            except ValueError as e:
+                self._error(None, PARSE_ERROR, f"Parse error: {e}")
+                continue
+            if message is None:
+                break
+            if message:
+                self.handle(message)
+            now = time.monotonic()
+            for uri in [uri for uri, due in self.pending.items() if due <= now]:
+                self.publish(uri)
+
+    def send(self, message):
+        write_message(self.writer, {"jsonrpc": "2.0", **message})
+
+    def handle(self, message):
+        """Procesa una petición o una notificación.
+
+        Un error del manejador (p. ej. por unos parámetros mal formados) no
+        detiene el servidor: se responde con un error a las peticiones y se
+        ignora en las notificaciones.
+        """
+
+        method = message.get("method")
+        handler = self.HANDLERS.get(method)
+        if handler is None:
+            if "id" in message:
+                self._error(message["id"], METHOD_NOT_FOUND, f"Unknown method {method}")
+            return
+        try:
+            result = handler(self, message.get("params") or {})
+        except (AttributeError, IndexError, KeyError, TypeError, ValueError) as e:
+            if "id" in message:
+                self._error(
+                    message["id"], INVALID_PARAMS, f"Invalid params for {method}: {e!r}"
+                )
+            return
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            if "id" in message:
+                self._error(message["id"], INTERNAL_ERROR, f"{type(e).__name__}: {e}")
+            return
+        if "id" in message:
+            self.send({"id": message["id"], "result": result})
+
+    def _error(self, request_id, code, message):
+        self.send({"id": request_id, "error": {"code": code, "message": message}})
+
+    def publish(self, uri):
+        """Analiza un documento y publica sus errores."""
+        self.pending.pop(uri, None)
+        document = self.documents.get(uri)
+        if document is None:
+            return
+        violations = document.analyze()
+        if violations is None:
+            # Se mantienen los errores publicados hasta que se pueda analizar.
+            return
+        self.send(
+            {
+                "method": "textDocument/publishDiagnostics",
+                "params": {"uri": uri, "diagnostics": document.diagnostics(violations)},
+            }
+        )
+
+    def _classifier(self, uri):
+        path = uri_to_path(uri)
+        if self.resolver is None or path is None:
+            return None
+        from hg_odoo_pre_commit_hooks.config import ConfigError
+
+        try:
+            return self.resolver.for_file(path).classifier
+        except ConfigError as e:
+            self.send(
+                {
+                    "method": "window/logMessage",
+                    "params": {
+                        "type": MESSAGE_WARNING,
+                        "message": f"invalid configuration: {e}",
+                    },
+                }
+            )
+            return None
+
+    def _initialize(self, _params):
+        return {
+            "capabilities": {
+                "textDocumentSync": {
+                    "openClose": True,
+                    "change": SYNC_INCREMENTAL,
+                },
+                "codeActionProvider": {"codeActionKinds": ["quickfix"]},
+            },
+            "serverInfo": {"name": SERVER_NAME},
+        }
+
+    def _shutdown(self, _params):
+        return None
+
+    def _exit(self, _params):
+        self.running = False
+
+    def _did_open(self, params):
+        item = params["textDocument"]
+        uri = item["uri"]
+        self.documents[uri] = Document(uri, item["text"], self._classifier(uri))
+        self.publish(uri)
+
+    def _did_change(self, params):
+        uri = params["textDocument"]["uri"]
+        document = self.documents.get(uri)
+        if document is None:
+            return
+        for change in params["contentChanges"]:
+            document.apply_change(change)
+        self.pending[uri] = time.monotonic() + self.debounce
+
+    def _did_close(self, params):
+        uri = params["textDocument"]["uri"]
+        self.documents.pop(uri, None)
+        self.pending.pop(uri, None)
+        self.send(
+            {
+                "method": "textDocument/publishDiagnostics",
+                "params": {"uri": uri, "diagnostics": []},
+            }
+        )
+
+    def _code_action(self, params):
+        uri = params["textDocument"]["uri"]
+        document = self.documents.get(uri)
+        if document is None:
+            return []
+        if document.dirty:
+            self.publish(uri)
+            if document.dirty:
+                return []
+        return document.code_actions(params["range"]["start"]["line"])
+
+    # Método del protocolo -> manejador, que recibe los parámetros.
+    HANDLERS = {
+        "initialize": _initialize,
+        "shutdown": _shutdown,
+        "exit": _exit,
+        "textDocument/didOpen": _did_open,
+        "textDocument/didChange": _did_change,
+        "textDocument/didClose": _did_close,
+        "textDocument/codeAction": _code_action,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Language server (stdio) showing Odoo method order errors."
+    )
+    parser.add_argument(
+        "--no-config",
+        action="store_true",
+        help="Ignore the [tool.hg-odoo-pre-commit-hooks] sections of the "
+        "pyproject.toml files and use the built-in settings.",
+    )
+    parser.add_argument(
+        "--stdio",
+        action="store_true",
+        help="Communicate over stdin/stdout (the default; accepted for editor "
+        "compatibility).",
+    )
+    args = parser.parse_args(argv)
+    resolver = None
+    if not args.no_config:
+        from hg_odoo_pre_commit_hooks.config import ConfigResolver
+
+        resolver = ConfigResolver()
+    Server(sys.stdin.fileno(), sys.stdout.buffer, resolver).serve()
+
+
+if __name__ == "__main__":
+    main()
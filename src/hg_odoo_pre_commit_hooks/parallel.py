@@ -0,0 +1,158 @@
+"""parallel.py
+
+Ejecuta el análisis de archivos en un conjunto de procesos.
+
+Los archivos se envían a los procesos de mayor a menor tamaño (por ventanas),
+de modo que un archivo grande no quede al final de la cola retrasando toda la
+ejecución.
+Los procesos devuelven listas de ``Violation`` (no texto impreso) y los
+resultados se entregan en el mismo orden en que se recibieron los archivos,
+igual que en la ejecución secuencial.
+
+Cada proceso abre su propia conexión a la caché de resultados, si se usa.
+"""
+
+import os
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from hg_odoo_pre_commit_hooks.check_method_order import NO_TIMER, file_violations
+
+# Archivos por proceso que se leen del iterable de rutas en cada ventana.
+WINDOW_PER_JOB = 16
+
+
+def _no_timer(_stats):
+    return NO_TIMER
+
+
+# Estado de cada proceso, preparado por ``_init_worker``: la función de
+# análisis y la que crea el temporizador de cada archivo (``PhaseTimer`` con
+# ``--profile``).
+_WORKER = {"check": file_violations, "timer": _no_timer}
+
+
+def resolve_jobs(value):
+    """Convierte el valor de ``--jobs`` en un número de procesos.
+
+    Args:
+        value (str): Número entero positivo o ``"auto"``.
+
+    Returns:
+        int: Número de procesos a utilizar.
+
+    Raises:
+        ValueError: Si el valor no es válido.
+    """
+
+    if value == "auto":
+        if hasattr(os, "sched_getaffinity"):
+            return len(os.sched_getaffinity(0)) or 1
+        return os.cpu_count() or 1
+    try:
+        jobs = int(value)
+    except ValueError:
+        jobs = 0
+    if jobs < 1:
+        raise ValueError(
+            f"argument -j/--jobs: expected a positive integer or 'auto', got {value!r}"
+        )
+    return jobs
+
+
+def _file_size(filepath):
+    try:
+        return os.stat(filepath).st_size
+    except OSError:
+        return 0
+
+
+def _init_worker(check, cache_dir, profile, resolver):
+    if profile:
+        from hg_odoo_pre_commit_hooks.profiling import PhaseTimer
+
+        _WORKER["timer"] = PhaseTimer
+    if check is not None:
+        _WORKER["check"] = check
+        return
+    if cache_dir is not None:
+        from hg_odoo_pre_commit_hooks.cache import ResultCache
+
+        cache = ResultCache.open(cache_dir, resolver=resolver)
+        if cache is not None:
+            _WORKER["check"] = cache.violations
+            return
+    if resolver is not None:
+        _WORKER["check"] = resolver.violations
+
+
+def _check(filepath):
+    stats = Counter()
+    timer = _WORKER["timer"](stats)
+    return _WORKER["check"](filepath, stats, timer=timer), stats
+
+
+def _submit(executor, batch):
+    """Envía un lote de archivos de mayor a menor tamaño.
+
+    Returns:
+        list: Tuplas (ruta, futuro) en el orden original del lote.
+    """
+
+    futures = [None] * len(batch)
+    for i in sorted(
+        range(len(batch)), key=lambda i: _file_size(batch[i]), reverse=True
+    ):
+        futures[i] = executor.submit(_check, batch[i])
+    return list(zip(batch, futures, strict=True))
+
+
+def iter_results(paths, jobs, check=None, cache_dir=None, profile=False, resolver=None):
+    """Analiza los archivos en paralelo.
+
+    ``paths`` se consume por ventanas de ``jobs * WINDOW_PER_JOB`` archivos,
+    así que puede ser un generador que todavía esté recorriendo directorios.
+    Dentro de cada ventana los archivos se envían de mayor a menor tamaño y
+    siempre hay una ventana en cola mientras se devuelven los resultados.
+
+    Args:
+        paths (iterable): Rutas de los archivos a analizar.
+        jobs (int): Número máximo de procesos.
+        check (callable): Función que analiza un archivo en cada proceso, con
+            la firma de ``file_violations``; debe poder serializarse con
+            ``pickle``. Por defecto ``file_violations``.
+        cache_dir (str): Directorio de la caché de resultados, o None para
+            analizar sin caché.
+        profile (bool): Si es True, mide el tiempo de cada fase del análisis
+            (ver ``profiling.PhaseTimer``).
+        resolver (config.ConfigResolver): Si se indica y no hay ``check``,
+            cada archivo se analiza con la configuración de su directorio.
+
+    Yields:
+        tuple: (ruta, lista de ``Violation``, ``collections.Counter`` con las
+            estadísticas del archivo) en el orden de ``paths``.
+    """
+
+    paths = iter(paths)
+    window = jobs * WINDOW_PER_JOB
+    batch = list(islice(paths, window))
+    if not batch:
+        return
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(batch)),
+        initializer=_init_worker,
+        initargs=(check, cache_dir, profile, resolver),
+    ) as executor:
+        pending = deque(_submit(executor, batch))
+        try:
+            while pending:
+                if len(pending) <= window:
+                    pending.extend(_submit(executor, list(islice(paths, window))))
+                filepath, future = pending.popleft()
+                violations, stats = future.result()
+                yield filepath, violations, stats
+        except BaseException:
+            for _filepath, future in pending:
+                future.cancel()
+            raise
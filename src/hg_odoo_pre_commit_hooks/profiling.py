@@ -0,0 +1,119 @@
+"""profiling.py
+
+Medición del tiempo de cada fase del análisis (``--profile``).
+
+``PhaseTimer`` suma el tiempo de cada fase en el contador de estadísticas de
+cada archivo (claves ``<fase>_seconds``), de modo que los tiempos viajan con
+el resto de contadores desde los procesos de ``parallel``. ``Profile``
+acumula los contadores de todos los archivos y genera el resumen.
+"""
+
+import heapq
+import io
+import os
+from collections import Counter
+from time import perf_counter
+
+PHASES = (
+    "cache",
+    "read",
+    "prefilter",
+    "decode",
+    "parse",
+    "models",
+    "classification",
+    "ordering",
+    "fix",
+    "output",
+)
+
+
+class PhaseTimer:
+    """Context manager que suma a ``stats`` el tiempo de la fase indicada.
+
+    Uso::
+
+        with timer("parse"):
+            tree = ast.parse(...)
+    """
+
+    __slots__ = ("_key", "_start", "stats")
+
+    def __init__(self, stats):
+        self.stats = stats
+        self._key = None
+        self._start = 0.0
+
+    def __call__(self, phase):
+        self._key = f"{phase}_seconds"
+        return self
+
+    def __enter__(self):
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stats[self._key] += perf_counter() - self._start
+        return False
+
+
+def file_seconds(stats):
+    """Devuelve el tiempo total medido de un archivo."""
+    return sum(value for key, value in stats.items() if key.endswith("_seconds"))
+
+
+class Profile:
+    """Resumen de los tiempos de todos los archivos analizados."""
+
+    def __init__(self, top=10):
+        self.top = top
+        self.totals = Counter()
+        self.files = 0
+        self.slowest = []
+
+    def add(self, filepath, stats):
+        """Acumula los tiempos de un archivo."""
+        self.files += 1
+        self.totals.update(
+            {key: value for key, value in stats.items() if key.endswith("_seconds")}
+        )
+        item = (file_seconds(stats), filepath)
+        if len(self.slowest) < self.top:
+            heapq.heappush(self.slowest, item)
+        elif self.top:
+            heapq.heappushpop(self.slowest, item)
+
+    def report(self, wall_seconds):
+        """Devuelve el resumen como texto."""
+        measured = file_seconds(self.totals) or 1.0
+        lines = [
+            (
+                f"Profile: {self.files} files in {wall_seconds:.3f}s wall time "
+                f"({file_seconds(self.totals):.3f}s measured)"
+            ),
+            f"  {'phase':<16}{'seconds':>10}{'share':>8}",
+        ]
+        for phase in PHASES:
+            seconds = self.totals[f"{phase}_seconds"]
+            if seconds:
+                lines.append(f"  {phase:<16}{seconds:>10.4f}{seconds / measured:>8.1%}")
+        if self.slowest:
+            lines.append(f"Slowest {len(self.slowest)} files:")
+            for seconds, filepath in sorted(self.slowest, reverse=True):
+                try:
+                    size = os.path.getsize(filepath)
+                except OSError:
+                    size = 0
+                lines.append(f"  {seconds:>10.4f}s {size:>10} bytes  {filepath}")
+        return "\n".join(lines) + "\n"
+
+
+def cprofile_report(profiler, filepath, limit=20):
+    """Guarda las estadísticas de cProfile y devuelve las funciones con más
+    tiempo acumulado."""
+    import pstats
+
+    profiler.dump_stats(filepath)
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(limit)
+    return stream.getvalue()
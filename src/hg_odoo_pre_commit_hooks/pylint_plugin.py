@@ -0,0 +1,163 @@
+"""pylint_plugin.py
+
+Complemento de pylint que comprueba el orden de los miembros de los modelos
+Odoo dentro de la misma pasada de pylint (p. ej. junto a pylint-odoo), con el
+árbol de astroid que pylint ya ha construido, sin volver a leer ni a analizar
+el archivo::
+
+    pylint --load-plugins=hg_odoo_pre_commit_hooks.pylint_plugin addons/
+
+La clasificación y la comprobación del orden son las de
+``check_method_order``, que trabajan con nodos ``ast``. En lugar de volver a
+analizar el código, cada clase de primer nivel se traduce a un esqueleto
+``ast`` con lo único que se usa para clasificar sus miembros: nombres,
+decoradores, destinos de las asignaciones y el módulo de las llamadas
+(``fields.Char(...)``). Los cuerpos de los métodos no se recorren.
+
+Mensajes:
+
+- ``C8701`` ``odoo-method-order``: miembro fuera de orden.
+- ``C8702`` ``odoo-unknown-category``: categoría desconocida.
+- ``C8703`` ``odoo-multiple-models``: varios modelos en el mismo archivo.
+
+Necesita pylint (y astroid), que no son dependencias del paquete.
+"""
+
+import ast
+
+from astroid import nodes
+from pylint.checkers import BaseChecker
+
+from hg_odoo_pre_commit_hooks.check_method_order import (
+    find_model_classes,
+    model_violations,
+)
+from hg_odoo_pre_commit_hooks.config import ConfigResolver
+from hg_odoo_pre_commit_hooks.reporters import RULES
+
+# Identificador de regla (``Violation.rule``) -> (código, símbolo) de pylint.
+MESSAGES = {
+    "method-order": ("C8701", "odoo-method-order"),
+    "unknown-category": ("C8702", "odoo-unknown-category"),
+    "multiple-models": ("C8703", "odoo-multiple-models"),
+}
+
+
+def _expression(node):
+    """Traduce las expresiones que usa la clasificación (nombres, atributos,
+    llamadas y constantes); las demás se sustituyen por ``None``."""
+    if isinstance(node, nodes.Name | nodes.AssignName):
+        return ast.Name(id=node.name)
+    if isinstance(node, nodes.Attribute | nodes.AssignAttr):
+        return ast.Attribute(value=_expression(node.expr), attr=node.attrname)
+    if isinstance(node, nodes.Call):
+        return ast.Call(func=_expression(node.func), args=[], keywords=[])
+    if isinstance(node, nodes.Const):
+        return ast.Constant(value=node.value)
+    return ast.Constant(value=None)
+
+
+def _lineno(node):
+    """Línea del nodo como en ``ast``: astroid da la del primer decorador en
+    las funciones y clases decoradas, y la de ``def``/``class`` en
+    ``position``."""
+    position = getattr(node, "position", None)
+    return position.lineno if position is not None else node.lineno
+
+
+def _decorators(node):
+    if node.decorators is None:
+        return []
+    return [_expression(decorator) for decorator in node.decorators.nodes]
+
+
+def _member(node, origins):
+    """Traduce un miembro del cuerpo de una clase y guarda en ``origins`` el
+    nodo de astroid de su línea."""
+    if isinstance(node, nodes.AsyncFunctionDef):
+        member = ast.AsyncFunctionDef(
+            name=node.name, decorator_list=_decorators(node), body=[]
+        )
+    elif isinstance(node, nodes.FunctionDef):
+        member = ast.FunctionDef(
+            name=node.name, decorator_list=_decorators(node), body=[]
+        )
+    elif isinstance(node, nodes.ClassDef):
+        member = ast.ClassDef(name=node.name, decorator_list=_decorators(node), body=[])
+    elif isinstance(node, nodes.Assign):
+        member = ast.Assign(
+            targets=[_expression(target) for target in node.targets],
+            value=_expression(node.value),
+        )
+    elif isinstance(node, nodes.AnnAssign):
+        member = ast.AnnAssign(
+            target=_expression(node.target),
+            annotation=ast.Constant(value=None),
+            value=node.value and _expression(node.value),
+            simple=1,
+        )
+    elif isinstance(node, nodes.Expr):
+        member = ast.Expr(value=_expression(node.value))
+    else:
+        member = ast.Pass()
+    member.lineno = _lineno(node)
+    origins[member.lineno] = node
+    return member
+
+
+def _class(node, origins):
+    """Traduce una clase de primer nivel al esqueleto ``ast`` que necesitan
+    ``find_model_classes`` y ``class_method_order``."""
+    translated = ast.ClassDef(
+        name=node.name,
+        bases=[_expression(base) for base in node.bases],
+        keywords=[],
+        body=[_member(member, origins) for member in node.body],
+        decorator_list=_decorators(node),
+    )
+    translated.lineno = _lineno(node)
+    return translated
+
+
+class MethodOrderChecker(BaseChecker):
+    """Orden de los miembros de los modelos Odoo de cada módulo."""
+
+    name = "odoo-method-order"
+    msgs = {
+        code: ("%s", symbol, RULES[rule]) for rule, (code, symbol) in MESSAGES.items()
+    }
+
+    def __init__(self, linter):
+        super().__init__(linter)
+        self.resolver = ConfigResolver()
+
+    def visit_module(self, node):
+        classifier = self.resolver.for_file(node.file or node.name).classifier
+        # Línea -> nodo de astroid, porque pylint necesita un nodo en cada
+        # mensaje.
+        origins = {}
+        tree = ast.Module(
+            body=[
+                _class(c, origins) for c in node.body if isinstance(c, nodes.ClassDef)
+            ],
+            type_ignores=[],
+        )
+        model_classes = find_model_classes(tree, classifier.models_bases)
+        if not model_classes:
+            return
+        for violation in model_violations(model_classes, classifier=classifier):
+            symbol = MESSAGES[violation.rule][1]
+            if violation.line is None:
+                self.add_message(symbol, node=node, args=(violation.message,))
+            else:
+                self.add_message(
+                    symbol,
+                    line=violation.line,
+                    node=origins.get(violation.line, node),
+                    args=(violation.message,),
+                )
+
+
+def register(linter):
+    """Punto de entrada de ``--load-plugins``."""
+    linter.register_checker(MethodOrderChecker(linter))
@@ -0,0 +1,167 @@
+"""readahead.py
+
+Lectura anticipada de los archivos (``--read-ahead N``).
+
+En sistemas de archivos lentos o de red la mayor parte del tiempo de una
+ejecución secuencial se pierde esperando a que se lea cada archivo. Con
+``ReadAhead`` un pequeño conjunto de hilos lee los siguientes ``depth``
+archivos mientras el hilo principal analiza el actual; la lectura libera el
+GIL, así que ambas cosas avanzan a la vez.
+
+Los archivos se entregan en el mismo orden en que se reciben. El contenido
+leído por adelantado, junto con el del último archivo entregado, nunca supera
+``max_bytes`` (salvo un único archivo más grande que el límite, que se lee
+solo): cada lector reserva el
+tamaño de su archivo antes de leerlo, por turnos y en el orden de entrada, de
+modo que un archivo posterior no puede quitarle la memoria al que espera el
+hilo principal.
+
+El contenido se entrega sin decodificar: el prefiltro trabaja con ``bytes``
+y la mayoría de los archivos no llegan a decodificarse.
+"""
+
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Número máximo de hilos lectores, sea cual sea la profundidad.
+MAX_THREADS = 8
+
+
+class _Budget:
+    """Memoria disponible para el contenido leído por adelantado, reservada
+    por turnos en el orden de los archivos."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.used = 0
+        self.turn = 0
+        self.closed = False
+        self.condition = threading.Condition()
+
+    def acquire(self, ticket, size):
+        """Espera el turno ``ticket`` y memoria para ``size`` bytes.
+
+        Returns:
+            int: Bytes reservados, que se deben devolver con ``release``.
+        """
+
+        size = min(size, self.limit)
+        with self.condition:
+            self.condition.wait_for(
+                lambda: (
+                    self.closed
+                    or (
+                        self.turn == ticket
+                        and (not self.used or self.used + size <= self.limit)
+                    )
+                )
+            )
+            self.turn += 1
+            self.used += size
+            self.condition.notify_all()
+        return size
+
+    def release(self, size):
+        with self.condition:
+            self.used -= size
+            self.condition.notify_all()
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+
+class ReadAhead:
+    """Iterador de ``(ruta, contenido)`` que lee por adelantado los archivos
+    siguientes.
+
+    Si no se puede leer un archivo, su ``OSError`` se lanza al pedirlo, igual
+    que al leerlo directamente; después se puede seguir iterando.
+
+    Args:
+        paths (iterable): Rutas de los archivos; se consume a medida que se
+            leen, así que puede ser un generador.
+        depth (int): Número de archivos que se leen por adelantado.
+        max_bytes (int): Memoria máxima del contenido leído por adelantado.
+        threads (int): Número de hilos lectores; por defecto ``depth``, hasta
+            ``MAX_THREADS``.
+    """
+
+    def __init__(self, paths, depth, max_bytes=DEFAULT_MAX_BYTES, threads=None):
+        if depth < 1:
+            raise ValueError("the read-ahead depth must be at least 1")
+        self.paths = iter(paths)
+        self.depth = depth
+        self.budget = _Budget(max(max_bytes, 1))
+        self.executor = ThreadPoolExecutor(
+            max_workers=threads or min(depth, MAX_THREADS),
+            thread_name_prefix="read-ahead",
+        )
+        self.pending = deque()
+        self.tickets = 0
+        self.exhausted = False
+        # Memoria reservada por el último archivo entregado.
+        self.held = 0
+
+    def _read(self, filepath, ticket):
+        reserved = None
+        try:
+            with open(filepath, "rb") as f:
+                try:
+                    size = os.fstat(f.fileno()).st_size
+                except OSError:
+                    size = 0
+                reserved = self.budget.acquire(ticket, size)
+                source = f.read()
+        except BaseException:
+            if reserved is None:
+                # Sin abrir el archivo también se consume el turno, para que
+                # los siguientes no esperen indefinidamente.
+                self.budget.acquire(ticket, 0)
+            else:
+                self.budget.release(reserved)
+            raise
+        return source, reserved
+
+    def _fill(self):
+        while not self.exhausted and len(self.pending) < self.depth:
+            filepath = next(self.paths, None)
+            if filepath is None:
+                self.exhausted = True
+                break
+            future = self.executor.submit(self._read, filepath, self.tickets)
+            self.tickets += 1
+            self.pending.append((filepath, future))
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.held:
+            self.budget.release(self.held)
+            self.held = 0
+        self._fill()
+        if not self.pending:
+            raise StopIteration
+        filepath, future = self.pending.popleft()
+        source, self.held = future.result()
+        return filepath, source
+
+    def close(self):
+        """Cancela las lecturas pendientes y espera a los hilos lectores."""
+        self.budget.close()
+        for _filepath, future in self.pending:
+            future.cancel()
+        self.pending.clear()
+        self.executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
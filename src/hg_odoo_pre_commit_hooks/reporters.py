@@ -0,0 +1,128 @@
+"""reporters.py
+
+Formatos de salida de ``odoo-method-order`` (``--format``).
+
+Cada formato recibe los errores de cada archivo como registros ``Violation``
+y los escribe con una sola llamada a ``write`` por archivo (``text`` y
+``json``) o por ejecución (``sarif``, que necesita el documento completo), en
+lugar de una llamada a ``print`` por error. Los módulos que solo necesitan
+``json`` y ``sarif`` se importan al usarlos, para no retrasar el arranque con
+el formato ``text``.
+
+- ``text``: el formato de siempre, ``ruta:línea: mensaje``.
+- ``json``: una lista de objetos con ``file``, ``line``, ``rule`` y
+  ``message``.
+- ``sarif``: un documento SARIF 2.1.0 para las anotaciones de CI.
+"""
+
+from hg_odoo_pre_commit_hooks.check_method_order import format_violations
+
+TOOL_NAME = "odoo-method-order"
+INFORMATION_URI = "https://github.com/heligrafics/odoo-pre-commit-hooks"
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+# Identificador de regla (``Violation.rule``) -> descripción.
+RULES = {
+    "method-order": "Class members must follow the expected category order.",
+    "unknown-category": "Class members must belong to a known category.",
+    "multiple-models": "A file must not define more than one Odoo model.",
+}
+
+
+class TextReporter:
+    """Salida de texto, idéntica a la de versiones anteriores."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def add(self, filepath, violations):
+        if violations:
+            self.stream.write(format_violations(violations, filepath))
+
+    def finish(self):
+        pass
+
+
+class JsonReporter:
+    """Lista JSON de errores, escrita archivo a archivo."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.empty = True
+
+    def add(self, filepath, violations):
+        if not violations:
+            return
+        import json
+
+        items = ",\n".join(
+            "  "
+            + json.dumps(
+                {
+                    "file": filepath,
+                    "line": violation.line,
+                    "rule": violation.rule,
+                    "message": violation.message,
+                }
+            )
+            for violation in violations
+        )
+        self.stream.write(("[\n" if self.empty else ",\n") + items)
+        self.empty = False
+
+    def finish(self):
+        self.stream.write("[]\n" if self.empty else "\n]\n")
+
+
+def _artifact_uri(filepath):
+    import pathlib
+
+    path = pathlib.Path(filepath)
+    return path.as_uri() if path.is_absolute() else path.as_posix()
+
+
+class SarifReporter:
+    """Documento SARIF 2.1.0, escrito al terminar la ejecución."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.results = []
+
+    def add(self, filepath, violations):
+        for violation in violations:
+            location = {"artifactLocation": {"uri": _artifact_uri(filepath)}}
+            if violation.line is not None:
+                location["region"] = {"startLine": violation.line}
+            self.results.append(
+                {
+                    "ruleId": violation.rule,
+                    "level": "error",
+                    "message": {"text": violation.message},
+                    "locations": [{"physicalLocation": location}],
+                }
+            )
+
+    def finish(self):
+        import json
+
+        driver = {
+            "name": TOOL_NAME,
+            "informationUri": INFORMATION_URI,
+            "rules": [
+                {"id": rule_id, "shortDescription": {"text": text}}
+                for rule_id, text in RULES.items()
+            ],
+        }
+        document = {
+            "$schema": SARIF_SCHEMA,
+            "version": "2.1.0",
+            "runs": [{"tool": {"driver": driver}, "results": self.results}],
+        }
+        self.stream.write(json.dumps(document, indent=2) + "\n")
+
+
+REPORTERS = {
+    "text": TextReporter,
+    "json": JsonReporter,
+    "sarif": SarifReporter,
+}
@@ -0,0 +1,175 @@
+"""shard.py
+
+Reparto de los archivos entre varios nodos de CI (``--shard INDEX/COUNT``) y
+unión de sus informes (``odoo-method-order merge``).
+
+Todos los nodos reciben la misma lista de archivos y calculan el mismo
+reparto, sin comunicarse entre sí: los archivos se ordenan de mayor a menor
+tamaño (y por ruta a igual tamaño) y cada uno se asigna al grupo con menos
+bytes hasta el momento. Así todos los grupos tienen aproximadamente el mismo
+trabajo, ya que el coste del análisis es proporcional al tamaño del archivo.
+
+El reparto no usa la caché de resultados aunque exista: cada nodo solo tiene
+en su caché los archivos que analizó, así que el coste que vería cada nodo
+sería distinto y algunos archivos se quedarían sin analizar (o se analizarían
+dos veces).
+
+Cada nodo escribe su informe con ``--format json`` y ``merge`` los combina en
+un único informe, ordenado por archivo, y un único código de salida::
+
+    odoo-method-order --shard 1/3 --format json --addons-path . > shard-1.json
+    ...
+    odoo-method-order merge shard-1.json shard-2.json shard-3.json
+"""
+
+import heapq
+import os
+
+
+def parse_shard(value):
+    """Convierte el valor de ``--shard`` en ``(índice, número de grupos)``.
+
+    Args:
+        value (str): ``INDEX/COUNT``, con ``1 <= INDEX <= COUNT``.
+
+    Returns:
+        tuple: (índice del grupo empezando en 1, número de grupos).
+
+    Raises:
+        ValueError: Si el valor no es válido.
+    """
+
+    index, separator, count = value.partition("/")
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        index = count = 0
+    if not separator or not 1 <= index <= count:
+        raise ValueError(
+            f"invalid shard {value!r}: expected INDEX/COUNT with 1 <= INDEX <= COUNT"
+        )
+    return index, count
+
+
+def _size(filepath):
+    try:
+        return os.stat(filepath).st_size
+    except OSError:
+        # Se asigna igualmente, para que el nodo que lo reciba reporte el
+        # error al leerlo.
+        return 0
+
+
+def shard_files(files, index, count, size=_size):
+    """Devuelve los archivos del grupo ``index`` de ``count``.
+
+    Args:
+        files (iterable): Rutas de todos los archivos; las rutas repetidas se
+            cuentan una vez.
+        index (int): Índice del grupo, empezando en 1.
+        count (int): Número de grupos.
+        size (callable): Función que devuelve el tamaño de un archivo.
+
+    Returns:
+        list: Rutas del grupo, en el orden en que se recibieron.
+    """
+
+    files = list(dict.fromkeys(files))
+    if count == 1:
+        return files
+    # (bytes asignados, número de grupo) de cada grupo.
+    loads = [(0, shard) for shard in range(1, count + 1)]
+    selected = set()
+    for weight, filepath in sorted(((size(f), f) for f in files), reverse=True):
+        load, shard = heapq.heappop(loads)
+        if shard == index:
+            selected.add(filepath)
+        heapq.heappush(loads, (load + weight, shard))
+    return [filepath for filepath in files if filepath in selected]
+
+
+def read_report(path):
+    """Lee un informe de ``--format json``.
+
+    Returns:
+        dict: Ruta -> lista de ``Violation``, en el orden del informe.
+
+    Raises:
+        OSError: Si no se puede leer el archivo.
+        ValueError: Si no es un informe JSON válido.
+    """
+
+    import json
+
+    from hg_odoo_pre_commit_hooks.check_method_order import Violation
+
+    with open(path, encoding="utf-8") as f:
+        records = json.load(f)
+    if not isinstance(records, list):
+        raise ValueError("expected a JSON list of violations")
+    violations = {}
+    for record in records:
+        try:
+            filepath, line, message = record["file"], record["line"], record["message"]
+        except (KeyError, TypeError):
+            raise ValueError(f"invalid violation record: {record!r}") from None
+        violations.setdefault(filepath, []).append(Violation(line, message))
+    return violations
+
+
+def merge_reports(paths, reporter):
+    """Une los informes de varios grupos y los escribe con ``reporter``.
+
+    Los archivos se escriben ordenados por ruta; los errores de cada archivo
+    mantienen el orden de su informe.
+
+    Returns:
+        bool: True si ningún informe contiene errores.
+
+    Raises:
+        OSError: Si no se puede leer algún informe.
+        ValueError: Si algún informe no es válido.
+    """
+
+    merged = {}
+    for path in paths:
+        for filepath, violations in read_report(path).items():
+            merged.setdefault(filepath, []).extend(violations)
+    for filepath in sorted(merged):
+        reporter.add(filepath, merged[filepath])
+    reporter.finish()
+    return not merged
+
+
+def merge_main(argv):
+    """Ejecuta ``odoo-method-order merge``."""
+    import argparse
+    import sys
+
+    from hg_odoo_pre_commit_hooks.reporters import REPORTERS
+
+    parser = argparse.ArgumentParser(
+        prog="odoo-method-order merge",
+        description="Combine the --format json reports of several --shard runs "
+        "into one report and one exit code.",
+    )
+    parser.add_argument(
+        "--exit-zero",
+        action="store_true",
+        help="Always return exit code 0 (even if errors are found).",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("text", "json", "sarif"),
+        default="text",
+        help="Output format (default: text).",
+    )
+    parser.add_argument("reports", nargs="+", help="JSON reports to combine.")
+    args = parser.parse_args(argv)
+
+    try:
+        success = merge_reports(args.reports, REPORTERS[args.format](sys.stdout))
+    except (OSError, ValueError) as e:
+        parser.error(f"cannot read the report: {e}")
+    if not success and not args.exit_zero:
+        sys.exit(1)
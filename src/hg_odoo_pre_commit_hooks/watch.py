@@ -0,0 +1,373 @@
+"""watch.py
+
+Modo de vigilancia (``--watch PATH``): vuelve a analizar los archivos al
+guardarlos.
+
+Primero analiza todos los archivos Python de las rutas vigiladas y guarda sus
+errores en memoria. Después espera cambios y, pasado un breve intervalo sin
+cambios nuevos (``DEBOUNCE_SECONDS``, para agrupar las escrituras de un mismo
+guardado), analiza solo los archivos modificados e imprime únicamente los
+errores que aparecen (``+``) o desaparecen (``-``).
+
+En Linux los cambios se reciben con inotify (a través de ``ctypes``, sin
+dependencias), de modo que el aviso llega en cuanto el editor cierra el
+archivo. En otros sistemas, o con ``--poll`` (p. ej. en sistemas de archivos
+de red, donde inotify no recibe los cambios), se comparan periódicamente la
+fecha de modificación y el tamaño de los archivos.
+
+También se vigilan los ``pyproject.toml`` de las rutas y de sus directorios
+superiores: al cambiar alguno se olvida la configuración memorizada y se
+vuelven a analizar todos los archivos.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+from hg_odoo_pre_commit_hooks.config import CONFIG_FILE, ConfigError
+from hg_odoo_pre_commit_hooks.discovery import SKIP_DIRS
+
+DEBOUNCE_SECONDS = 0.03
+POLL_SECONDS = 0.25
+
+# Constantes de <sys/inotify.h>.
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_EVENT = struct.Struct("iIII")
+
+
+def _is_python(name):
+    return name.endswith(".py")
+
+
+def _is_config(path):
+    return os.path.basename(path) == CONFIG_FILE
+
+
+def _iter_files(paths, accept):
+    for path in paths:
+        if not os.path.isdir(path):
+            if accept(path):
+                yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS)
+            for name in sorted(files):
+                if accept(name):
+                    yield os.path.join(root, name)
+
+
+def iter_python_files(paths):
+    """Genera los archivos Python de las rutas indicadas (archivos o
+    directorios, recorridos recursivamente)."""
+    return _iter_files(paths, _is_python)
+
+
+def config_directories(paths):
+    """Devuelve los directorios cuya configuración se aplica a las rutas: los
+    de las rutas y todos sus directorios superiores (rutas absolutas)."""
+    directories = set()
+    for path in paths:
+        directory = os.path.abspath(
+            path if os.path.isdir(path) else os.path.dirname(path)
+        )
+        while directory not in directories:
+            directories.add(directory)
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                break
+            directory = parent
+    return sorted(directories)
+
+
+def iter_watched_files(paths):
+    """Genera los archivos que se vigilan: los archivos Python y los
+    ``pyproject.toml`` de las rutas, y los ``pyproject.toml`` (existan o no)
+    de los directorios superiores."""
+    yield from _iter_files(paths, lambda name: _is_python(name) or _is_config(name))
+    for directory in config_directories(paths):
+        yield os.path.join(directory, CONFIG_FILE)
+
+
+class PollingWatcher:
+    """Detecta los cambios comparando ``stat`` de los archivos cada
+    ``interval`` segundos."""
+
+    def __init__(self, paths, interval=POLL_SECONDS):
+        self.paths = paths
+        self.interval = interval
+        self.snapshot = self._snapshot()
+
+    def _snapshot(self):
+        snapshot = {}
+        for path in iter_watched_files(self.paths):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def wait(self, timeout=None):
+        """Espera cambios durante ``timeout`` segundos como máximo.
+
+        Returns:
+            set: Rutas creadas, modificadas o eliminadas (vacío si no hubo
+                cambios), incluidos los ``pyproject.toml``.
+        """
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self._snapshot()
+            changed = {
+                path
+                for path in snapshot.keys() | self.snapshot.keys()
+                if snapshot.get(path) != self.snapshot.get(path)
+            }
+            self.snapshot = snapshot
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+            delay = self.interval
+            if deadline is not None:
+                delay = min(delay, max(deadline - time.monotonic(), 0))
+            time.sleep(delay)
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Detecta los cambios con inotify, vigilando cada directorio.
+
+    Raises:
+        OSError: Si inotify no está disponible.
+    """
+
+    def __init__(self, paths):
+        self.paths = paths
+        name = ctypes.util.find_library("c")
+        libc = ctypes.CDLL(name, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self._libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # Descriptor de vigilancia -> (directorio, si se vigila entero).
+        self.directories = {}
+        # (directorio, nombre) -> ruta de los archivos vigilados sin vigilar
+        # todo su directorio.
+        self.files = {}
+        for path in paths:
+            if os.path.isdir(path):
+                self._add_tree(path)
+            else:
+                directory, name = os.path.split(path)
+                self.files[(directory or ".", name)] = path
+                self._add(directory or ".", False)
+        for directory in config_directories(paths):
+            self._add(directory, False)
+
+    def _add(self, directory, whole=True):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd >= 0:
+            whole = whole or self.directories.get(wd, (None, False))[1]
+            self.directories[wd] = (directory, whole)
+
+    def _add_tree(self, directory):
+        for root, dirs, _files in os.walk(directory):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            self._add(root)
+
+    def _read(self):
+        changed = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                # Se perdieron eventos: se vuelven a analizar todos.
+                changed.update(iter_watched_files(self.paths))
+                continue
+            directory, whole = self.directories.get(wd, (None, False))
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+            if name == CONFIG_FILE and not mask & IN_ISDIR:
+                changed.add(path)
+            elif not whole:
+                if (directory, name) in self.files:
+                    changed.add(self.files[(directory, name)])
+            elif mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and name not in SKIP_DIRS:
+                    self._add_tree(path)
+                    changed.update(iter_watched_files([path]))
+            elif _is_python(name):
+                changed.add(path)
+        return changed
+
+    def wait(self, timeout=None):
+        """Espera cambios durante ``timeout`` segundos como máximo.
+
+        Returns:
+            set: Rutas creadas, modificadas o eliminadas (vacío si no hubo
+                cambios), incluidos los ``pyproject.toml``.
+        """
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None
+            if deadline is not None:
+                remaining = max(deadline - time.monotonic(), 0)
+            ready, _, _ = select.select([self.fd], [], [], remaining)
+            changed = self._read() if ready else set()
+            if changed or not ready:
+                return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+def make_watcher(paths, poll=False):
+    """Devuelve el vigilante de inotify o, si no está disponible o se pide
+    ``poll``, el de sondeo."""
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(paths)
+        except (OSError, AttributeError, TypeError):
+            pass
+    return PollingWatcher(paths)
+
+
+class WatchSession:
+    """Errores de los archivos vigilados, guardados entre análisis.
+
+    Args:
+        check (callable): Función de análisis con la interfaz de
+            ``file_violations``.
+        stream: Salida de los errores.
+        errors: Salida de los errores de lectura, de sintaxis y de
+            configuración; por defecto ``sys.stderr``.
+    """
+
+    def __init__(self, check, stream, errors=None):
+        self.check = check
+        self.stream = stream
+        self.errors = errors or sys.stderr
+        self.results = {}
+
+    def _lines(self, filepath):
+        try:
+            violations = self.check(filepath)
+        except FileNotFoundError:
+            return []
+        except (OSError, SyntaxError, UnicodeDecodeError, ConfigError) as e:
+            self.errors.write(f"{filepath}: cannot check: {e}\n")
+            self.errors.flush()
+            return None
+        return [violation.format(filepath) for violation in violations]
+
+    def start(self, files):
+        """Analiza todos los archivos e imprime sus errores."""
+        output = []
+        for filepath in files:
+            lines = self._lines(filepath)
+            if lines is not None:
+                self.results[filepath] = lines
+                output.extend(lines)
+        self._write(output)
+
+    def update(self, files):
+        """Vuelve a analizar los archivos indicados e imprime los errores que
+        cambiaron.
+
+        Returns:
+            int: Número de errores que cambiaron.
+        """
+
+        output = []
+        for filepath in sorted(files):
+            lines = self._lines(filepath)
+            if lines is None:
+                # Se mantienen los errores anteriores hasta que se pueda
+                # volver a analizar (p. ej. mientras se está editando).
+                continue
+            previous = self.results.pop(filepath, [])
+            if lines:
+                self.results[filepath] = lines
+            output.extend(f"- {line}" for line in previous if line not in lines)
+            output.extend(f"+ {line}" for line in lines if line not in previous)
+        self._write(output)
+        return len(output)
+
+    def _write(self, lines):
+        if lines:
+            self.stream.write("".join(f"{line}\n" for line in lines))
+            self.stream.flush()
+
+
+def watch(
+    paths,
+    check,
+    stream=sys.stdout,
+    watcher=None,
+    debounce=DEBOUNCE_SECONDS,
+    reset=None,
+):
+    """Analiza las rutas y vuelve a analizar los archivos que cambian hasta
+    que se interrumpe con Ctrl+C.
+
+    Los errores de lectura, de sintaxis y de configuración se escriben en
+    ``sys.stderr`` y no detienen la vigilancia.
+
+    Args:
+        paths (list): Archivos o directorios a vigilar.
+        check (callable): Función de análisis con la interfaz de
+            ``file_violations``.
+        stream: Salida de los errores.
+        watcher: Vigilante (``InotifyWatcher`` o ``PollingWatcher``); por
+            defecto el de ``make_watcher``.
+        debounce (float): Segundos sin cambios nuevos que se esperan antes de
+            analizar los archivos modificados.
+        reset (callable): Si se indica, se llama cuando cambia algún
+            ``pyproject.toml`` (p. ej. ``ConfigResolver.clear``) y después se
+            vuelven a analizar todos los archivos.
+    """
+
+    watcher = watcher or make_watcher(paths)
+    session = WatchSession(check, stream)
+    try:
+        session.start(iter_python_files(paths))
+        while True:
+            changed = watcher.wait()
+            while True:
+                more = watcher.wait(debounce)
+                if not more:
+                    break
+                changed |= more
+            if reset is not None and any(_is_config(path) for path in changed):
+                reset()
+                changed |= set(iter_python_files(paths))
+            session.update(path for path in changed if _is_python(path))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
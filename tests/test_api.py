@@ -0,0 +1,150 @@
+import gc
+import glob
+import itertools
+import os
+import statistics
+import subprocess
+import sys
+import tracemalloc
+
+import pytest
+from hg_odoo_pre_commit_hooks.api import (
+    PathResult,
+    Violation,
+    analyze_path,
+    analyze_paths,
+    analyze_source,
+)
+from hg_odoo_pre_commit_hooks.config import ConfigResolver
+from hg_odoo_pre_commit_hooks.discovery import iter_addon_files
+
+from benchmarks.corpus import CorpusSpec, generate_corpus
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(BASE_DIR, "src", "hg_odoo_pre_commit_hooks", "check_method_order.py")
+TEST_REPO = os.path.join(BASE_DIR, "test_repo")
+
+SNIPPET = """
+class Partner(models.Model):
+    _name = "res.partner"
+
+    def action_confirm(self):
+        return True
+
+    def {method}(self):
+        return True
+"""
+
+
+def test_matches_command_line(capsys):
+    """La API encuentra los mismos errores que imprime la línea de órdenes."""
+    files = sorted(glob.glob(os.path.join(TEST_REPO, "**", "*.py"), recursive=True))
+    expected = subprocess.run(
+        [sys.executable, SRC, "--no-cache", *files],
+        capture_output=True,
+        text=True,
+        check=False,
+    ).stdout
+    lines = [v.format(path) for path in files for v in analyze_path(path)]
+    assert "".join(f"{line}\n" for line in lines) == expected
+    assert capsys.readouterr() == ("", "")
+
+
+def test_many_snippets_in_process():
+    """Se analizan miles de fragmentos sin crear procesos."""
+    results = [
+        analyze_source(SNIPPET.format(method=f"write{i % 2 or ''}"), f"s{i}.py")
+        for i in range(2000)
+    ]
+    assert sum(1 for violations in results if violations) == 1000
+    (violation,) = results[0]
+    assert (violation.line, violation.rule) == (8, "method-order")
+    assert analyze_source(SNIPPET.format(method="write").encode()) == results[0]
+
+
+def test_violations_are_immutable():
+    """Los registros Violation son inmutables y no tienen diccionario de instancia."""
+    violations = analyze_source(SNIPPET.format(method="write"))
+    assert len(violations) == 1
+    violation = violations[0]
+    assert isinstance(violation, Violation)
+    assert not hasattr(violation, "__dict__")
+    with pytest.raises(AttributeError):
+        violation.line = 1
+
+
+def test_analyze_path_with_config(tmp_path):
+    """Un ConfigResolver aplica la configuración del pyproject.toml del archivo."""
+    (tmp_path / "pyproject.toml").write_text(
+        '[tool.hg-odoo-pre-commit-hooks]\ncrud-methods = ["archive"]\n'
+    )
+    path = tmp_path / "partner.py"
+    path.write_text(SNIPPET.format(method="archive"))
+    assert not analyze_path(path)
+    assert [v.line for v in analyze_path(path, resolver=ConfigResolver())] == [8]
+
+
+def test_syntax_errors_raise():
+    """El código no válido lanza SyntaxError en lugar de terminar el proceso."""
+    with pytest.raises(SyntaxError):
+        analyze_source("class A(models.Model):\n    def (\n", "broken.py")
+
+
+def test_analyze_paths_streams_results(tmp_path):
+    """analyze_paths devuelve cada resultado antes de leer la siguiente ruta
+    e informa de los errores de cada archivo sin detenerse."""
+    good = tmp_path / "partner.py"
+    good.write_text(SNIPPET.format(method="write"))
+    broken = tmp_path / "broken.py"
+    broken.write_text("class A(models.Model):\n    def (\n")
+    requested = []
+
+    def paths():
+        for path in (good, tmp_path / "missing.py", broken, good):
+            requested.append(path)
+            yield path
+
+    results = analyze_paths(paths())
+    first = next(results)
+    assert requested == [good]
+    assert first == PathResult(str(good), analyze_path(good), None)
+    missing, syntax, last = results
+    assert isinstance(missing.error, FileNotFoundError)
+    assert isinstance(syntax.error, SyntaxError)
+    assert (missing.violations, syntax.violations) == ([], [])
+    assert last == first
+
+
+def test_analyze_paths_memory_is_flat(tmp_path):
+    """La memoria no crece con el número de archivos analizados."""
+    spec = CorpusSpec(addons=4, models=10, out_of_order=2)
+    generate_corpus(str(tmp_path), spec)
+    files = list(iter_addon_files([str(tmp_path)]))
+    passes = 20
+    results = analyze_paths(
+        itertools.islice(itertools.cycle(files), passes * len(files)),
+        resolver=ConfigResolver(),
+    )
+    violations = 0
+    sizes = []
+    tracemalloc.start()
+    try:
+        for index in range(passes):
+            for result in itertools.islice(results, len(files)):
+                violations += len(result.violations)
+            gc.collect()
+            sizes.append(tracemalloc.get_traced_memory()[0])
+            # La primera pasada prepara el resolver y el clasificador.
+            if not index:
+                warm_peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.reset_peak()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert violations == passes * spec.addons * spec.models * spec.out_of_order
+    # Una fuga crece en todas las pasadas; el intérprete solo amplía alguna
+    # de sus tablas internas de vez en cuando.
+    deltas = [sizes[index] - sizes[index - 1] for index in range(1, passes)]
+    assert statistics.median(deltas) < 256
+    assert sizes[-1] - sizes[0] < 1024 * 1024
+    assert peak <= warm_peak + 1024 * 1024
@@ -0,0 +1,47 @@
+import json
+
+import pytest
+from hg_odoo_pre_commit_hooks.check_method_order import file_violations
+from hg_odoo_pre_commit_hooks.discovery import iter_addon_files
+
+from benchmarks import run
+from benchmarks.corpus import CorpusSpec, generate_corpus
+
+
+def test_corpus_expected_violations(tmp_path):
+    """El corpus generado tiene exactamente los miembros desordenados pedidos."""
+    spec = CorpusSpec(addons=2, models=3, out_of_order=2)
+    info = generate_corpus(str(tmp_path), spec)
+    files = list(iter_addon_files([str(tmp_path)]))
+    assert len(files) == info.files
+    assert info.model_files == 6
+    assert sum(len(file_violations(f)) for f in files) == info.violations == 12
+
+
+def test_benchmark_writes_json(tmp_path):
+    """El benchmark guarda sus medidas en JSON."""
+    output = tmp_path / "bench.json"
+    run.main(
+        ["--addons", "1", "--models", "2", "--repeat", "1", "--output", str(output)]
+    )
+    report = json.loads(output.read_text())
+    assert report["corpus"]["model_files"] == 2
+    assert set(report["results"]) == {"in_process", *run.CLI_MODES}
+    assert all(r["files_per_sec"] > 0 for r in report["results"].values())
+
+
+def test_benchmark_without_wait4(tmp_path, monkeypatch):
+    """Sin os.wait4 se espera al subproceso antes de parar el cronómetro."""
+    monkeypatch.delattr(run.os, "wait4", raising=False)
+    info = generate_corpus(str(tmp_path / "addons"), CorpusSpec(addons=1, models=1))
+    result = run.bench_cli(str(tmp_path / "addons"), info, [], str(tmp_path / "cache"))
+    assert result["peak_rss_kib"] is None
+    assert result["files_per_sec"] > 0
+
+
+def test_benchmark_rejects_no_repeats(capsys):
+    """--repeat debe ser al menos 1."""
+    with pytest.raises(SystemExit) as exc_info:
+        run.main(["--repeat", "0"])
+    assert exc_info.value.code == 2
+    assert "--repeat: must be at least 1" in capsys.readouterr().err
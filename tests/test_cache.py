@@ -0,0 +1,81 @@
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+from hg_odoo_pre_commit_hooks import check_method_order
+from hg_odoo_pre_commit_hooks.cache import ResultCache
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(BASE_DIR, "src", "hg_odoo_pre_commit_hooks", "check_method_order.py")
+TEST_REPO = os.path.join(BASE_DIR, "test_repo")
+NOT_ORDERED = os.path.join(TEST_REPO, "method_not_ordered_module", "models")
+
+
+@pytest.fixture(name="model_file")
+def fixture_model_file(tmp_path):
+    path = tmp_path / "several_errors.py"
+    shutil.copy(os.path.join(NOT_ORDERED, "several_errors.py"), path)
+    return str(path)
+
+
+def test_cache_hit_replays_violations(tmp_path, model_file, monkeypatch):
+    """Un acierto de la caché devuelve los errores guardados sin analizar el archivo."""
+    cache = ResultCache.open(str(tmp_path / "cache"))
+    expected = cache.violations(model_file)
+    assert expected == check_method_order.file_violations(model_file)
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("file analyzed again")
+
+    monkeypatch.setattr(check_method_order, "source_violations", fail)
+    assert cache.violations(model_file) == expected
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.close()
+
+
+def test_cache_detects_content_changes(tmp_path, model_file):
+    """Editar un archivo invalida su resultado en la caché."""
+    cache = ResultCache.open(str(tmp_path / "cache"))
+    assert cache.violations(model_file)
+    shutil.copy(
+        os.path.join(TEST_REPO, "method_ordered_module", "models", "model.py"),
+        model_file,
+    )
+    assert not cache.violations(model_file)
+    assert cache.misses == 2
+    cache.close()
+
+
+def test_cache_lru_eviction(tmp_path):
+    """Al pasar del límite de tamaño se descartan los resultados menos usados."""
+    cache_dir = str(tmp_path / "cache")
+    cache = ResultCache.open(cache_dir, max_entries=2)
+    for i in range(4):
+        path = tmp_path / f"file_{i}.py"
+        path.write_text(f"VALUE = {i}\n")
+        cache.violations(str(path))
+    cache.close()
+    cache = ResultCache.open(cache_dir)
+    count = cache.connection.execute("SELECT COUNT(*) FROM results").fetchone()
+    assert count == (2,)
+    cache.close()
+
+
+def test_cli_cache_options(tmp_path, model_file):
+    """--cache-dir guarda los resultados y --no-cache no usa la caché."""
+    cache_dir = tmp_path / "cache"
+    outputs = []
+    for options in (["--cache-dir", str(cache_dir)],) * 2 + (["--no-cache"],):
+        result = subprocess.run(
+            [sys.executable, SRC, *options, model_file],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        assert result.returncode == 1
+        outputs.append(result.stdout)
+    assert outputs[0] == outputs[1] == outputs[2]
+    assert (cache_dir / "results.sqlite3").exists()
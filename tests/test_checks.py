@@ -0,0 +1,124 @@
+import ast
+import glob
+import os
+import subprocess
+import sys
+
+import pytest
+from hg_odoo_pre_commit_hooks import checks
+from hg_odoo_pre_commit_hooks.check_method_order import Violation
+from hg_odoo_pre_commit_hooks.checks import CHECKS, FileContext, register, run_checks
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+SRC_DIR = os.path.join(BASE_DIR, "src", "hg_odoo_pre_commit_hooks")
+TEST_REPO = os.path.join(BASE_DIR, "test_repo")
+
+SOURCE = b"""import odoo.tools
+from odoo import api, fields as f, models
+from . import utils
+
+
+class Partner(models.Model):
+    name = f.Char()
+
+    @api.depends("name")
+    def _compute_display_name(self):
+        pass
+
+    def create(self, vals):
+        return super().create(vals)
+"""
+
+
+def _run(script, *args):
+    return subprocess.run(
+        [sys.executable, os.path.join(SRC_DIR, script), "--no-config", *args],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+
+def test_same_output_as_method_order():
+    """hg-odoo-check informa de lo mismo que odoo-method-order."""
+    files = sorted(glob.glob(os.path.join(TEST_REPO, "**", "*.py"), recursive=True))
+    expected = _run("check_method_order.py", "--no-cache", *files)
+    result = _run("checks.py", *files)
+    assert (result.stdout, result.returncode) == (expected.stdout, 1)
+    assert _run("checks.py", "--list-checks").stdout == "method-order\n"
+    assert "unknown check: nope" in _run("checks.py", "--select", "nope").stderr
+
+
+def test_context_annotations():
+    """El contexto compartido expone el árbol y los modelos del archivo."""
+    context = FileContext("partner.py", SOURCE)
+    assert [model.name for model in context.model_classes] == ["Partner"]
+    assert context.model_classes[0] in context.tree.body
+
+
+def test_checks_read_context_annotations(monkeypatch):
+    """Las comprobaciones registradas leen los alias de los imports y los
+    decoradores, que se calculan una sola vez por archivo."""
+    monkeypatch.setattr(checks, "CHECKS", {})
+    seen = []
+
+    @register("aliases")
+    def aliases_check(context):
+        seen.append((context.import_aliases, context.decorators))
+        return []
+
+    @register("decorators")
+    def decorators_check(context):
+        seen.append((context.import_aliases, context.decorators))
+        return [
+            Violation(member.lineno, f"{member.name}: {', '.join(names)}")
+            for member, names in context.decorators.items()
+            if names
+        ]
+
+    violations = run_checks("partner.py", SOURCE)
+    assert violations == [Violation(10, "_compute_display_name: depends")]
+    assert len(seen) == 2
+    aliases, decorators = seen[0]
+    assert seen[1][0] is aliases
+    assert seen[1][1] is decorators
+    assert aliases == {
+        "odoo": "odoo",
+        "api": "odoo.api",
+        "f": "odoo.fields",
+        "models": "odoo.models",
+        "utils": ".utils",
+    }
+    assert sorted(decorators.values()) == [(), ("depends",)]
+
+
+def test_checks_share_one_parse(monkeypatch):
+    """Todas las comprobaciones registradas reciben el mismo árbol."""
+    parses = []
+    real_parse = ast.parse
+    monkeypatch.setattr(
+        ast, "parse", lambda *args, **kw: parses.append(1) or real_parse(*args, **kw)
+    )
+    monkeypatch.setattr(checks, "CHECKS", dict(CHECKS))
+    method = CHECKS["method-order"]
+    trees = []
+
+    @register("record-tree")
+    def record_tree(context):
+        trees.append(context.tree)
+        return [Violation(1, "recorded")]
+
+    with pytest.raises(ValueError):
+        register("record-tree")(record_tree)
+
+    violations = run_checks("partner.py", SOURCE)
+    assert len(parses) == 1
+    assert violations[-1] == Violation(1, "recorded")
+    assert violations[:-1] == run_checks("partner.py", SOURCE, checks=[method])
+    assert trees[0] is not None
+
+
+def test_prefilter_skips_parse(monkeypatch):
+    """Los archivos que descartan todas las comprobaciones no se analizan."""
+    monkeypatch.setattr(ast, "parse", None)
+    assert not run_checks("data.py", b"VALUES = [1, 2]\n")
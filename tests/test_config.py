@@ -0,0 +1,163 @@
+import os
+import subprocess
+import sys
+
+from hg_odoo_pre_commit_hooks import config
+from hg_odoo_pre_commit_hooks.cache import ResultCache
+from hg_odoo_pre_commit_hooks.config import ConfigResolver
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(BASE_DIR, "src", "hg_odoo_pre_commit_hooks", "check_method_order.py")
+
+CUSTOM_MODEL = """from odoo import models
+
+
+class Partner(CustomModel):
+    _name = "res.partner"
+
+    def action_confirm(self):
+        return True
+
+    def archive(self):
+        return True
+"""
+
+SECTION = "[tool.hg-odoo-pre-commit-hooks]\n"
+
+
+def _write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return str(path)
+
+
+def _run(*args, cwd=None):
+    return subprocess.run(
+        [sys.executable, SRC, "--no-cache", *args],
+        capture_output=True,
+        text=True,
+        check=False,
+        cwd=cwd,
+    )
+
+
+def test_addon_overrides_repository_settings(tmp_path):
+    """El pyproject.toml más cercano sustituye las claves de sus padres."""
+    _write(
+        tmp_path / "pyproject.toml",
+        SECTION + 'models-bases = ["Model", "CustomModel"]\n',
+    )
+    legacy = _write(tmp_path / "legacy" / "models" / "partner.py", CUSTOM_MODEL)
+    addon = _write(tmp_path / "addon" / "models" / "partner.py", CUSTOM_MODEL)
+    _write(
+        tmp_path / "addon" / "pyproject.toml",
+        '[project]\nname = "addon"\n\n' + SECTION + 'crud-methods = ["archive"]\n',
+    )
+
+    result = _run(legacy, addon)
+    assert result.returncode == 1
+    assert result.stdout == (
+        f"{addon}:10: 'archive' (category 'crud_methods') appears out of order. "
+        "Should be before 'action_methods' "
+        "(before 'action_methods->action_confirm:7')\n"
+    )
+    assert not _run("--no-config", legacy, addon).stdout
+
+
+def test_root_stops_inheritance(tmp_path):
+    """Un directorio con root = true ignora la configuración de sus padres."""
+    _write(tmp_path / "pyproject.toml", SECTION + 'models-bases = ["CustomModel"]\n')
+    _write(tmp_path / "addon" / "pyproject.toml", SECTION + "root = true\n")
+    resolver = ConfigResolver()
+    top = resolver.for_file(str(tmp_path / "partner.py"))
+    addon = resolver.for_file(str(tmp_path / "addon" / "models" / "partner.py"))
+    assert top.classifier.models_bases == ("CustomModel",)
+    assert addon.settings == config.DEFAULT_SETTINGS
+
+
+def test_config_files_parsed_once(tmp_path, monkeypatch):
+    """Cada directorio se resuelve una vez, tenga los archivos que tenga."""
+    _write(tmp_path / "pyproject.toml", SECTION + 'crud-methods = ["create"]\n')
+    _write(tmp_path / "a" / "pyproject.toml", SECTION + 'crud-methods = ["write"]\n')
+    calls = []
+    read_settings = config.read_settings
+
+    def counting(path):
+        calls.append(path)
+        return read_settings(path)
+
+    monkeypatch.setattr(config, "read_settings", counting)
+    resolver = ConfigResolver()
+    configs = set()
+    for directory in ("a/models", "a/wizards", "b/models", "a/models"):
+        for i in range(10):
+            path = tmp_path / directory / f"file_{i}.py"
+            configs.add(resolver.for_file(str(path)).digest)
+    assert len(calls) == len(set(calls))
+    assert len(configs) == 2
+
+
+def test_project_name_is_not_a_section(tmp_path, monkeypatch):
+    """Solo se analiza como TOML una tabla tool con el nombre de la sección."""
+    project = tmp_path / "pyproject.toml"
+    _write(project, '[project]\nname = "hg-odoo-pre-commit-hooks"\n')
+    quoted = tmp_path / "quoted" / "pyproject.toml"
+    _write(quoted, '[tool . "hg-odoo-pre-commit-hooks"]\nroot = true\n')
+    parsed = []
+    load_toml = config._load_toml  # pylint: disable=protected-access
+    monkeypatch.setattr(
+        config,
+        "_load_toml",
+        lambda data, path: parsed.append(path) or load_toml(data, path),
+    )
+    assert config.read_settings(str(project)) is None
+    assert config.read_settings(str(quoted)) == {"root": True}
+    assert parsed == [str(quoted)]
+
+
+def test_config_change_invalidates_cache(tmp_path):
+    """Los resultados en caché dependen de la configuración del directorio."""
+    model = _write(tmp_path / "addon" / "partner.py", CUSTOM_MODEL)
+    pyproject = tmp_path / "addon" / "pyproject.toml"
+    _write(pyproject, SECTION + 'models-bases = ["CustomModel"]\n')
+    cache = ResultCache.open(str(tmp_path / "cache"), resolver=ConfigResolver())
+    assert cache.violations(model) == []
+    cache.close()
+
+    _write(
+        pyproject,
+        SECTION + 'models-bases = ["CustomModel"]\ncrud-methods = ["archive"]\n',
+    )
+    cache = ResultCache.open(str(tmp_path / "cache"), resolver=ConfigResolver())
+    assert [v.line for v in cache.violations(model)] == [10]
+    assert cache.misses == 1
+    cache.close()
+
+
+def test_invalid_config(tmp_path):
+    """Los errores de configuración se indican con el archivo que los contiene."""
+    pyproject = _write(tmp_path / "pyproject.toml", SECTION + "unknown = 1\n")
+    model = _write(tmp_path / "partner.py", CUSTOM_MODEL)
+    result = _run(model)
+    assert result.returncode == 2
+    assert f"invalid configuration: {pyproject}: unknown option 'unknown'" in (
+        result.stderr
+    )
+    _write(tmp_path / "pyproject.toml", SECTION + 'expected-order = ["methods"]\n')
+    result = _run("--jobs", "2", model)
+    assert "unknown categories in 'expected-order': methods" in result.stderr
+
+
+def test_directory_memo_is_bounded(tmp_path, monkeypatch):
+    """La memoria por directorio se vacía en lugar de crecer sin límite."""
+    monkeypatch.setattr(config, "MAX_CACHED_DIRECTORIES", 20)
+    resolver = ConfigResolver()
+    depth = len(os.path.abspath(tmp_path).split(os.sep))
+    for index in range(50):
+        directory = tmp_path / f"addon_{index}"
+        directory.mkdir()
+        resolver.for_file(directory / "models.py")
+        assert len(resolver._directories) <= 20 + depth  # pylint: disable=protected-access
+    assert resolver.for_file(tmp_path / "addon_0" / "models.py").settings == dict(
+        config.DEFAULT_SETTINGS
+    )
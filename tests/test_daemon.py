@@ -0,0 +1,97 @@
+import glob
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+from hg_odoo_pre_commit_hooks.client import PROTOCOL_VERSION, request
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+PACKAGE = os.path.join(BASE_DIR, "src", "hg_odoo_pre_commit_hooks")
+SRC = os.path.join(PACKAGE, "check_method_order.py")
+CLIENT = os.path.join(PACKAGE, "client.py")
+TEST_REPO = os.path.join(BASE_DIR, "test_repo")
+FILES = sorted(glob.glob(os.path.join(TEST_REPO, "**", "*.py"), recursive=True))
+
+
+def run(script, *args):
+    return subprocess.run(
+        [sys.executable, script, *args], capture_output=True, text=True, check=False
+    )
+
+
+@pytest.fixture(name="daemon_socket")
+def fixture_daemon_socket(tmp_path):
+    socket_path = str(tmp_path / "daemon.sock")
+    with subprocess.Popen(
+        [sys.executable, SRC, "--daemon", "--socket", socket_path],
+        stderr=subprocess.PIPE,
+    ) as process:
+        try:
+            for _i in range(100):
+                if os.path.exists(socket_path):
+                    break
+                time.sleep(0.05)
+            yield socket_path
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+    assert not os.path.exists(socket_path)
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+def test_client_uses_daemon(daemon_socket):
+    """El cliente imprime los mismos resultados que el análisis en el proceso."""
+    expected = run(SRC, "--no-cache", *FILES)
+    for _i in range(2):
+        result = run(CLIENT, "--socket", daemon_socket, *FILES)
+        assert result.returncode == expected.returncode == 1
+        assert result.stdout == expected.stdout
+    result = run(CLIENT, "--socket", daemon_socket, "--exit-zero", *FILES)
+    assert not result.returncode
+    assert run(SRC, "--daemon", "--socket", daemon_socket).returncode == 2
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+@pytest.mark.parametrize(
+    "payload",
+    [
+        [],
+        1,
+        "x",
+        {"version": 0, "files": []},
+        {"version": PROTOCOL_VERSION, "files": "x"},
+        {"version": PROTOCOL_VERSION, "files": [1]},
+        {"version": PROTOCOL_VERSION, "files": [["a.py"]]},
+        {"version": PROTOCOL_VERSION, "files": [["a.py", None]]},
+    ],
+)
+def test_daemon_rejects_invalid_requests(daemon_socket, payload):
+    """Las peticiones no válidas reciben un error y el servidor sigue activo."""
+    assert set(request(daemon_socket, payload)) == {"error"}
+    valid = {"version": PROTOCOL_VERSION, "files": []}
+    assert request(daemon_socket, valid) == {"results": []}
+
+
+def test_client_falls_back_without_daemon(tmp_path):
+    """Sin servidor, el cliente analiza los archivos por sí mismo."""
+    expected = run(SRC, "--no-cache", *FILES)
+    result = run(CLIENT, "--socket", str(tmp_path / "missing.sock"), *FILES)
+    assert result.returncode == expected.returncode == 1
+    assert result.stdout == expected.stdout
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+def test_daemon_rejects_invalid_json(daemon_socket):
+    """Una línea que no es JSON recibe un error en lugar de ninguna respuesta."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(10)
+        sock.connect(daemon_socket)
+        sock.sendall(b"not json\n")
+        with sock.makefile("rb") as f:
+            assert json.loads(f.readline()) == {"error": "invalid JSON request"}
+    valid = {"version": PROTOCOL_VERSION, "files": []}
+    assert request(daemon_socket, valid) == {"results": []}
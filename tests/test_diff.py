@@ -0,0 +1,111 @@
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+from hg_odoo_pre_commit_hooks.diff import LineIndex, parse_diff, path_key
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(BASE_DIR, "src", "hg_odoo_pre_commit_hooks", "check_method_order.py")
+NOT_ORDERED = os.path.join(BASE_DIR, "test_repo", "method_not_ordered_module", "models")
+
+DIFF = """\
+diff --git a/models/foo.py b/models/foo.py
+--- a/models/foo.py
++++ b/models/foo.py
+@@ -3 +3 @@ import logging
+-old
++new
+@@ -10,0 +11,2 @@ class Foo(models.Model):
++    a = 1
++    b = 2
+@@ -20,3 +21,0 @@ class Foo(models.Model):
+diff --git a/removed.py b/removed.py
+--- a/removed.py
++++ /dev/null
+@@ -1 +0,0 @@
+"""
+
+
+def test_parse_diff(tmp_path):
+    """Los rangos de líneas cambiadas se leen de los bloques del diff unificado."""
+    changes = parse_diff(DIFF, str(tmp_path))
+    assert list(changes) == [path_key(os.path.join(tmp_path, "models", "foo.py"))]
+    index = next(iter(changes.values()))
+    assert (index.starts, index.ends) == ([3, 11, 21], [3, 12, 22])
+
+
+def test_line_index_intersects():
+    """Los rangos solapados se unen y se buscan con búsqueda binaria."""
+    index = LineIndex([(30, 40), (5, 10), (8, 12), (13, 13)])
+    assert (index.starts, index.ends) == ([5, 30], [13, 40])
+    assert index.intersects(1, 5)
+    assert index.intersects(13, 29)
+    assert index.intersects(35, 100)
+    assert not index.intersects(14, 29)
+    assert not index.intersects(41, 50)
+    assert not LineIndex([]).intersects(1, 100)
+
+
+def git(cwd, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git not available")
+def test_diff_limits_reports_to_changed_models(tmp_path):
+    """Solo se informa de los modelos que contienen algún cambio."""
+    # Un directorio "b", para que una ruta sin prefijo también empiece por "b/".
+    (tmp_path / "b").mkdir()
+    path = tmp_path / "b" / "several_errors.py"
+    shutil.copy(os.path.join(NOT_ORDERED, "several_errors.py"), path)
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-q", "-m", "init")
+
+    def run(*options, cwd=tmp_path):
+        return subprocess.run(
+            [sys.executable, SRC, *options, str(path)],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+    unchanged = run("--diff-from", "HEAD")
+    assert not unchanged.returncode
+    assert not unchanged.stdout
+
+    lines = path.read_text().splitlines(keepends=True)
+    lines[2] = "from odoo import api, fields, models  # noqa\n"
+    path.write_text("".join(lines))
+    outside_model = run("--diff-from", "HEAD")
+    assert not outside_model.returncode
+    assert not outside_model.stdout
+
+    lines[-1] = lines[-1].rstrip("\n") + "  # changed\n"
+    path.write_text("".join(lines))
+    assert not run("--diff-staged").stdout
+    git(tmp_path, "add", ".")
+    for option in (["--diff-from", "HEAD"], ["--diff-staged"]):
+        changed = run(*option)
+        assert changed.returncode == 1
+        assert "appears out of order" in changed.stdout
+
+    # La configuración de prefijos del usuario no cambia las rutas leídas del diff.
+    for setting in ("diff.noprefix", "diff.mnemonicPrefix"):
+        git(tmp_path, "config", setting, "true")
+        changed = run("--diff-staged")
+        assert changed.returncode == 1
+        assert "appears out of order" in changed.stdout
+        git(tmp_path, "config", "--unset", setting)
+    # Con diff.relative, git daría las rutas relativas al directorio actual.
+    git(tmp_path, "config", "diff.relative", "true")
+    changed = run("--diff-staged", cwd=tmp_path / "b")
+    assert changed.returncode == 1
+    assert "appears out of order" in changed.stdout
@@ -0,0 +1,68 @@
+import glob
+import os
+import subprocess
+import sys
+
+import pytest
+from hg_odoo_pre_commit_hooks.discovery import iter_addon_files
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(BASE_DIR, "src", "hg_odoo_pre_commit_hooks", "check_method_order.py")
+TEST_REPO = os.path.join(BASE_DIR, "test_repo")
+
+
+def make_addon(path, files=("models/foo.py",)):
+    path.mkdir(parents=True)
+    (path / "__manifest__.py").write_text("{'name': 'Foo'}\n")
+    for name in files:
+        (path / name).parent.mkdir(parents=True, exist_ok=True)
+        (path / name).write_text("")
+
+
+def test_discovers_test_repo():
+    """Se encuentran todos los archivos Python de los addons, en un orden estable."""
+    expected = sorted(glob.glob(os.path.join(TEST_REPO, "**", "*.py"), recursive=True))
+    assert list(iter_addon_files([TEST_REPO])) == expected
+
+
+def test_skips_non_addon_and_ignored_dirs(tmp_path):
+    """Solo se devuelven fuentes de addons; se omiten VCS, venv y node_modules."""
+    (tmp_path / "setup.py").write_text("")
+    make_addon(tmp_path / "repo" / "foo", ("models/foo.py", "tests/test_foo.py"))
+    make_addon(tmp_path / "repo" / ".git" / "bar")
+    make_addon(tmp_path / "repo" / "node_modules" / "bar")
+    make_addon(tmp_path / "env" / "lib" / "bar")
+    (tmp_path / "env" / "pyvenv.cfg").write_text("")
+    found = [os.path.relpath(p, tmp_path) for p in iter_addon_files([tmp_path])]
+    assert found == [
+        os.path.join("repo", "foo", "__manifest__.py"),
+        os.path.join("repo", "foo", "models", "foo.py"),
+        os.path.join("repo", "foo", "tests", "test_foo.py"),
+    ]
+
+
+def test_deduplicates_symlinks_and_repeated_paths(tmp_path):
+    """Los archivos accesibles por varias rutas se devuelven una sola vez."""
+    make_addon(tmp_path / "addons" / "foo")
+    try:
+        os.symlink(tmp_path / "addons" / "foo", tmp_path / "addons" / "foo_link")
+    except (OSError, NotImplementedError):
+        pytest.skip("symlinks not supported")
+    found = list(iter_addon_files([tmp_path / "addons", tmp_path / "addons"]))
+    assert len(found) == 2
+
+
+def test_cli_addons_path():
+    """--addons-path analiza los mismos archivos que si se indican uno a uno."""
+    files = sorted(glob.glob(os.path.join(TEST_REPO, "**", "*.py"), recursive=True))
+    explicit = subprocess.run(
+        [sys.executable, SRC, *files], capture_output=True, text=True, check=False
+    )
+    discovered = subprocess.run(
+        [sys.executable, SRC, "--addons-path", f"{TEST_REPO},{TEST_REPO}"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert discovered.returncode == explicit.returncode == 1
+    assert discovered.stdout == explicit.stdout
@@ -0,0 +1,86 @@
+import glob
+import io
+import os
+import subprocess
+import sys
+
+from hg_odoo_pre_commit_hooks import client
+from hg_odoo_pre_commit_hooks.discovery import iter_file_list
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(BASE_DIR, "src", "hg_odoo_pre_commit_hooks", "check_method_order.py")
+TEST_REPO = os.path.join(BASE_DIR, "test_repo")
+FILES = sorted(glob.glob(os.path.join(TEST_REPO, "**", "*.py"), recursive=True))
+
+
+def _check(*args, stdin=None):
+    return subprocess.run(
+        [sys.executable, SRC, "--no-cache", *args],
+        input=stdin,
+        capture_output=True,
+        check=False,
+    )
+
+
+def test_file_lists_match_positional_files(tmp_path):
+    """@argfile y --files-from analizan los mismos archivos que los argumentos."""
+    expected = _check(*FILES)
+    assert expected.returncode == 1
+
+    argfile = tmp_path / "args.txt"
+    argfile.write_text("--exit-zero\n" + "\n".join(FILES) + "\n")
+    result = _check(f"@{argfile}")
+    assert (result.stdout, result.returncode) == (expected.stdout, 0)
+
+    nul = _check(
+        "--files-from", "-", "--null", stdin=b"\0".join(map(os.fsencode, FILES))
+    )
+    assert (nul.stdout, nul.returncode) == (expected.stdout, 1)
+
+    listing = tmp_path / "files.txt"
+    listing.write_bytes(b"".join(os.fsencode(f) + b"\r\n" for f in FILES))
+    half = len(FILES) // 2
+    mixed = _check(*FILES[:half], "--files-from", str(listing), "-j", "2")
+    assert mixed.stdout == _check(*FILES[:half]).stdout + expected.stdout
+
+
+def test_files_from_errors(tmp_path):
+    """Se informa del mal uso de --files-from."""
+    assert b"--null requires --files-from" in _check("--null", *FILES).stderr
+    missing = _check("--files-from", str(tmp_path / "missing.txt"))
+    assert missing.returncode == 2
+    assert b"argument --files-from" in missing.stderr
+    empty = _check("--files-from", "-", stdin=b"")
+    assert (empty.stdout, empty.returncode) == (b"", 0)
+
+
+def test_iter_file_list_across_chunks():
+    """Las rutas partidas entre bloques leídos se vuelven a unir."""
+    data = b"a.py\0dir/b.py\0\0c \xc3\xa9.py"
+    items = list(iter_file_list(io.BytesIO(data), b"\0", chunk_size=3))
+    assert items == ["a.py", "dir/b.py", "c é.py"]
+    lines = list(iter_file_list(io.BytesIO(b"a.py\r\n\nb.py\r\n"), chunk_size=2))
+    assert lines == ["a.py", "b.py"]
+
+
+def test_client_expands_argfiles(tmp_path):
+    """El cliente del servidor lee los @argfiles en lugar de analizar él mismo."""
+    argfile = tmp_path / "args.txt"
+    argfile.write_text("--exit-zero\na.py\n")
+    parse_args = client._parse_args  # pylint: disable=protected-access
+    files, exit_zero, _socket = parse_args([f"@{argfile}", "b.py"])
+    assert (files, exit_zero) == (["a.py", "b.py"], True)
+    assert parse_args([f"@{tmp_path / 'missing.txt'}"]) is None
+
+
+def test_files_from_is_closed(tmp_path):
+    """El archivo de --files-from se cierra al terminar."""
+    listing = tmp_path / "files.txt"
+    listing.write_bytes(b"".join(os.fsencode(f) + b"\n" for f in FILES))
+    result = subprocess.run(
+        [sys.executable, "-X", "dev", SRC, "--no-cache", "--files-from", str(listing)],
+        capture_output=True,
+        check=False,
+    )
+    assert result.returncode == 1
+    assert b"ResourceWarning" not in result.stderr
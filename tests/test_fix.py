@@ -0,0 +1,185 @@
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+from hg_odoo_pre_commit_hooks.check_method_order import file_violations
+from hg_odoo_pre_commit_hooks.fixer import fix_source, write_atomic
+
+from benchmarks.corpus import CorpusSpec, generate_corpus
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(BASE_DIR, "src", "hg_odoo_pre_commit_hooks", "check_method_order.py")
+TEST_REPO = os.path.join(BASE_DIR, "test_repo")
+
+SOURCE = b"""# Header comment
+from odoo import api, fields, models
+
+
+class Partner(models.Model):
+    \"\"\"Docstring.\"\"\"
+
+    _name = "res.partner"
+
+    # Confirms the partner.
+    def action_confirm(self):
+        return True
+
+    @api.model
+    def create(self, vals):
+        return super().create(vals)
+
+    name = fields.Char()  # trailing comment
+
+    # Default value.
+    @api.model
+    def _default_name(self):
+        return "name"
+
+
+def helper():
+    return 1
+"""
+
+FIXED = b"""# Header comment
+from odoo import api, fields, models
+
+
+class Partner(models.Model):
+    \"\"\"Docstring.\"\"\"
+
+    _name = "res.partner"
+
+    name = fields.Char()  # trailing comment
+
+    # Default value.
+    @api.model
+    def _default_name(self):
+        return "name"
+
+    @api.model
+    def create(self, vals):
+        return super().create(vals)
+
+    # Confirms the partner.
+    def action_confirm(self):
+        return True
+
+
+def helper():
+    return 1
+"""
+
+
+def _check(*args):
+    return subprocess.run(
+        [sys.executable, SRC, "--no-cache", *args],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+
+def test_fix_source_moves_decorators_and_comments():
+    """Los miembros se mueven con sus decoradores y los comentarios de encima."""
+    assert fix_source(SOURCE) == FIXED
+    assert fix_source(FIXED) is FIXED
+
+
+def test_fix_keeps_body_comments_in_place():
+    """Los comentarios con más sangría que el miembro son parte de su cuerpo
+    y no se mueven con el miembro siguiente."""
+    source = b"""from odoo import models
+
+
+class Partner(models.Model):
+    def action_confirm(self):
+        return True
+        # inner trailing comment
+
+    # The model name.
+    _name = "res.partner"
+"""
+    assert fix_source(source) == (
+        b"""from odoo import models
+
+
+class Partner(models.Model):
+    # The model name.
+    _name = "res.partner"
+
+    def action_confirm(self):
+        return True
+        # inner trailing comment
+"""
+    )
+
+
+def test_fix_keeps_line_endings():
+    """Se conservan los archivos CRLF y los que no terminan en salto de línea."""
+    crlf = SOURCE.replace(b"\n", b"\r\n")
+    assert fix_source(crlf) == FIXED.replace(b"\n", b"\r\n")
+    class_only = SOURCE[: SOURCE.index(b"\n\n\ndef helper")]
+    assert fix_source(class_only) == FIXED[: FIXED.index(b"\n\n\ndef helper")]
+
+
+def test_fix_addons_in_one_pass(tmp_path):
+    """Una sola pasada de --fix no deja errores de orden en los addons."""
+    addons = tmp_path / "addons"
+    shutil.copytree(TEST_REPO, addons)
+    generate_corpus(str(addons), CorpusSpec(addons=2, models=3, out_of_order=2))
+    ordered = addons / "method_ordered_module" / "models" / "model.py"
+    mtime = ordered.stat().st_mtime_ns
+
+    result = _check("--fix", "--addons-path", str(addons))
+    assert result.returncode == 1
+    assert result.stderr.count("Fixed ") == 19
+    # Solo el archivo con dos modelos mantiene un error que no se puede corregir.
+    multiple = addons / "method_not_ordered_module" / "models" / "multiple_models.py"
+    assert result.stdout == (
+        f"{multiple}: ERROR: Multiple Odoo models found in the same file (2 classes).\n"
+    )
+    assert ordered.stat().st_mtime_ns == mtime
+
+    second = _check("--fix", "--addons-path", str(addons))
+    assert second.stdout == result.stdout
+    assert "Fixed" not in second.stderr
+
+
+def test_fix_only_moves_lines(tmp_path):
+    """Corregir un archivo solo mueve líneas completas del cuerpo del modelo."""
+    path = tmp_path / "model.py"
+    shutil.copy(
+        os.path.join(
+            TEST_REPO, "method_not_ordered_module", "models", "init_method.py"
+        ),
+        path,
+    )
+    original = path.read_bytes()
+    assert file_violations(str(path))
+    _check("--fix", str(path))
+    assert not file_violations(str(path))
+    fixed = path.read_bytes()
+    assert sorted(fixed.splitlines()) == sorted(original.splitlines())
+
+
+def test_write_atomic(tmp_path, monkeypatch):
+    """Los archivos se sustituyen enteros, conservan sus permisos y no cambian
+    si falla la escritura."""
+    path = tmp_path / "model.py"
+    path.write_bytes(b"old\n")
+    path.chmod(0o640)
+    write_atomic(str(path), b"new\n")
+    assert path.read_bytes() == b"new\n"
+    assert path.stat().st_mode & 0o777 == 0o640
+    assert os.listdir(tmp_path) == ["model.py"]
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(OSError, match="disk full"):
+        write_atomic(str(path), b"partial")
+    assert path.read_bytes() == b"new\n"
+    assert os.listdir(tmp_path) == ["model.py"]
@@ -0,0 +1,80 @@
+import json
+import os
+import subprocess
+import sys
+
+from hg_odoo_pre_commit_hooks.check_method_order import file_violations
+from hg_odoo_pre_commit_hooks.reporters import REPORTERS
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(BASE_DIR, "src", "hg_odoo_pre_commit_hooks", "check_method_order.py")
+NOT_ORDERED = os.path.join(BASE_DIR, "test_repo", "method_not_ordered_module")
+
+
+def _run(*args):
+    return subprocess.run(
+        [sys.executable, SRC, "--no-cache", *args, "--addons-path", NOT_ORDERED],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+
+def test_json_matches_text():
+    """El informe JSON tiene un registro por cada línea del informe de texto."""
+    text = _run().stdout.splitlines()
+    result = _run("--format", "json")
+    assert result.returncode == 1
+    records = json.loads(result.stdout)
+    assert len(records) == len(text) > 0
+    for record, line in zip(records, text, strict=True):
+        prefix = f"{record['file']}:{record['line']}: "
+        if record["line"] is None:
+            prefix = f"{record['file']}: "
+            assert record["rule"] == "multiple-models"
+        assert line == prefix + record["message"]
+
+
+def test_sarif_report():
+    """El informe SARIF tiene un resultado con su ubicación por cada error."""
+    text = _run().stdout.splitlines()
+    document = json.loads(_run("--format", "sarif").stdout)
+    assert document["version"] == "2.1.0"
+    (run,) = document["runs"]
+    rule_ids = {rule["id"] for rule in run["tool"]["driver"]["rules"]}
+    assert len(run["results"]) == len(text)
+    for result in run["results"]:
+        assert result["ruleId"] in rule_ids
+        location = result["locations"][0]["physicalLocation"]
+        assert location["artifactLocation"]["uri"].endswith(".py")
+
+
+def test_empty_reports(tmp_path):
+    """Los informes sin errores también son documentos válidos."""
+    model = tmp_path / "empty.py"
+    model.write_text("VALUE = 1\n")
+    args = [sys.executable, SRC, "--no-cache", "--format"]
+    json_output = subprocess.check_output([*args, "json", str(model)], text=True)
+    assert json.loads(json_output) == []
+    sarif = json.loads(subprocess.check_output([*args, "sarif", str(model)]))
+    assert sarif["runs"][0]["results"] == []
+
+
+class _Stream:
+    def __init__(self):
+        self.writes = []
+
+    def write(self, text):
+        self.writes.append(text)
+
+
+def test_one_write_per_file():
+    """Los informes escriben de una vez los errores de cada archivo."""
+    filepath = os.path.join(NOT_ORDERED, "models", "several_errors.py")
+    violations = file_violations(filepath)
+    assert len(violations) > 1
+    for name in ("text", "json"):
+        stream = _Stream()
+        reporter = REPORTERS[name](stream)
+        reporter.add(filepath, violations)
+        assert len(stream.writes) == 1
@@ -0,0 +1,131 @@
+import os
+import shutil
+
+import pytest
+from hg_odoo_pre_commit_hooks import index as index_module
+from hg_odoo_pre_commit_hooks.index import ModelIndex, main
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+TEST_REPO = os.path.join(BASE_DIR, "test_repo")
+
+SALE = """from odoo import api, fields, models
+
+
+class SaleOrder(models.Model):
+    _name = "sale.order"
+
+    name = fields.Char()
+
+    @api.model
+    def create(self, vals):
+        return super().create(vals)
+"""
+
+SALE_EXTENSION = """from odoo import api, models
+
+
+class SaleOrder(models.Model):
+    _inherit = "sale.order"
+
+    def create(self, vals):
+        return super().create(vals)
+
+    def action_confirm(self):
+        return True
+"""
+
+MIXIN = """from odoo import models
+
+
+class Report(models.AbstractModel):
+    _name = "sale.report.mixin"
+    _inherit = ["sale.order", "mail.thread"]
+
+    def create(self, vals):
+        return super().create(vals)
+"""
+
+
+def _addon(root, name, files):
+    addon = root / name
+    (addon / "models").mkdir(parents=True)
+    (addon / "__manifest__.py").write_text("{}\n")
+    for filename, content in files.items():
+        (addon / "models" / filename).write_text(content)
+    return addon
+
+
+@pytest.fixture(name="addons")
+def fixture_addons(tmp_path):
+    root = tmp_path / "addons"
+    _addon(root, "sale", {"sale_order.py": SALE})
+    _addon(root, "sale_ext", {"sale_order.py": SALE_EXTENSION, "mixin.py": MIXIN})
+    return root
+
+
+def _index(tmp_path):
+    return ModelIndex.open(str(tmp_path / "index"))
+
+
+def _update(index, root):
+    from hg_odoo_pre_commit_hooks.discovery import iter_addon_files
+
+    return index.update(iter_addon_files([str(root)]), [str(root)])
+
+
+def test_overrides_across_files(tmp_path, addons):
+    """Se encuentran las sobrescrituras de un método en todas las clases del modelo."""
+    index = _index(tmp_path)
+    stats = _update(index, addons)
+    assert (stats.indexed, stats.errors) == (5, 0)
+    overrides = index.overrides("sale.order", "create")
+    assert [(os.path.relpath(r.path, addons), r.line) for r in overrides] == [
+        ("sale/models/sale_order.py", 10),
+        ("sale_ext/models/mixin.py", 8),
+        ("sale_ext/models/sale_order.py", 7),
+    ]
+    assert {r.category for r in overrides} == {"crud_methods"}
+    (mixin,) = (m for m in index.models("sale.order") if m.name != "sale.order")
+    assert mixin.inherit == ("sale.order", "mail.thread")
+    assert index.overrides("sale.order", "action_confirm")[0].model == "sale.order"
+    index.close()
+
+
+def test_update_only_changed_files(tmp_path, addons, monkeypatch):
+    """Los archivos sin cambios no se vuelven a analizar y los eliminados se olvidan."""
+    index = _index(tmp_path)
+    _update(index, addons)
+    parsed = []
+    extract_models = index_module.extract_models
+
+    def counting(source, filepath, classifier=None):
+        parsed.append(os.path.basename(filepath))
+        return extract_models(source, filepath, classifier)
+
+    monkeypatch.setattr(index_module, "extract_models", counting)
+    stats = _update(index, addons)
+    assert (stats.indexed, stats.removed, parsed) == (0, 0, [])
+
+    extension = addons / "sale_ext" / "models" / "sale_order.py"
+    extension.write_text(SALE_EXTENSION.replace("def create", "def write"))
+    os.remove(addons / "sale_ext" / "models" / "mixin.py")
+    stats = _update(index, addons)
+    assert (stats.indexed, stats.removed) == (1, 1)
+    assert parsed == ["sale_order.py"]
+    assert len(index.overrides("sale.order", "create")) == 1
+    index.close()
+
+
+def test_cli(tmp_path, capsys):
+    """La línea de órdenes indexa los addons y responde a las consultas."""
+    root = tmp_path / "addons"
+    shutil.copytree(TEST_REPO, root)
+    index_dir = str(tmp_path / "index")
+    main(["--index-dir", index_dir, "update", "--addons-path", str(root)])
+    assert "0 with errors" in capsys.readouterr().out
+    main(["--index-dir", index_dir, "overrides", "foo.model._default_name"])
+    out = capsys.readouterr().out
+    ordered = root / "method_ordered_module" / "models" / "model.py"
+    assert (
+        f"{ordered}:37: FooModel (foo.model) _default_name [default_methods]\n" in out
+    )
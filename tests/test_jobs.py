@@ -0,0 +1,90 @@
+import glob
+import os
+import subprocess
+import sys
+from concurrent.futures import Future
+
+from hg_odoo_pre_commit_hooks.parallel import WINDOW_PER_JOB, iter_results
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(BASE_DIR, "src", "hg_odoo_pre_commit_hooks", "check_method_order.py")
+TEST_REPO = os.path.join(BASE_DIR, "test_repo")
+FILES = sorted(glob.glob(os.path.join(TEST_REPO, "**", "*.py"), recursive=True))
+
+
+def run_validator(*args):
+    return subprocess.run(
+        [sys.executable, SRC, *args],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+
+def test_jobs_output_matches_serial():
+    """La ejecución en paralelo debe imprimir la misma salida, en el mismo orden."""
+    serial = run_validator(*FILES)
+    for jobs in ("2", "auto"):
+        parallel = run_validator("--jobs", jobs, *FILES)
+        assert parallel.returncode == serial.returncode == 1
+        assert parallel.stdout == serial.stdout
+
+
+def test_jobs_ordered_module_passes():
+    """La ejecución en paralelo no debe dar error con los archivos ordenados."""
+    files = glob.glob(os.path.join(TEST_REPO, "method_ordered_module", "**", "*.py"))
+    result = run_validator("--jobs", "2", *files)
+    assert not result.returncode
+    assert not result.stdout.strip()
+
+
+def test_jobs_invalid_value():
+    """Un valor de --jobs no válido es un error de uso."""
+    result = run_validator("--jobs", "0", FILES[0])
+    assert result.returncode == 2
+    assert "--jobs" in result.stderr
+
+
+class _RecordingExecutor:
+    """Ejecuta cada archivo al enviarlo y guarda el orden de los envíos."""
+
+    submitted = []
+
+    def __init__(self, **_kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def submit(self, function, filepath):
+        self.submitted.append(filepath)
+        future = Future()
+        future.set_result(function(filepath))
+        return future
+
+
+def test_jobs_submit_largest_first(tmp_path, monkeypatch):
+    """Dentro de cada ventana los archivos se envían de mayor a menor tamaño y
+    los resultados se devuelven en el orden de entrada."""
+    monkeypatch.setattr(_RecordingExecutor, "submitted", [])
+    monkeypatch.setattr(
+        "hg_odoo_pre_commit_hooks.parallel.ProcessPoolExecutor", _RecordingExecutor
+    )
+    files = []
+    for index in range(40):
+        path = tmp_path / f"file_{index:02}.py"
+        path.write_text("x = 1\n" * ((index * 7) % 40 + 1))
+        files.append(str(path))
+
+    results = [path for path, _violations, _stats in iter_results(files, 2)]
+    assert results == files
+    window = 2 * WINDOW_PER_JOB
+    submitted = _RecordingExecutor.submitted
+    for start in range(0, len(files), window):
+        batch = submitted[start : start + window]
+        assert sorted(batch) == files[start : start + window]
+        sizes = [os.path.getsize(path) for path in batch]
+        assert sizes == sorted(sizes, reverse=True)
@@ -0,0 +1,225 @@
+import ast
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+from hg_odoo_pre_commit_hooks.check_method_order import source_violations
+from hg_odoo_pre_commit_hooks.lsp import Document, MessageReader, write_message
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+LSP = os.path.join(BASE_DIR, "src", "hg_odoo_pre_commit_hooks", "lsp.py")
+URI = "file:///tmp/partner.py"
+
+SOURCE = """from odoo import api, fields, models
+
+
+class Partner(models.Model):
+    _name = "res.partner"
+
+    name = fields.Char()
+
+    def action_confirm(self):
+        return True
+
+    # Creates the partner.
+    @api.model
+    def create(self, vals):
+        return super().create(vals)
+"""
+
+
+def _apply(text, edits):
+    """Aplica los cambios de texto LSP (texto ASCII) como lo haría un editor."""
+    lines = io.StringIO(text, newline="").readlines()
+    offsets = [0]
+    for line in lines:
+        offsets.append(offsets[-1] + len(line))
+
+    def offset(position):
+        return offsets[position["line"]] + position["character"]
+
+    for edit in sorted(edits, key=lambda e: offset(e["range"]["start"]), reverse=True):
+        start, end = offset(edit["range"]["start"]), offset(edit["range"]["end"])
+        text = text[:start] + edit["newText"] + text[end:]
+    return text
+
+
+def _change(line, character, end_line, end_character, text):
+    return {
+        "range": {
+            "start": {"line": line, "character": character},
+            "end": {"line": end_line, "character": end_character},
+        },
+        "text": text,
+    }
+
+
+def test_incremental_changes():
+    """Los cambios incrementales usan columnas UTF-16 y cualquier salto de línea."""
+    document = Document(URI, "a = 'é😀x'\r\nb = 1\n")
+    document.apply_change(_change(0, 8, 0, 9, "y"))
+    document.apply_change(_change(1, 4, 2, 0, "2\nc = 3\n"))
+    assert document.text == "a = 'é😀y'\r\nb = 2\nc = 3\n"
+    document.apply_change({"text": "new"})
+    assert document.text == "new"
+
+
+def test_only_edited_class_is_parsed(monkeypatch):
+    """Al volver a analizar solo se analizan las clases cuyo texto cambió."""
+    text = SOURCE + "\n\n" + SOURCE.split("\n\n\n")[1].replace("Partner", "Other")
+    document = Document(URI, text)
+    first = document.analyze()
+    assert [v.rule for v in first] == ["multiple-models"] + ["method-order"] * 2
+    parses = []
+    real_parse = ast.parse
+    monkeypatch.setattr(
+        ast, "parse", lambda *args, **kw: parses.append(1) or real_parse(*args, **kw)
+    )
+    # Añade una línea antes de la primera clase: se mueven las dos, cambia una.
+    document.apply_change(_change(1, 0, 1, 0, "\n"))
+    document.apply_change(_change(9, 4, 9, 4, "# comment\n    "))
+    shifted = document.analyze()
+    assert len(parses) == 1
+    expected = source_violations(document.text.encode(), "partner.py")
+    assert shifted == expected
+    assert [v.line for v in shifted[1:]] == [v.line + 2 for v in first[1:]]
+
+
+def test_code_action_moves_member():
+    """La corrección rápida mueve el miembro delante de la categoría siguiente."""
+    document = Document(URI, SOURCE)
+    (violation,) = document.analyze()
+    assert violation.line == 14
+    assert not document.code_actions(4)
+    (action,) = document.code_actions(violation.line - 1)
+    assert action["title"] == "Move 'create' before 'action_confirm'"
+    fixed = _apply(SOURCE, action["edit"]["changes"][URI])
+    assert not source_violations(fixed.encode(), "partner.py")
+    assert fixed.index("# Creates") < fixed.index("@api.model")
+    assert fixed.index("def create") < fixed.index("def action_confirm")
+    assert sorted(fixed.splitlines()) == sorted(SOURCE.splitlines())
+
+    unterminated = SOURCE.rstrip("\n")
+    document = Document(URI, unterminated)
+    document.analyze()
+    (action,) = document.code_actions(13)
+    fixed = _apply(unterminated, action["edit"]["changes"][URI])
+    assert fixed.endswith("return True")
+    assert not source_violations(fixed.encode(), "partner.py")
+
+
+def test_large_file_stays_interactive():
+    """Un cambio de una línea en un modelo de 5000 líneas se analiza rápido."""
+    methods = "".join(
+        f"    def _method_{i}(self):\n        value = {i}\n        return value\n\n"
+        for i in range(1250)
+    )
+    text = SOURCE + "\n" + methods
+    assert text.count("\n") > 5000
+    document = Document(URI, text)
+    document.analyze()
+    start = time.perf_counter()
+    document.apply_change(_change(30, 16, 30, 16, "1"))
+    violations = document.analyze()
+    elapsed = time.perf_counter() - start
+    assert [v.line for v in violations] == [14]
+    assert elapsed < 0.5
+
+
+def _send(process, message):
+    write_message(process.stdin, {"jsonrpc": "2.0", **message})
+
+
+def test_server_session():
+    """Un cliente recibe diagnósticos al abrir y editar un documento."""
+    with subprocess.Popen(
+        [sys.executable, LSP, "--no-config"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+    ) as process:
+        reader = MessageReader(process.stdout.fileno())
+        try:
+            _send(process, {"id": 1, "method": "initialize", "params": {}})
+            response = reader.read(10)
+            assert response["result"]["capabilities"]["textDocumentSync"]["change"] == 2
+            _send(
+                process,
+                {
+                    "method": "textDocument/didOpen",
+                    "params": {"textDocument": {"uri": URI, "text": SOURCE}},
+                },
+            )
+            published = reader.read(10)["params"]
+            assert [d["range"]["start"]["line"] for d in published["diagnostics"]] == [
+                13
+            ]
+
+            # Renombrar create a un método privado corrige el orden.
+            for character in "_do":
+                _send(
+                    process,
+                    {
+                        "method": "textDocument/didChange",
+                        "params": {
+                            "textDocument": {"uri": URI},
+                            "contentChanges": [_change(13, 8, 13, 8, character)],
+                        },
+                    },
+                )
+            published = reader.read(10)["params"]
+            assert published["diagnostics"] == []
+            _send(process, {"id": 2, "method": "unknown/method"})
+            assert reader.read(10)["error"]["code"] == -32601
+            # Los parámetros mal formados no detienen el servidor.
+            _send(process, {"method": "textDocument/didOpen", "params": {"uri": URI}})
+            _send(process, {"id": 3, "method": "textDocument/codeAction", "params": {}})
+            assert reader.read(10)["error"]["code"] == -32602
+            # Un cuerpo que no es JSON se descarta con un error de análisis.
+            process.stdin.write(b"Content-Length: 7\r\n\r\ngarbage")
+            process.stdin.flush()
+            error = reader.read(10)
+            assert error["id"] is None
+            assert error["error"]["code"] == -32700
+            _send(process, {"id": 4, "method": "shutdown"})
+            assert reader.read(10) == {
+                "jsonrpc": "2.0",
+                "id": 4,
+                "result": None,
+            }
+            _send(process, {"method": "exit"})
+            assert not process.wait(10)
+        finally:
+            process.kill()
+
+
+def test_messages_roundtrip():
+    """Los mensajes llevan una cabecera Content-Length."""
+    read_fd, write_fd = os.pipe()
+    with os.fdopen(write_fd, "wb") as stream:
+        write_message(stream, {"id": 1, "text": "é"})
+        write_message(stream, {"id": 2})
+    reader = MessageReader(read_fd)
+    assert reader.read(1) == json.loads('{"id": 1, "text": "é"}')
+    assert reader.read(1) == {"id": 2}
+    assert reader.read(1) is None
+    os.close(read_fd)
+
+
+def test_reader_drops_malformed_messages():
+    """Los mensajes mal formados se descartan sin perder los siguientes."""
+    read_fd, write_fd = os.pipe()
+    with os.fdopen(write_fd, "wb") as stream:
+        stream.write(b"Content-Length: x\r\n\r\n")
+        stream.write(b"Content-Length: 4\r\n\r\n{id:")
+        write_message(stream, {"id": 1})
+    reader = MessageReader(read_fd)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            reader.read(1)
+    assert reader.read(1) == {"id": 1}
+    assert reader.read(1) is None
+    os.close(read_fd)
@@ -0,0 +1,141 @@
+import itertools
+import os
+import random
+import subprocess
+import sys
+
+from hg_odoo_pre_commit_hooks.check_method_order import (
+    EXPECTED_ORDER,
+    Classifier,
+    Member,
+    minimal_order_violations,
+    order_violations,
+)
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(BASE_DIR, "src", "hg_odoo_pre_commit_hooks", "check_method_order.py")
+MINIMAL = Classifier(minimal=True)
+
+MODEL = """
+from odoo import api, models
+
+
+class SaleOrder(models.Model):
+    _name = "sale.order"
+
+    def action_confirm(self):
+        return True
+
+    @api.onchange("partner_id")
+    def _onchange_partner(self):
+        pass
+
+    def create(self, vals):
+        return super().create(vals)
+
+    def write(self, vals):
+        return super().write(vals)
+"""
+
+
+def _members(categories):
+    return [Member(cat, line, f"m{line}") for line, cat in enumerate(categories, 1)]
+
+
+def _longest_sorted(ranks):
+    """Longitud de la subsecuencia no decreciente más larga, por fuerza bruta."""
+    for size in range(len(ranks), 0, -1):
+        for combination in itertools.combinations(ranks, size):
+            if list(combination) == sorted(combination):
+                return size
+    return 0
+
+
+def _apply_moves(members, violations):
+    """Mueve cada miembro reportado junto al miembro indicado en su mensaje;
+    los miembros movidos al mismo sitio se ordenan por categoría."""
+    ranks = {cat: index for index, cat in enumerate(EXPECTED_ORDER)}
+    moved = {v.line: v.message for v in violations}
+    kept = [m.line for m in members if m.line not in moved]
+    keys = {line: (index, 0) for index, line in enumerate(kept)}
+    for member in members:
+        if member.line in moved:
+            target = moved[member.line].partition("Move it ")[2]
+            where, _, anchor = target.partition(" ")
+            index = kept.index(int(anchor.strip("'").rpartition(":")[2]))
+            offset = 0.5 if where == "after" else -0.5
+            keys[member.line] = (index + offset, ranks[member.category])
+    return sorted(members, key=lambda m: keys[m.line])
+
+
+def test_one_early_member_is_the_only_violation():
+    """Un método de acción adelantado se reporta una vez y no cada miembro posterior."""
+    members = _members(
+        ["action_methods", "onchange_methods", "crud_methods", "crud_methods"]
+    )
+    assert len(order_violations(members)) == 3
+    violations = order_violations(members, MINIMAL)
+    assert len(violations) == 1
+    violation = violations[0]
+    assert violation.line == 1
+    assert violation.rule == "method-order"
+    assert violation.message == (
+        "'m1' (category 'action_methods') appears out of order. "
+        "Move it after 'crud_methods->m4:4'"
+    )
+
+
+def test_minimal_moves_sort_the_class():
+    """Los miembros reportados son un conjunto mínimo, y moverlos a su sitio
+    ordena la clase."""
+    rng = random.Random(0)
+    ranks = {cat: index for index, cat in enumerate(EXPECTED_ORDER)}
+    for _ in range(300):
+        members = _members(
+            rng.choice(EXPECTED_ORDER[:5]) for _ in range(rng.randint(1, 9))
+        )
+        violations = minimal_order_violations(members)
+        member_ranks = [ranks[m.category] for m in members]
+        assert len(violations) == len(members) - _longest_sorted(member_ranks)
+        order = [ranks[m.category] for m in _apply_moves(members, violations)]
+        assert order == sorted(order)
+
+
+def test_unknown_categories_are_still_reported():
+    """Las categorías desconocidas se reportan y la subsecuencia las ignora."""
+    members = [
+        Member("crud_methods", 1, "write"),
+        Member("custom", 2, "helper"),
+        Member("field_declarations", 3, "name"),
+    ]
+    messages = [v.message for v in order_violations(members, MINIMAL)]
+    assert messages[1] == "Unknown category 'custom' in 'helper'"
+    assert len(messages) == 2
+
+
+def test_report_setting(tmp_path):
+    """report = "minimal" en pyproject.toml activa el modo."""
+    path = tmp_path / "sale_order.py"
+    path.write_text(MODEL)
+
+    def run():
+        return subprocess.run(
+            [sys.executable, SRC, "--no-cache", str(path)],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+    assert len(run().stdout.splitlines()) == 3
+    config = tmp_path / "pyproject.toml"
+    config.write_text('[tool.hg-odoo-pre-commit-hooks]\nreport = "minimal"\n')
+    result = run()
+    assert result.returncode == 1
+    assert result.stdout == (
+        f"{path}:8: 'action_confirm' (category 'action_methods') appears out of "
+        "order. Move it after 'crud_methods->write:18'\n"
+    )
+    config.write_text('[tool.hg-odoo-pre-commit-hooks]\nreport = "some"\n')
+    result = run()
+    assert result.returncode == 2
+    assert "'report' must be one of: all, minimal" in result.stderr
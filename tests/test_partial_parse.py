@@ -0,0 +1,133 @@
+import ast
+import os
+
+from hg_odoo_pre_commit_hooks import check_method_order
+from hg_odoo_pre_commit_hooks.check_method_order import (
+    PARTIAL_PARSE_MAX_FRACTION,
+    PARTIAL_PARSE_MIN_BYTES,
+    estimated_model_fraction,
+    find_model_classes,
+    parse_model_blocks,
+    source_violations,
+    top_level_statements,
+)
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+NOT_ORDERED = os.path.join(
+    BASE_DIR, "test_repo", "method_not_ordered_module", "models", "init_method.py"
+)
+
+TRICKY = '''"""Module docstring.
+
+class Fake(models.Model):
+    pass
+"""
+from odoo import api, fields, models
+
+TEMPLATE = """
+class Template(models.Model):
+    _name = "template"
+"""
+# class Commented(models.Model):
+CHOICES = [
+    ("a", "A"),
+class_like
+]
+
+
+\f@some.decorator(
+    "arg",
+)
+class Partner(
+    models.Model,
+):
+    name = fields.Char()
+
+    def create(self, vals):
+        return super().create(vals)
+
+    _name = "res.partner"
+
+\f
+ \fclass Helper:
+    value = "models.Model"
+'''
+
+
+def _dump(tree):
+    return [ast.dump(node, include_attributes=True) for node in tree.body]
+
+
+def _data_table(rows):
+    return (
+        "DATA = [\n"
+        + "".join(
+            f"    ({i}, 'name {i}', {{'key': [1, 2, 3]}}),\n" for i in range(rows)
+        )
+        + "]\n\n\n"
+    )
+
+
+def test_top_level_statements_skip_strings_comments_and_brackets():
+    """Solo se encuentran las sentencias de primer nivel reales, con su línea."""
+    statements = top_level_statements(TRICKY)
+    tree = ast.parse(TRICKY)
+    # Los decoradores empiezan su propia sentencia.
+    expected = [
+        lineno
+        for node in tree.body
+        for lineno in [d.lineno for d in getattr(node, "decorator_list", [])]
+        + [node.lineno]
+    ]
+    assert [lineno for _offset, lineno in statements] == expected
+
+
+def test_parse_model_blocks_matches_full_parse():
+    """Las clases modelo conservan sus decoradores y sus números de línea."""
+    full = find_model_classes(ast.parse(TRICKY))
+    partial = parse_model_blocks(TRICKY, "tricky.py")
+    assert [node.name for node in partial.body] == ["Partner", "Helper"]
+    assert _dump(ast.Module(body=full, type_ignores=[])) == _dump(partial)[:1]
+    crlf = parse_model_blocks(TRICKY.replace("\n", "\r\n"), "tricky.py")
+    assert _dump(crlf) == _dump(partial)
+
+
+def test_parse_model_blocks_syntax_error():
+    """Un bloque de clase que no se puede analizar pide analizar todo el archivo."""
+    assert parse_model_blocks("class A(models.Model):\n    def (\n", "x.py") is None
+
+
+def test_large_file_reports_same_violations(monkeypatch):
+    """Los archivos grandes dan los mismos errores y líneas que un análisis completo."""
+    with open(NOT_ORDERED, "rb") as f:
+        model = f.read()
+    # Un salto de página delante de la clase la deja en la columna 0.
+    model = model.replace(b"\nclass ", b"\n\fclass ")
+    source = _data_table(2000).encode() + model + b"\n\nTAIL = {\n    'class': 1,\n}\n"
+    assert len(source) >= PARTIAL_PARSE_MIN_BYTES
+    partial = source_violations(source, "model.py")
+    assert partial
+    monkeypatch.setattr(check_method_order, "PARTIAL_PARSE_MIN_BYTES", len(source) + 1)
+    assert source_violations(source, "model.py") == partial
+
+
+def test_model_only_file_uses_full_parse(monkeypatch):
+    """Los archivos grandes que son casi todo modelos se analizan enteros, y
+    los que son casi todo datos solo analizan los bloques de sus modelos."""
+    with open(NOT_ORDERED, "rb") as f:
+        model = f.read()
+    models_only = model * (PARTIAL_PARSE_MIN_BYTES // len(model) + 1)
+    with_data = _data_table(2000).encode() + model
+    assert estimated_model_fraction(models_only.decode()) > PARTIAL_PARSE_MAX_FRACTION
+    assert estimated_model_fraction(with_data.decode()) < PARTIAL_PARSE_MAX_FRACTION
+    blocks = []
+    parse_blocks = check_method_order.parse_model_blocks
+
+    def tracking_parse_blocks(*args, **kwargs):
+        blocks.append(args[1])
+        return parse_blocks(*args, **kwargs)
+
+    monkeypatch.setattr(check_method_order, "parse_model_blocks", tracking_parse_blocks)
+    assert source_violations(models_only, "models.py")
+    assert source_violations(with_data, "data.py")
+    assert blocks == ["data.py"]
@@ -0,0 +1,59 @@
+import ast
+import glob
+import os
+
+import pytest
+from hg_odoo_pre_commit_hooks.check_method_order import file_violations
+from hg_odoo_pre_commit_hooks.flake8_plugin import CODES, MethodOrderChecker
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+TEST_REPO = os.path.join(BASE_DIR, "test_repo")
+FILES = sorted(glob.glob(os.path.join(TEST_REPO, "**", "*.py"), recursive=True))
+
+
+def _expected(filepath):
+    return [
+        (violation.line or 1, violation.rule, violation.message)
+        for violation in file_violations(filepath)
+    ]
+
+
+def test_flake8_plugin_matches_command_line():
+    """El plugin de flake8 reporta los mismos errores a partir del árbol de flake8."""
+    codes = {code: rule for rule, code in CODES.items()}
+    reported = 0
+    for filepath in FILES:
+        with open(filepath, "rb") as f:
+            tree = ast.parse(f.read(), filename=filepath)
+        found = []
+        for line, column, text, checker in MethodOrderChecker(tree, filepath).run():
+            code, _, message = text.partition(" ")
+            assert (column, checker) == (0, MethodOrderChecker)
+            found.append((line, codes[code], message))
+        assert found == _expected(filepath)
+        reported += len(found)
+    assert reported > 0
+
+
+def test_pylint_plugin_matches_command_line(monkeypatch):
+    """El plugin de pylint reporta los mismos errores a partir del árbol de astroid."""
+    astroid = pytest.importorskip("astroid")
+    pytest.importorskip("pylint")
+    from hg_odoo_pre_commit_hooks import pylint_plugin
+    from pylint.lint import PyLinter
+
+    symbols = {symbol: rule for rule, (_code, symbol) in pylint_plugin.MESSAGES.items()}
+    checker = pylint_plugin.MethodOrderChecker(PyLinter())
+    found = []
+
+    def add_message(symbol, line=None, node=None, args=None):
+        assert node is not None
+        found.append((line or 1, symbols[symbol], args[0]))
+
+    monkeypatch.setattr(checker, "add_message", add_message)
+    for filepath in FILES:
+        with open(filepath, encoding="utf-8") as f:
+            module = astroid.parse(f.read(), path=filepath)
+        found.clear()
+        checker.visit_module(module)
+        assert found == _expected(filepath)
@@ -0,0 +1,66 @@
+import ast
+import glob
+import os
+import subprocess
+import sys
+from collections import Counter
+
+import pytest
+from hg_odoo_pre_commit_hooks import check_method_order
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(BASE_DIR, "src", "hg_odoo_pre_commit_hooks", "check_method_order.py")
+TEST_REPO = os.path.join(BASE_DIR, "test_repo")
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        b"class Foo(models.Model):\n    _name = 'foo'\n",
+        b"from odoo.models import TransientModel\nclass Foo(TransientModel):\n",
+        b"class Foo(\n    models.AbstractModel,\n):\n",
+    ],
+)
+def test_prefilter_keeps_models(source):
+    """Los archivos que pueden definir un modelo se deben analizar."""
+    assert check_method_order.may_contain_models(source)
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        b"",
+        b"from . import models\n",
+        b"{'name': 'Foo', 'depends': ['base']}\n",
+        b"class FooController(http.Controller):\n    pass\n",
+    ],
+)
+def test_prefilter_skips_non_models(source, monkeypatch):
+    """Los archivos que no pueden definir un modelo no se analizan."""
+    assert not check_method_order.may_contain_models(source)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("ast.parse called")
+
+    monkeypatch.setattr(ast, "parse", fail)
+    stats = Counter()
+    assert not check_method_order.source_violations(source, "foo.py", stats)
+    assert stats == {"prefiltered": 1}
+
+
+def test_stats_counters():
+    """--stats indica cuántos archivos descartó el filtro previo."""
+    files = sorted(glob.glob(os.path.join(TEST_REPO, "**", "*.py"), recursive=True))
+    result = subprocess.run(
+        [sys.executable, SRC, "--no-cache", "--stats", *files],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    model_files = [f for f in files if os.sep + "models" + os.sep in f]
+    model_files = [f for f in model_files if not f.endswith("__init__.py")]
+    skipped = len(files) - len(model_files)
+    assert (
+        f"{len(files)} files: {len(model_files)} parsed, "
+        f"{skipped} skipped by the prefilter, 0 from the cache." in result.stderr
+    )
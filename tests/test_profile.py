@@ -0,0 +1,50 @@
+import os
+import pstats
+import subprocess
+import sys
+from collections import Counter
+
+from hg_odoo_pre_commit_hooks.check_method_order import file_violations
+from hg_odoo_pre_commit_hooks.profiling import PhaseTimer
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(BASE_DIR, "src", "hg_odoo_pre_commit_hooks", "check_method_order.py")
+TEST_REPO = os.path.join(BASE_DIR, "test_repo")
+MODEL = os.path.join(
+    TEST_REPO, "method_not_ordered_module", "models", "several_errors.py"
+)
+
+
+def run_validator(*args):
+    return subprocess.run(
+        [sys.executable, SRC, *args], capture_output=True, text=True, check=False
+    )
+
+
+def test_phase_timer_records_phases():
+    """Se mide el tiempo de cada fase del análisis de un archivo de modelo."""
+    stats = Counter()
+    file_violations(MODEL, stats, timer=PhaseTimer(stats))
+    for phase in ("read", "decode", "parse", "models", "classification", "ordering"):
+        assert stats[f"{phase}_seconds"] > 0
+
+
+def test_profile_report():
+    """--profile imprime las fases y los archivos más lentos solo en stderr."""
+    plain = run_validator("--no-cache", "--addons-path", TEST_REPO)
+    for jobs in ("1", "2"):
+        options = ["--no-cache", "--profile", "--profile-top", "2", "-j", jobs]
+        result = run_validator(*options, "--addons-path", TEST_REPO)
+        assert result.stdout == plain.stdout
+        assert "Profile: 23 files" in result.stderr
+        assert "parse" in result.stderr
+        assert "Slowest 2 files:" in result.stderr
+
+
+def test_cprofile_dump(tmp_path):
+    """--cprofile guarda las estadísticas e imprime las funciones más costosas."""
+    output = tmp_path / "profile.out"
+    result = run_validator("--no-cache", "--cprofile", str(output), MODEL)
+    assert result.returncode == 1
+    assert "cumulative" in result.stderr
+    assert pstats.Stats(str(output)).total_calls
@@ -0,0 +1,87 @@
+import glob
+import os
+import subprocess
+import sys
+
+import pytest
+from hg_odoo_pre_commit_hooks.readahead import ReadAhead
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(BASE_DIR, "src", "hg_odoo_pre_commit_hooks", "check_method_order.py")
+TEST_REPO = os.path.join(BASE_DIR, "test_repo")
+FILES = sorted(glob.glob(os.path.join(TEST_REPO, "**", "*.py"), recursive=True))
+
+
+def _check(*args):
+    return subprocess.run(
+        [sys.executable, SRC, "--no-cache", *args],
+        capture_output=True,
+        check=False,
+    )
+
+
+def _write_files(tmp_path, sizes):
+    paths = []
+    for index, size in enumerate(sizes):
+        path = tmp_path / f"f{index}.py"
+        path.write_bytes(bytes([97 + index % 26]) * size)
+        paths.append(str(path))
+    return paths
+
+
+def test_read_ahead_keeps_order(tmp_path):
+    """Los archivos se devuelven en el orden de entrada con su contenido."""
+    paths = _write_files(tmp_path, [10, 2000, 0, 300, 5] * 4)
+    with ReadAhead(iter(paths), depth=3) as sources:
+        items = list(sources)
+    assert [filepath for filepath, _source in items] == paths
+    for filepath, source in items:
+        with open(filepath, "rb") as f:
+            assert source == f.read()
+
+
+def test_read_ahead_memory_ceiling(tmp_path):
+    """El contenido leído por adelantado nunca pasa del límite, salvo un único
+    archivo más grande que él."""
+    paths = _write_files(tmp_path, [10, 10, 10, 10, 100, 10, 10])
+    peaks = []
+    with ReadAhead(paths, depth=6, max_bytes=25) as sources:
+        acquire = sources.budget.acquire
+
+        def tracking_acquire(ticket, size):
+            reserved = acquire(ticket, size)
+            peaks.append(sources.budget.used)
+            return reserved
+
+        sources.budget.acquire = tracking_acquire
+        sizes = [len(source) for _filepath, source in sources]
+    assert sizes == [10, 10, 10, 10, 100, 10, 10]
+    assert max(peaks) <= 25
+
+
+def test_read_ahead_errors_at_their_position(tmp_path):
+    """Un archivo que no se puede leer lanza la excepción al llegar a él, y los
+    siguientes se siguen leyendo."""
+    paths = _write_files(tmp_path, [1, 2])
+    paths.insert(1, str(tmp_path / "missing.py"))
+    with ReadAhead(paths, depth=3) as sources:
+        assert next(sources) == (paths[0], b"a")
+        with pytest.raises(FileNotFoundError):
+            next(sources)
+        assert next(sources) == (paths[2], b"bb")
+        assert next(sources, None) is None
+
+
+def test_read_ahead_cli_matches_sequential_run():
+    """--read-ahead no cambia la salida."""
+    expected = _check(*FILES)
+    assert expected.returncode == 1
+    for args in (
+        ["--read-ahead", "4"],
+        ["--read-ahead", "2", "--read-ahead-memory", "1"],
+    ):
+        result = _check(*args, *FILES)
+        assert (result.stdout, result.returncode) == (expected.stdout, 1)
+    negative = _check("--read-ahead", "-1", *FILES)
+    assert negative.returncode == 2
+    assert b"argument --read-ahead" in negative.stderr
@@ -0,0 +1,123 @@
+import ast
+import glob
+import os
+
+import pytest
+from hg_odoo_pre_commit_hooks import check_method_order
+from hg_odoo_pre_commit_hooks.check_method_order import (
+    ASSIGNMENT_RULES,
+    METHOD_RULES,
+    Classifier,
+    Rule,
+    get_method_category,
+    source_violations,
+)
+
+from benchmarks.bench_classification import (
+    legacy_method_category,
+    run,
+    synthetic_class,
+)
+from benchmarks.corpus import CorpusSpec, generate_corpus
+
+TEST_REPO = os.path.join(os.path.dirname(__file__), "..", "test_repo")
+
+EDGE_CASES = """
+class Edge(models.Model):
+    _sql_constraints = []
+    _name = "edge"
+    name = fields.Char()
+    x = my_fields.Many2one()
+    y = _fields.Char()
+    z = fields_.Char()
+    w = other.Char()
+    a, b = 1, 2
+    label: str = ""
+    def init(self): pass
+    def default(self): pass
+    def _default_x(self): pass
+    def _compute_x(self): pass
+    @api.onchange("x")
+    def _compute_y(self): pass
+    @api.constrains("x")
+    def action_check(self): pass
+    @api.onchange("x")
+    def write(self): pass
+    def _onchange_x(self): pass
+    def search(self): pass
+    def action_done(self): pass
+    def _(self): pass
+"""
+
+
+def _members():
+    for filepath in sorted(
+        glob.glob(os.path.join(TEST_REPO, "**", "*.py"), recursive=True)
+    ):
+        with open(filepath, "rb") as f:
+            tree = ast.parse(f.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ClassDef):
+                yield from node.body
+    yield from ast.parse(EDGE_CASES).body[0].body
+
+
+def test_classifier_matches_legacy_chain(tmp_path):
+    """Las tablas de reglas clasifican cada miembro igual que la cadena de if."""
+    generate_corpus(str(tmp_path), CorpusSpec(addons=1, models=2, out_of_order=1))
+    members = list(_members())
+    for filepath in glob.glob(str(tmp_path / "**" / "*.py"), recursive=True):
+        with open(filepath, "rb") as f:
+            members.extend(
+                member
+                for node in ast.walk(ast.parse(f.read()))
+                if isinstance(node, ast.ClassDef)
+                for member in node.body
+            )
+    members.extend(synthetic_class(500).body)
+    for member in members:
+        assert get_method_category(member) == legacy_method_category(member)
+
+
+def test_name_memo_is_bounded(monkeypatch):
+    """Las clasificaciones de nombres recordadas se descartan al pasar del
+    límite y dan las mismas categorías."""
+    monkeypatch.setattr(check_method_order, "MAX_CACHED_NAMES", 2)
+    classifier = Classifier()
+    members = ast.parse(EDGE_CASES).body[0].body
+    expected = [legacy_method_category(member) for member in members]
+    for _i in range(2):
+        assert [classifier.category(member) for member in members] == expected
+    assert len(classifier._names._cache) <= 2  # pylint: disable=protected-access
+
+
+def test_benchmark_agrees_with_legacy():
+    """El benchmark de clasificación comprueba que ambas implementaciones coinciden."""
+    result = run(members=300, repeat=1)
+    assert result["members"] == 301
+
+
+def test_custom_rules():
+    """Se pueden añadir reglas nuevas ampliando las tablas."""
+    classifier = Classifier(
+        (*METHOD_RULES, Rule("action_methods", "prefix", ("button_",))),
+        ASSIGNMENT_RULES,
+    )
+    source = b"""
+class Partner(models.Model):
+    _name = "res.partner"
+    def button_confirm(self):
+        pass
+    def action_done(self):
+        pass
+"""
+    assert not source_violations(source, "partner.py", classifier=classifier)
+    violations = source_violations(source, "partner.py")
+    assert [v.line for v in violations] == [6]
+    assert "'other_methods'" in violations[0].message
+
+
+def test_unknown_rule_kind():
+    """Las reglas de un tipo desconocido se rechazan al compilar las tablas."""
+    with pytest.raises(ValueError, match="Unknown rule kind 'suffix'"):
+        Classifier((*METHOD_RULES, Rule("other_methods", "suffix", ("_hook",))))
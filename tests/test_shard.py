@@ -0,0 +1,76 @@
+import glob
+import os
+import subprocess
+import sys
+
+import pytest
+from hg_odoo_pre_commit_hooks.shard import parse_shard, shard_files
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(BASE_DIR, "src", "hg_odoo_pre_commit_hooks", "check_method_order.py")
+TEST_REPO = os.path.join(BASE_DIR, "test_repo")
+FILES = sorted(glob.glob(os.path.join(TEST_REPO, "**", "*.py"), recursive=True))
+
+
+def _run(*args):
+    return subprocess.run(
+        [sys.executable, SRC, *args],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+
+def test_parse_shard():
+    """--shard recibe INDEX/COUNT, empezando por 1."""
+    assert parse_shard("1/1") == (1, 1)
+    assert parse_shard("3/4") == (3, 4)
+    for value in ("0/2", "3/2", "2", "a/b", "1/0", "-1/2"):
+        with pytest.raises(ValueError):
+            parse_shard(value)
+
+
+def test_shards_partition_and_balance():
+    """Cada archivo va a un solo fragmento y los fragmentos tienen tamaños parecidos."""
+    sizes = {f"f{i}.py": (i * 7919) % 1000 + 1 for i in range(200)}
+    files = list(sizes)
+    shards = [shard_files(files, i, 4, sizes.get) for i in range(1, 5)]
+    assert sorted(f for shard in shards for f in shard) == sorted(files)
+    for shard in shards:
+        # Dentro de cada fragmento se mantiene el orden de entrada.
+        assert shard == [f for f in files if f in shard]
+    loads = [sum(sizes[f] for f in shard) for shard in shards]
+    assert max(loads) - min(loads) <= max(sizes.values())
+    # El reparto solo depende del conjunto de archivos, no de su orden.
+    reordered = shard_files(reversed(files), 2, 4, sizes.get)
+    assert sorted(reordered) == sorted(shards[1])
+
+
+def test_sharded_runs_merge_into_the_full_report(tmp_path):
+    """Unir los informes JSON de todos los fragmentos da la misma salida y
+    código de salida que sin fragmentar."""
+    expected = _run("--no-cache", *FILES)
+    assert expected.returncode == 1
+    reports = []
+    for index in (1, 2, 3):
+        result = _run("--no-cache", "--shard", f"{index}/3", "--format", "json", *FILES)
+        report = tmp_path / f"shard-{index}.json"
+        report.write_text(result.stdout)
+        reports.append(str(report))
+
+    merged = _run("merge", *reports)
+    assert (merged.stdout, merged.returncode) == (expected.stdout, 1)
+    assert not _run("merge", "--exit-zero", *reports).returncode
+
+
+def test_merge_errors(tmp_path):
+    """Los informes sin errores se unen con éxito y los no válidos se rechazan."""
+    clean = tmp_path / "clean.json"
+    clean.write_text("[]\n")
+    assert not _run("merge", str(clean), str(clean)).returncode
+    invalid = tmp_path / "invalid.json"
+    invalid.write_text("{}")
+    result = _run("merge", str(clean), str(invalid))
+    assert result.returncode == 2
+    assert "cannot read the report" in result.stderr
+    assert _run("--shard", "0/2", *FILES).returncode == 2
@@ -0,0 +1,89 @@
+import os
+import subprocess
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+MODEL = os.path.join(
+    BASE_DIR, "test_repo", "method_ordered_module", "models", "model.py"
+)
+MODULE = "hg_odoo_pre_commit_hooks.check_method_order"
+
+# Módulos que no se importan con el analizador: solo los usan algunas opciones.
+# Importar cualquiera de ellos al arrancar retrasa cada ejecución del hook.
+OPTIONAL_MODULES = {
+    "argparse",
+    "json",
+    "multiprocessing",
+    "re",
+    "sqlite3",
+    "typing",
+    "hg_odoo_pre_commit_hooks.cache",
+    "hg_odoo_pre_commit_hooks.config",
+    "hg_odoo_pre_commit_hooks.reporters",
+}
+
+MAIN = """
+import sys
+from {module} import main
+try:
+    main()
+finally:
+    sys.stderr.write(" ".join(sorted(sys.modules)))
+"""
+
+
+def _env(tmp_path):
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=str(tmp_path / "pycache"))
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def _python(env, *args):
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, check=False, env=env
+    )
+
+
+def test_import_skips_optional_modules(tmp_path):
+    """Importar el analizador no importa los módulos opcionales."""
+    code = f"import sys, {MODULE}; print(' '.join(sys.modules))"
+    imported = set(_python(_env(tmp_path), "-c", code).stdout.split())
+    assert MODULE in imported
+    assert imported & OPTIONAL_MODULES == set()
+
+
+def test_entry_point_imports_only_what_it_needs(tmp_path):
+    """Analizar un archivo en formato texto no importa los módulos opcionales."""
+    env = _env(tmp_path)
+    args = ["--cache-dir", str(tmp_path / "cache"), MODEL]
+    result = _python(env, "-c", MAIN.format(module=MODULE), *args)
+    modules = set(result.stderr.split())
+    assert "argparse" in modules
+    lazy = {
+        "importlib.metadata",
+        "tomllib",
+        "pathlib",
+        "shutil",
+        "multiprocessing",
+        "concurrent.futures",
+        "hg_odoo_pre_commit_hooks.parallel",
+        "hg_odoo_pre_commit_hooks.profiling",
+        "hg_odoo_pre_commit_hooks.discovery",
+        "hg_odoo_pre_commit_hooks.fixer",
+    }
+    assert modules & lazy == set()
+
+
+def test_small_run_skips_the_cache(tmp_path):
+    """Una ejecución con un solo archivo pequeño no abre la caché de
+    resultados salvo que se indique --cache-dir."""
+    env = _env(tmp_path)
+    env["XDG_CACHE_HOME"] = str(tmp_path / "xdg")
+    result = _python(env, "-c", MAIN.format(module=MODULE), MODEL)
+    modules = set(result.stderr.split())
+    assert not modules & {"sqlite3", "hashlib", "hg_odoo_pre_commit_hooks.cache"}
+    assert not os.path.exists(tmp_path / "xdg")
+
+    args = ["--cache-dir", str(tmp_path / "cache"), MODEL]
+    result = _python(env, "-c", MAIN.format(module=MODULE), *args)
+    assert "hg_odoo_pre_commit_hooks.cache" in result.stderr.split()
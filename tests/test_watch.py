@@ -0,0 +1,174 @@
+import io
+import os
+import select
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+from hg_odoo_pre_commit_hooks.check_method_order import file_violations
+from hg_odoo_pre_commit_hooks.config import ConfigResolver
+from hg_odoo_pre_commit_hooks.watch import (
+    InotifyWatcher,
+    PollingWatcher,
+    WatchSession,
+    make_watcher,
+    watch,
+)
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))
+SRC = os.path.join(BASE_DIR, "src", "hg_odoo_pre_commit_hooks", "check_method_order.py")
+MODELS = os.path.join(BASE_DIR, "test_repo", "method_not_ordered_module", "models")
+ORDERED = os.path.join(
+    BASE_DIR, "test_repo", "method_ordered_module", "models", "model.py"
+)
+NOT_ORDERED = os.path.join(MODELS, "init_method.py")
+
+
+@pytest.fixture(name="watcher_class", params=[PollingWatcher, InotifyWatcher])
+def fixture_watcher_class(request):
+    """Devuelve cada implementación del vigilante, omitiendo inotify cuando
+    el sistema no lo ofrece."""
+    if request.param is InotifyWatcher:
+        watcher = make_watcher([BASE_DIR])
+        watcher.close()
+        if not isinstance(watcher, InotifyWatcher):
+            pytest.skip("inotify no está disponible")
+    return request.param
+
+
+def test_session_prints_only_changes(tmp_path):
+    """Solo se imprimen los errores que aparecen o desaparecen."""
+    path = str(tmp_path / "model.py")
+    shutil.copy(NOT_ORDERED, path)
+    stream, errors = io.StringIO(), io.StringIO()
+    session = WatchSession(file_violations, stream, errors)
+    session.start([path])
+    (line,) = stream.getvalue().splitlines()
+    assert line.startswith(f"{path}:19: 'init'")
+
+    assert not session.update([path])
+    shutil.copy(ORDERED, path)
+    assert session.update([path]) == 1
+    assert stream.getvalue().splitlines()[1:] == [f"- {line}"]
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("class Broken(models.Model):\n    def (\n")
+    assert not session.update([path])
+    assert "cannot check" in errors.getvalue()
+    shutil.copy(NOT_ORDERED, path)
+    session.update([path])
+    os.remove(path)
+    session.update([path])
+    assert stream.getvalue().splitlines()[2:] == [f"+ {line}", f"- {line}"]
+    assert not session.results
+
+
+def test_watchers_report_saved_files(tmp_path, watcher_class):
+    """Se informa de los archivos Python guardados, creados y eliminados."""
+    models = tmp_path / "models"
+    models.mkdir()
+    (models / "model.py").write_text("")
+    watcher = watcher_class([str(tmp_path)])
+
+    def save():
+        time.sleep(0.05)
+        (models / "model.py").write_text("x = 1\n")
+        (models / "data.txt").write_text("")
+
+    try:
+        thread = threading.Thread(target=save)
+        thread.start()
+        assert watcher.wait(5) == {str(models / "model.py")}
+        thread.join()
+        (tmp_path / "new.py").write_text("")
+        (models / "model.py").unlink()
+        changed = watcher.wait(5) | watcher.wait(0.3)
+        assert changed == {str(tmp_path / "new.py"), str(models / "model.py")}
+        assert watcher.wait(0) == set()
+    finally:
+        watcher.close()
+
+
+def test_watchers_report_config_files(tmp_path, watcher_class):
+    """Se informa de los cambios de pyproject.toml en el árbol vigilado y en
+    sus padres."""
+    models = tmp_path / "addon" / "models"
+    models.mkdir(parents=True)
+    watcher = watcher_class([str(models)])
+    try:
+        for config in (tmp_path / "pyproject.toml", models / "pyproject.toml"):
+            config.write_text("[tool.other]\n")
+            assert str(config) in watcher.wait(5) | watcher.wait(0.3)
+    finally:
+        watcher.close()
+
+
+class ScriptedWatcher:
+    """Aplica un cambio en cada espera e interrumpe la vigilancia al final."""
+
+    def __init__(self, changes):
+        self.changes = list(changes)
+
+    def wait(self, timeout=None):
+        if timeout is not None:
+            return set()
+        if not self.changes:
+            raise KeyboardInterrupt
+        return self.changes.pop(0)()
+
+    def close(self):
+        pass
+
+
+def test_watch_reloads_config(tmp_path, capsys):
+    """Editar pyproject.toml vuelve a analizar todos los archivos con la nueva
+    configuración, y una configuración no válida se indica sin detener la
+    vigilancia."""
+    path = tmp_path / "model.py"
+    shutil.copy(NOT_ORDERED, path)
+    config = tmp_path / "pyproject.toml"
+
+    def write_config(report):
+        config.write_text(f'[tool.hg-odoo-pre-commit-hooks]\nreport = "{report}"\n')
+        return {str(config)}
+
+    resolver = ConfigResolver()
+    stream = io.StringIO()
+    watch(
+        [str(tmp_path)],
+        resolver.violations,
+        stream=stream,
+        watcher=ScriptedWatcher(
+            [lambda: write_config("minimal"), lambda: write_config("unknown")]
+        ),
+        reset=resolver.clear,
+    )
+    initial, removed, added = stream.getvalue().splitlines()
+    assert removed == f"- {initial}"
+    assert added.startswith(f"+ {path}:16: '_default_name'")
+    assert "Move it after 'init_method->init:19'" in added
+    assert "cannot check" in capsys.readouterr().err
+
+
+def test_watch_command(tmp_path):
+    """--watch imprime los errores de un archivo al guardarlo."""
+    path = tmp_path / "model.py"
+    shutil.copy(ORDERED, path)
+    with subprocess.Popen(
+        [sys.executable, SRC, "--no-config", "--watch", str(tmp_path)],
+        stdout=subprocess.PIPE,
+        text=True,
+    ) as process:
+        try:
+            # Espera al análisis inicial (sin salida) y al vigilante.
+            time.sleep(1)
+            shutil.copy(NOT_ORDERED, path)
+            ready, _, _ = select.select([process.stdout], [], [], 10)
+            assert ready
+            line = process.stdout.readline()
+            assert line.startswith(f"+ {path}:19: 'init'")
+        finally:
+            process.terminate()